@@ -0,0 +1,210 @@
+# benchmark.py
+# Microbenchmarks of pure-Python hot paths, with JSON baselines to detect performance regressions before deploy.
+import asyncio
+import json
+import logging
+import platform
+import sys
+import timeit
+
+import discord
+from discord.state import ConnectionState
+
+from default_collections import ChannelCollection, CategoryChannelCollection, RoleCollection, GeneralMessages
+from functions.text_analysis import check_answer_and_return_it
+from game_models.abstract_filtered_listener import AbstractFilteredListener
+from helpers.audio_mixer import AudioMixer
+from helpers.commands_helpers import get_args_from_text, find_channel_mentions_in_message
+from helpers.discord_helpers import user_to_member
+from helpers.guild_diff import GuildDiff
+from helpers.message_helpers import _split_on_new_lines_message
+from helpers.set_channels import fetch_channels
+from models.role_index import RoleIndex
+
+BASELINE_PATH = "benchmark_baseline.json"
+DEFAULT_TOLERANCE = 0.25  # a benchmark is a regression if it is 25% slower than its baseline
+_CHANNEL_TYPES = {discord.ChannelType.text: 0, discord.ChannelType.voice: 2, discord.ChannelType.category: 4}
+
+
+# Realistic guild built from configuration/game_manager (no connection to Discord)
+
+def _make_guild(nb_members=100) -> discord.Guild:
+    state = ConnectionState(dispatch=lambda *_, **__: None, handlers={}, hooks={}, syncer=None, http=None,
+                            loop=asyncio.get_event_loop(), intents=discord.Intents.all())
+    roles = [{"id": 1, "name": "@everyone", "permissions": 0, "position": 0}]
+    roles += [{"id": 10 + i, "name": role.name, "permissions": 0, "position": i + 1}
+              for i, role in enumerate(RoleCollection.to_list()) if role.name]
+    categories = CategoryChannelCollection.to_list()
+    channels = [{"id": 100 + i, "name": category.name, "type": 4, "position": i}
+                for i, category in enumerate(categories)]
+    for i, channel in enumerate(ChannelCollection.to_list()):
+        category_id = next((100 + j for j, category in enumerate(categories)
+                            if category is channel.category_description), None)
+        channels.append({"id": 200 + i, "name": channel.name, "type": _CHANNEL_TYPES.get(channel.channel_type, 0),
+                         "position": i, "parent_id": category_id})
+    members = [{"user": {"id": 1000 + i, "username": f"joueur_{i}", "discriminator": f"{i:04d}", "avatar": None},
+                "roles": [roles[1 + i % (len(roles) - 1)]["id"]], "joined_at": None} for i in range(nb_members)]
+    guild = discord.Guild(data={"id": 1, "name": "Moulinsart", "roles": roles, "channels": channels,
+                                "members": members, "member_count": nb_members}, state=state)
+    state._add_guild(guild)
+    for role_description in RoleCollection.to_list():  # as fetch_roles would do
+        role_description.object_reference = discord.utils.get(guild.roles, name=role_description.name)
+    return guild
+
+
+def _make_message(guild: discord.Guild, content: str) -> discord.Message:
+    channel = guild.text_channels[0]
+    author = guild.members[-1]
+    data = {"id": 1, "channel_id": channel.id, "content": content, "type": 0, "pinned": False, "tts": False,
+            "mention_everyone": False, "attachments": [], "embeds": [], "edited_timestamp": None,
+            "timestamp": "2020-11-01T12:00:00+00:00", "author": {"id": author.id, "username": author.name,
+                                                                 "discriminator": author.discriminator}}
+    message = discord.Message(state=guild._state, channel=channel, data=data)
+    message.author = author
+    return message
+
+
+class _ConstantSource(discord.AudioSource):
+    """Endless PCM source, to mix frames without FFmpeg."""
+    _frame = bytes(range(256)) * (discord.opus.Encoder.FRAME_SIZE // 256)
+
+    def read(self):
+        return self._frame
+
+
+def _make_mixer(nb_tracks: int) -> AudioMixer:
+    mixer = AudioMixer()
+    for i in range(nb_tracks):
+        mixer.add_track(_ConstantSource(), volume=0.5 + 0.1 * i)
+    return mixer
+
+
+# Benchmarks
+
+async def _dispatch_message(listeners, message):
+    for listener in listeners:
+        await listener.on_message(message)
+
+
+def _check_roles_with_names(members, role_names):
+    for member in members:
+        for role_name in role_names:
+            role_name in (role.name for role in member.roles)
+
+
+def _check_roles_with_index(index, members, role_names):
+    for member in members:
+        for role_name in role_names:
+            index.has_role(member, role_name)
+
+
+def get_benchmarks():
+    """Returns a dict {name: callable} of benchmarks."""
+    loop = asyncio.get_event_loop()
+    guild = _make_guild()
+    text_channels = guild.text_channels
+    mentions = " ".join(channel.mention for channel in text_channels[:3])
+    command_message = _make_message(guild, f">messages {mentions} 20")
+    command_args = list(get_args_from_text(command_message.content))
+    listener = AbstractFilteredListener(allowed_roles=["VISITOR", "MASTER"], forbidden_channels=["LOG"])
+    listener.set(guild)
+    listeners = [AbstractFilteredListener().set(guild) for _ in range(10)]
+    player_message = _make_message(guild, "Je crois que la réponse est : Haddock !")
+    answers = [answer.rstrip(" !") for answer in GeneralMessages["GOOD_ANSWERS"]] + ["Haddock", "Tournesol"]
+    long_text = "\n".join(f"{member}: {', '.join(role.name for role in member.roles)}" for member in guild.members)
+    channel_descriptions = CategoryChannelCollection.to_list() + ChannelCollection.to_list()
+    overwrites_description = next(descr for descr in channel_descriptions if descr._overwrites)
+    last_member = guild.members[-1]
+    user = discord.User(state=guild._state, data={"id": last_member.id, "username": last_member.name,
+                                                  "discriminator": last_member.discriminator, "avatar": None})
+    role_names = [role.name for role in guild.roles]
+    role_index = RoleIndex(guild)
+    role_index.build()
+    mixer_1, mixer_4, mixer_8 = _make_mixer(1), _make_mixer(4), _make_mixer(8)  # one call mixes a 20ms frame
+
+    return {
+        "check_answer_and_return_it": lambda: check_answer_and_return_it(
+            player_message.content, answers, forbidden_answers=GeneralMessages["BAD_ANSWERS"]),
+        "get_args_from_text": lambda: get_args_from_text(
+            '>reload 4 fr en special --update "un argument entre guillemets" <#123456789>'),
+        "_split_on_new_lines_message": lambda: _split_on_new_lines_message(long_text, quotes=True),
+        "TranslationDict.__getitem__ (data)": lambda: GeneralMessages["GOOD_ANSWERS"],
+        "TranslationDict.__getitem__ (default)": lambda: GeneralMessages["WELCOME_FILE"],
+        "SpecifiedDictCollection.to_list": ChannelCollection.to_list,
+        "find_channel_mentions_in_message": lambda: find_channel_mentions_in_message(
+            command_message, command_args.copy()),
+        "AbstractFilteredListener._filter_message": lambda: listener._filter_message(player_message),
+        "user_to_member (User)": lambda: user_to_member(guild, user),
+        "on_message event (10 listeners)": lambda: loop.run_until_complete(
+            _dispatch_message(listeners, player_message)),
+        "ChannelDescription.overwrites": lambda: overwrites_description.overwrites,
+        "fetch_channels (matching)": lambda: loop.run_until_complete(fetch_channels(guild, channel_descriptions)),
+        "GuildDiff (guild check)": lambda: GuildDiff(guild, channel_descriptions, RoleCollection.to_list()),
+        "role checks, names (members x roles)": lambda: _check_roles_with_names(guild.members, role_names),
+        "role checks, RoleIndex (members x roles)": lambda: _check_roles_with_index(
+            role_index, guild.members, role_names),
+        "AudioMixer.read (1 track)": mixer_1.read,
+        "AudioMixer.read (4 tracks)": mixer_4.read,
+        "AudioMixer.read (8 tracks)": mixer_8.read,
+    }
+
+
+def run_benchmarks(benchmarks, repeat=5, min_time=0.2) -> dict:
+    """Returns the best time per call (in µs) of each benchmark."""
+    results = {}
+    for name, func in benchmarks.items():
+        timer = timeit.Timer(func)
+        number, duration = 1, 0.
+        while duration < min_time:  # calibrate the number of calls per measure
+            number *= 10 if duration < min_time / 10 else 2
+            duration = timer.timeit(number)
+        results[name] = 1e6 * min(timer.repeat(repeat, number)) / number
+        print(f"{name:<45} {results[name]:>12.2f} µs")
+    return results
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results},
+                  file, indent=2, ensure_ascii=False)
+    print(f"Baseline saved to {path}")
+
+
+def compare_to_baseline(results, path=BASELINE_PATH, tolerance=DEFAULT_TOLERANCE) -> bool:
+    """Prints the comparison with the baseline. Returns False if a benchmark is slower than tolerated."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+    except (OSError, ValueError, KeyError) as err:
+        print(f"Failed to load baseline {path}: {err}")
+        return False
+    is_ok = True
+    for name, value in results.items():
+        if name not in baseline:
+            print(f"{name:<45} no baseline")
+            continue
+        ratio = value / baseline[name]
+        regression = ratio > 1 + tolerance
+        is_ok = is_ok and not regression
+        print(f"{name:<45} {ratio:>6.2f}x baseline{'  <-- REGRESSION' if regression else ''}")
+    return is_ok
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if "--help" in args:
+        print("Syntax: python benchmark.py [OPTIONS]\n"
+              "Runs microbenchmarks of hot helper functions (a .env file is required, as for the bot).\n"
+              "Options:\n"
+              f"  --save: save results as baseline ({BASELINE_PATH})\n"
+              "  --compare: compare results to the baseline, exit code is 1 in case of regression\n"
+              f"  --tolerance X: tolerated slowdown for --compare (default: {DEFAULT_TOLERANCE})\n"
+              "Baselines depend on the machine: generate them on the machine used for the checks.")
+        exit(0)
+    logging.disable(logging.CRITICAL)  # keep the output readable (lazy debug messages are not formatted either)
+    _results = run_benchmarks(get_benchmarks())
+    if "--save" in args:
+        save_baseline(_results)
+    if "--compare" in args:
+        _tolerance = float(args[args.index("--tolerance") + 1]) if "--tolerance" in args else DEFAULT_TOLERANCE
+        exit(0 if compare_to_baseline(_results, tolerance=_tolerance) else 1)
@@ -3,27 +3,37 @@
 import asyncio
 import datetime
 import random
+import time
 import traceback
 from typing import Union, List, Optional
 
 import discord
-import requests
 from aiohttp import ClientConnectorError
-from discord import Member, Message, User, Guild, Reaction, VoiceState, RawReactionActionEvent
+from discord import Member, Message, User, Guild, Reaction, VoiceState, RawReactionActionEvent, Role
 
 from bot_management import GuildManager, get_safe_text_channel
 from constants import (_TOKEN, BOT, DEBUG_MODE, AWAKE_REFRESH_PERIOD, WEBSITE, MAX_GUILDS, MAX_PENDING_GUILDS,
-                       GAME_LANGUAGE, VERBOSE)
+                       GAME_LANGUAGE, VERBOSE, BLOCKING_CALL_THRESHOLD, INTENTS_PROFILE, bot_intents, PORT,
+                       METRICS_PUSH_PERIOD)
 from default_collections import RoleCollection, CategoryChannelCollection, ChannelCollection, MinigameCollection
+from flask_server.aio_app import WebServer
 from game_models import AbstractListener
 from helpers import (format_member, format_message, get_guild_info, get_members_info,
-                     get_roles_info, get_channels_info, send_dm_pending_messages)
-from helpers.bot_availability import add_bot_availability_on_website, remove_bot_availability_on_website
+                     get_roles_info, get_channels_info, send_dm_pending_messages, member_memo)
+from helpers.bot_availability import sync_bot_availability_on_website
+from helpers.cache_profile import GatewayEventCounter, all_subclasses, apply_intents_profile, startup_report
+from helpers.instrumentation import Metrics, push_metrics_on_website
+from helpers.interactive_messages import InteractiveMessageCache
+from helpers.invitations import sync_invite_on_website
+from helpers.loop_monitor import LoopMonitor
+from helpers.rest_accounting import RestAccounting, rest_label
 from helpers.set_channels import fetch_channels
 from helpers.set_roles import fetch_roles
+from helpers.state_store import StateStore
 from listeners_configuration import ListenersEnum, UtilsList
-from logger import logger
+from logger import logger, lazy_debug, LazyFormat, rotate_log_files
 from models import Event, GuildWrapper
+from models.role_index import RoleIndex
 
 
 ############################
@@ -35,26 +45,24 @@ async def stay_awake(guild, duration):
     while BOT_STAYING_AWAKE:
         logger.info("Staying awake !")
         channel = await get_safe_text_channel(guild, name_key="LOG")
-        try:
-            requests.get(WEBSITE)
-        except Exception as err:
-            logger.error(f"Error while staying awake! The website {WEBSITE} may be down: {err}")
+        # Request the website and update bot availability if it is not up-to-date (the website may have restarted)
+        if not await sync_bot_availability_on_website(available=not BOT.guilds):
+            logger.error(f"Error while staying awake! The website {WEBSITE} may be down")
             if channel and VERBOSE >= 10:
-                await channel.send(f"I am here ! But the website {WEBSITE} may be down: {err}")
+                await channel.send(f"I am here ! But the website {WEBSITE} may be down")
         else:
             logger.debug("Bot stays awake !")
             if channel and VERBOSE >= 20:
                 await channel.send(f"I am here ! And the website {WEBSITE} too !")
-            # Update bot availability (in case it is not up-to-date, which can happen in production mode)
-            if BOT.guilds:
-                remove_bot_availability_on_website()
-            else:
-                add_bot_availability_on_website()
+            await sync_invite_on_website()
+        RestAccounting().log_report()
         await asyncio.sleep(duration - random.randint(0, 10))
 
 
 async def init_guild(guild_wrapper) -> bool:
     """Coroutine to initialize a new a guild or to reset it when the version has changed."""
+    if not guild_wrapper.guild.chunked:  # members are not requested at startup, only for game guilds
+        await guild_wrapper.guild.chunk()
     # Print information on the guild
     logger.info(get_guild_info(BOT, guild_wrapper))
     logger.info(get_members_info(guild_wrapper))
@@ -69,7 +77,11 @@ async def init_guild(guild_wrapper) -> bool:
     # Add guild listeners and show the control panel
     await guild_wrapper.add_listeners(UtilsList(guild_wrapper))  # add utils
     await guild_wrapper.add_listeners(MinigameCollection.get_guild_instances(guild_wrapper))  # add minigames
-    if VERBOSE >= 10:
+    # Resume the game in progress before the restart, if any
+    state_store = StateStore.get(guild_wrapper.guild)
+    state_store.provider = guild_wrapper.listener_manager
+    restored = await state_store.restore()
+    if VERBOSE >= 10 and not (restored and guild_wrapper.listener_manager.control_boards):
         await guild_wrapper.listener_manager.show_control_panel(guild_wrapper.guild)  # show control panel
 
     # Send a success message
@@ -105,20 +117,30 @@ async def init_bot():
 # Dispatch Discord events to guilds and listeners
 
 async def handle_event(listener: AbstractListener, event: Event, *args, **kwargs):
-    """Trigger the dedicated method in listener to handle Discord event."""
-    await getattr(listener, event.value)(*args, **kwargs)
+    """Trigger the dedicated method in listener to handle Discord event. Its duration is recorded in Metrics."""
+    start, error = time.perf_counter(), False
+    try:
+        with rest_label(f"{listener.__class__.__name__}.{event.value}"):  # attribute REST calls to the listener
+            await getattr(listener, event.value)(*args, **kwargs)
+    except Exception:
+        error = True
+        raise
+    finally:
+        Metrics().observe_handler(event.value, listener.__class__.__name__, time.perf_counter() - start, error)
 
 
 async def handle_event_in_all_listeners(guild_wrapper: GuildWrapper, event: Event, *args, **kwargs):
     """Handle the Discord event in all listeners of the guild."""
     for listener in guild_wrapper.active_listeners.copy():  # Copy to avoid Runtime error on item removal
         await handle_event(listener, event, *args, **kwargs)
+    StateStore.get(guild_wrapper.guild).mark_dirty()  # the game state is saved a few seconds later
 
 
 async def handle_event_in_all_guilds(guild: Optional[Guild], event: Event, *args, **kwargs):
     """Handle the Discord event in all listeners of the concerned guilds."""
-    await asyncio.gather(*(handle_event_in_all_listeners(guild_wrapper, event, *args, **kwargs)
-                           for guild_wrapper in GuildManager().values() if guild_wrapper == guild or guild is None))
+    with member_memo():  # e.g. the author of a message is converted to a member once for all listeners
+        await asyncio.gather(*(handle_event_in_all_listeners(guild_wrapper, event, *args, **kwargs)
+                               for guild_wrapper in GuildManager().values() if guild_wrapper == guild or guild is None))
 
 
 # Discord events
@@ -139,6 +161,8 @@ async def on_guild_join(guild):
 @BOT.event
 async def on_guild_remove(guild):
     logger.info(f"Bot was removed from the guild: {guild}")
+    RoleIndex.remove(guild)
+    StateStore.remove(guild)
     await GuildManager().remove_guild(guild)
     global BOT_STAYING_AWAKE
     BOT_STAYING_AWAKE = False
@@ -151,6 +175,8 @@ async def on_ready():
     if not BOT_INITIALIZED:
         BOT_INITIALIZED = True
         await init_bot()
+        logger.info(startup_report(BOT, DISABLED_INTENTS))
+        GatewayEventCounter().uninstall(BOT)
     await handle_event_in_all_guilds(None, Event.READY)
     # In production mode: ensure the bot stays awake
     global BOT_STAYING_AWAKE
@@ -191,12 +217,14 @@ async def on_disconnect():
 @BOT.event
 async def on_member_join(member: Member):
     logger.info(f"{member} has just joined!")
+    RoleIndex.get(member.guild).update_member(member)
     await handle_event_in_all_guilds(member.guild, Event.MEMBER_JOIN, member)
 
 
 @BOT.event
 async def on_member_remove(member: Member):
     logger.info(f"{member} has just left!")
+    RoleIndex.get(member.guild).remove_member(member)
     await handle_event_in_all_guilds(member.guild, Event.MEMBER_REMOVE, member)
 
 
@@ -208,34 +236,34 @@ async def on_typing(channel: discord.abc.Messageable, user: Union[User, Member],
 
 @BOT.event
 async def on_message_edit(before: Message, after: Message):
-    logger.debug(f"Message {format_message(before)} edited to {format_message(after)}")
+    lazy_debug("Message %s edited to %s", LazyFormat(format_message, before), LazyFormat(format_message, after))
     await handle_event_in_all_guilds(before.guild, Event.MESSAGE_EDIT, before, after)
 
 
 @BOT.event
 async def on_reaction_add(reaction: Reaction, user: Union[Member, User]):
-    logger.debug(f"The reaction {reaction} has been added to message "
-                 f"{format_message(reaction.message, 50)} by {format_member(user)}")
+    lazy_debug("The reaction %s has been added to message %s by %s", reaction,
+               LazyFormat(format_message, reaction.message, 50), LazyFormat(format_member, user))
     await handle_event_in_all_guilds(reaction.message.guild, Event.REACTION_ADD, reaction, user)
     await GuildManager().handle_pending_guild_reaction_add(reaction, user)
 
 
 @BOT.event
 async def on_raw_reaction_add(payload: RawReactionActionEvent):
-    logger.debug(f"The raw reaction {payload} has been added")
+    lazy_debug("The raw reaction %s has been added", payload)
     await handle_event_in_all_guilds(payload.guild_id, Event.RAW_REACTION_ADD, payload)
 
 
 @BOT.event
 async def on_raw_reaction_remove(payload: RawReactionActionEvent):
-    logger.debug(f"The raw reaction {payload} has been added")
+    lazy_debug("The raw reaction %s has been removed", payload)
     await handle_event_in_all_guilds(payload.guild_id, Event.RAW_REACTION_REMOVE, payload)
 
 
 @BOT.event
 async def on_reaction_remove(reaction: Reaction, user: Union[Member, User]):
-    logger.debug(f"The reaction {reaction} has been removed from message "
-                 f"{format_message(reaction.message, 50)} by {format_member(user)}")
+    lazy_debug("The reaction %s has been removed from message %s by %s", reaction,
+               LazyFormat(format_message, reaction.message, 50), LazyFormat(format_member, user))
     await handle_event_in_all_guilds(reaction.message.guild, Event.REACTION_REMOVE, reaction, user)
 
 
@@ -245,22 +273,41 @@ async def on_reaction_clear(message: Message, reactions: List[Reaction]):
     await handle_event_in_all_guilds(message.guild, Event.REACTION_CLEAR, message, reactions)
 
 
-# Bot intents must have attribute `presences` set to True
-# @BOT.event
-# async def on_member_update(before: Member, after: Member):
-#     logger.debug(f"Member {format_member(before)} updated to {format_member(after)}")
-#     await handle_event_in_all_guilds(before.guild, Event.MEMBER_UPDATE, before, after)
+# Bot intents must have attribute `members` set to True (`presences` is not needed for role and nickname changes)
+@BOT.event
+async def on_member_update(before: Member, after: Member):
+    if before.roles != after.roles:
+        lazy_debug("Roles of member %s updated", LazyFormat(format_member, after))
+        RoleIndex.get(after.guild).update_member(after)
+    await handle_event_in_all_guilds(before.guild, Event.MEMBER_UPDATE, before, after)
+
+
+@BOT.event
+async def on_guild_channel_update(before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+    await handle_event_in_all_guilds(after.guild, Event.GUILD_CHANNEL_UPDATE, before, after)
+
+
+@BOT.event
+async def on_guild_role_update(before: Role, after: Role):
+    if before.name != after.name:
+        RoleIndex.get(after.guild).invalidate()
+    await handle_event_in_all_guilds(after.guild, Event.GUILD_ROLE_UPDATE, before, after)
+
+
+@BOT.event
+async def on_guild_role_delete(role: Role):
+    RoleIndex.get(role.guild).invalidate()
 
 
 @BOT.event
 async def on_member_ban(guild: Guild, user: Union[User, Member]):
-    logger.debug(f"Member {format_member(user)} was banned from {guild}")
+    lazy_debug("Member %s was banned from %s", LazyFormat(format_member, user), guild)
     await handle_event_in_all_guilds(guild, Event.MEMBER_BAN, guild, user)
 
 
 @BOT.event
 async def on_member_unban(guild: Guild, user: Union[User, Member]):
-    logger.debug(f"Member {format_member(user)} was unbanned from {guild}")
+    lazy_debug("Member %s was unbanned from %s", LazyFormat(format_member, user), guild)
     await handle_event_in_all_guilds(guild, Event.MEMBER_UNBAN, guild, user)
 
 
@@ -283,7 +330,7 @@ async def on_message(message: Message):
 
 @BOT.event
 async def on_voice_state_update(member: Member, before: VoiceState, after: VoiceState):
-    logger.debug(f"Member {format_member(member)} changed its voice state from {before} to {after}")
+    lazy_debug("Member %s changed its voice state from %s to %s", LazyFormat(format_member, member), before, after)
     await handle_event_in_all_guilds(member.guild, Event.VOICE_STATE_UPDATE, member, before, after)
 
 
@@ -292,11 +339,29 @@ async def on_voice_state_update(member: Member, before: VoiceState, after: Voice
 #################
 
 def main():
+    rotate_log_files()  # one file per run
     logger.info("Bot starting")
     # Init singleton GuildManager
     _is_ok = GuildManager().set_bot(BOT, init_guild, max_guilds=MAX_GUILDS, max_pending_guilds=MAX_PENDING_GUILDS)
     if not _is_ok:
         logger.critical("Setting bot in GuildManager failed!")
+    # Receive only events handled by listeners (intents are sent to Discord on connection)
+    if INTENTS_PROFILE == "auto":
+        DISABLED_INTENTS.extend(apply_intents_profile(bot_intents, all_subclasses(AbstractListener), AbstractListener))
+    GatewayEventCounter().install(BOT)  # gateway events until the bot is ready, see startup report
+    # Report blocking calls in debug mode
+    if DEBUG_MODE:
+        LoopMonitor(BOT.loop, threshold=BLOCKING_CALL_THRESHOLD).start()
+    # Measure event-loop lag (see >stats command) and account REST calls (see >rest command)
+    BOT.loop.create_task(Metrics().sample_loop_lag())
+    RestAccounting().install(BOT.http)
+    # Menus and control panels stay in the message cache, chat messages use the bounded cache
+    InteractiveMessageCache().install(BOT)
+    # Serve the website in the event loop of the bot, or send it metrics regularly
+    if PORT:
+        BOT.loop.run_until_complete(WebServer().start(PORT))
+    elif WEBSITE and METRICS_PUSH_PERIOD:
+        BOT.loop.create_task(push_metrics_on_website(METRICS_PUSH_PERIOD))
     # Run the bot
     try:
         logger.info("Bot entering run loop...")
@@ -313,4 +378,5 @@ def main():
 if __name__ == '__main__':
     BOT_INITIALIZED = False
     BOT_STAYING_AWAKE = False
+    DISABLED_INTENTS = []
     main()
@@ -13,6 +13,7 @@ from default_collections import (GuildCollection, CharacterCollection, RoleColle
 from game_models.admin_tools import clear_object_references
 from helpers import TranslationDict
 from helpers.bot_availability import remove_bot_availability_on_website, add_bot_availability_on_website
+from helpers.interactive_messages import InteractiveMessageCache
 from helpers.set_channels import delete_channels
 from helpers.set_server import update_guild_channels, update_guild_roles, update_guild_properties
 from logger import logger
@@ -111,7 +112,7 @@ class GuildManager(metaclass=Singleton):
         for guild in guilds:
             await self.add_guild(guild, versions=versions)
         if not guilds:
-            add_bot_availability_on_website()
+            await add_bot_availability_on_website()
             bot_invite_link = discord.utils.oauth_url(client_id=self._bot.user.id, permissions=Permissions(8))
             logger.info(f"The bot is not in a guild! To invite it, use the following link: {bot_invite_link}")
         return True
@@ -159,7 +160,7 @@ class GuildManager(metaclass=Singleton):
                     await self.show_pending_guild_panel(guild, channel)
                 return None
             # Add the guild
-            remove_bot_availability_on_website()
+            await remove_bot_availability_on_website()
             guild_wrapper = GuildWrapper(self._bot, guild)
             guild_wrapper.listener_manager = ListenerManager(self, guild_wrapper)
             await guild_wrapper.listener_manager.self_start()
@@ -174,6 +175,8 @@ class GuildManager(metaclass=Singleton):
             guild_ref = guild_ref.id
         # Listeners no more referenced in AbstractGuildListener.instances
         AbstractGuildListener.reset_guild(guild_ref)
+        # Menus and control panels of the guild are not kept in cache
+        InteractiveMessageCache().unregister_guild(guild_ref)
         # Listeners stop
         guild_wrapper = self.get_guild(guild_ref)
         if guild_wrapper:
@@ -190,7 +193,7 @@ class GuildManager(metaclass=Singleton):
         clear_object_references()
         # Guild reference is removed
         self._guilds.pop(guild_ref, None)
-        add_bot_availability_on_website()
+        await add_bot_availability_on_website()
         logger.warning(f"Guild {guild_ref} was removed.")
 
     def get_guild(self, guild_ref: Union[int, Guild, GuildWrapper], default=None) -> Optional[GuildWrapper]:
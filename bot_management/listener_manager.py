@@ -14,8 +14,10 @@ from game_models import ChannelMiniGame, AbstractListener, AbstractMiniGame, Abs
 from game_models.abstract_listener import reconstitute_reaction_and_user
 from game_models.admin_tools import clean_channels
 from helpers import format_channel, long_send, TranslationDict
-from helpers.checks import check_channel_description, check_role_description
+from helpers.guild_diff import GuildDiff
+from helpers.interactive_messages import InteractiveMessageCache
 from helpers.invitations import create_invite, delete_invite
+from helpers.rest_accounting import set_rest_label
 from logger import logger
 from models import ChannelDescription, GuildWrapper
 from models.types import ControlEmojiEnum
@@ -189,19 +191,11 @@ def _check_guild(guild: Guild):
     errors_bot_role = _check_bot_privileges(guild)
     if errors_bot_role:
         return errors_bot_role
-    guild_channels = guild.channels
-    errors = []
-    for ch_descr in CategoryChannelCollection.to_list():
-        check_channel_description(ch_descr, guild, guild_channels, errors,
-                                  allowed_role_descriptions=RoleCollection.to_list())
-
-    for ch_descr in ChannelCollection.to_list():
-        check_channel_description(ch_descr, guild, guild_channels, errors,
-                                  allowed_role_descriptions=RoleCollection.to_list())
-
-    for r_descr in RoleCollection.to_list():
-        check_role_description(r_descr, guild, errors)
-    return errors
+    diff = GuildDiff(guild, CategoryChannelCollection.to_list() + ChannelCollection.to_list(),
+                     RoleCollection.to_list())
+    if diff.extra_channels:
+        logger.info(f"Channels not described: {', '.join(channel.name for channel in diff.extra_channels)}")
+    return diff.errors()
 
 
 ##################
@@ -261,12 +255,20 @@ class ManagerListener(AbstractListener):
         self._manager = manager
         super().__init__()
 
+    def _is_manager_message(self, message_id: int) -> bool:
+        return (message_id in self._manager.control_boards or message_id in self._manager.listener_menus
+                or message_id == self._manager.version_choice_message)
+
     async def on_raw_reaction_add(self, payload: RawReactionActionEvent):
+        if not self._is_manager_message(payload.message_id):
+            return
         # Avoid that a disconnection breaks on_reaction_remove
         reaction, user = await reconstitute_reaction_and_user(payload)
         return await self.reaction_add(reaction, user) if reaction else None
 
     async def on_raw_reaction_remove(self, payload: RawReactionActionEvent):
+        if not self._is_manager_message(payload.message_id):
+            return
         # Avoid that a disconnection breaks on_reaction_remove
         reaction, user = await reconstitute_reaction_and_user(payload)
         return await self.reaction_remove(reaction, user) if reaction else None
@@ -421,7 +423,7 @@ class ListenerManager:
     async def _change_reaction(self, listener, status: ListenerStatus):
         for channel, msg_id in self._listeners_to_menu_msg_ids[listener]:
             try:
-                msg = await channel.fetch_message(msg_id)
+                msg = await InteractiveMessageCache().fetch(channel, msg_id)
             except (NotFound, Forbidden, HTTPException) as err:
                 logger.debug(f"Message impossible to get: {err}")
                 self._listeners_to_menu_msg_ids[listener].remove((channel, msg_id))
@@ -472,7 +474,8 @@ class ListenerManager:
             logger.error(f"Listener {listener} is not a ChannelMiniGame!")
             return
         for listener_channel in listener.channels_list:
-            message = await origin_channel.send(f"{format_channel(listener_channel, pretty=True)}")
+            message = InteractiveMessageCache().register(
+                await origin_channel.send(f"{format_channel(listener_channel, pretty=True)}"))
             channel_listener = ChannelListener(listener, listener_channel)
             self._channel_listeners.add(channel_listener)
             self._listener_menus.update({message.id: channel_listener})
@@ -496,7 +499,8 @@ class ListenerManager:
                 continue
             # message = await channel.send(f"---------------\n**[{listener.name}]** {listener.description}")
             embed = discord.Embed(description=listener.description)
-            message = await channel.send(content=f"---------------\n**[{listener.name}]**", embed=embed)
+            message = InteractiveMessageCache().register(
+                await channel.send(content=f"---------------\n**[{listener.name}]**", embed=embed))
             self._listener_menus.update({message.id: listener})
             self._listeners_to_menu_msg_ids[listener].append((channel, message.id))
             await message.add_reaction(ListenerActions.play)
@@ -510,6 +514,67 @@ class ListenerManager:
                 await self._show_channel_listener(listener, origin_channel=channel)
         await self.update_listeners()
 
+    ##################
+    # State snapshot #
+    ##################
+    def _listener_key(self, listener: AbstractListener) -> str:
+        if isinstance(listener, ChannelListener):
+            return f"{self._listener_key(listener._listener)}#{listener.channel.id}"
+        return f"{self._all_listeners.index(listener)}.{listener.__class__.__name__}"
+
+    def export_state(self) -> dict:
+        """State of listeners and boards (see helpers.state_store), to resume after a restart."""
+        listeners = {}
+        for listener in self._all_listeners:
+            listener_state = listener.export_state()
+            if listener_state is not None:
+                listeners[self._listener_key(listener)] = listener_state
+        return {
+            "nb_teams": self._guild_wrapper.nb_teams,
+            "listeners": listeners,
+            "listener_menus": {str(msg_id): self._listener_key(listener)
+                               for msg_id, listener in self._listener_menus.items()},
+            "menu_messages": {self._listener_key(listener): [[channel.id, msg_id] for channel, msg_id in messages]
+                              for listener, messages in self._listeners_to_menu_msg_ids.items() if messages},
+            "control_boards": list(self._control_boards),
+        }
+
+    async def import_state(self, state: dict):
+        guild = self._guild_wrapper.guild
+        self._guild_wrapper.nb_teams = state.get("nb_teams", self._guild_wrapper.nb_teams)
+        listeners = {self._listener_key(listener): listener for listener in self._all_listeners}
+        for key, listener_state in state.get("listeners", {}).items():
+            if key not in listeners:
+                logger.warning(f"Listener {key} not found: its state is not restored")
+                continue
+            await listeners[key].import_state(listener_state)
+            if listeners[key].active:
+                self._active_listeners.add(listeners[key])
+
+        def get_listener(listener_key):  # channel listeners are created again
+            if listener_key not in listeners and "#" in listener_key:
+                key, channel_id = listener_key.split("#")
+                channel = guild.get_channel(int(channel_id))
+                if key in listeners and channel:
+                    listeners[listener_key] = ChannelListener(listeners[key], channel)
+                    self._channel_listeners.add(listeners[listener_key])
+            return listeners.get(listener_key)
+
+        for msg_id, listener_key in state.get("listener_menus", {}).items():
+            listener = get_listener(listener_key)
+            if listener:
+                self._listener_menus[int(msg_id)] = listener
+                InteractiveMessageCache().register_id(int(msg_id), guild.id)
+        for listener_key, messages in state.get("menu_messages", {}).items():
+            listener = get_listener(listener_key)
+            for channel_id, msg_id in messages if listener else []:
+                channel = guild.get_channel(channel_id)
+                if channel:
+                    self._listeners_to_menu_msg_ids[listener].append((channel, msg_id))
+        self._control_boards.update({msg_id: ControlBoardEnum.infinity for msg_id in state.get("control_boards", [])})
+        for msg_id in state.get("control_boards", []):
+            InteractiveMessageCache().register_id(msg_id, guild.id)
+
     #################
     # Control Panel #
     #################
@@ -528,6 +593,7 @@ class ListenerManager:
         # message = await channel.send(embed=discord.Embed(
         #     description=self._messages["CONTROL_BOARD_COMMANDS"].format(**format_dict)))
         self._control_boards.update({message.id: ControlBoardEnum.infinity})
+        InteractiveMessageCache().register(message)
         for reaction in list(ControlBoardEnum):
             await message.add_reaction(reaction.emoji)
 
@@ -577,6 +643,8 @@ class ListenerManager:
 
     async def handle_control_panel_commands_add(self, reaction: Reaction, user: Union[Member, User]):
         assert reaction.message.id in self._control_boards
+        control = next((item.name for item in ControlBoardEnum if item.emoji == reaction.emoji), "unknown")
+        set_rest_label(f"control_panel.{control}")  # REST calls are attributed to the control panel action
         if reaction.emoji == ControlBoardEnum.help.emoji:
             format_dict = get_emoji_dict()
             format_dict.update({"auth_url": discord.utils.oauth_url(reaction.message.guild.me.id,
@@ -621,7 +689,8 @@ class ListenerManager:
                 await clean_channels(reaction.message.guild.channels,
                                      ignore=[CategoryChannelCollection.MASTER.value,
                                              CategoryChannelCollection.DEV.value],
-                                     force=[ChannelCollection.BOARD.value])
+                                     force=[ChannelCollection.BOARD.value],
+                                     report_channel=ChannelCollection.LOG.value.object_reference)
             else:
                 await long_send(channel, self._messages["DANGER_REQUIRED"].format(**get_emoji_dict()),
                                 embed=True)
@@ -673,7 +742,7 @@ class ListenerManager:
         message = await long_send(channel, self._messages["CHANGE_VERSION"].format(**format_dict), embed=True)
         for version_descr in VersionsEnum.to_list():
             await message.add_reaction(version_descr.emoji)
-        self._version_choice_message_id = message.id
+        self._version_choice_message_id = InteractiveMessageCache().register(message).id
         await message.delete(delay=120)  # deleted after 2 minutes
 
     @property
@@ -7,7 +7,7 @@ from discord import Intents, version_info
 from discord.ext.commands import Bot
 from dotenv import load_dotenv
 
-from logger import logger
+from logger import logger, change_logger_level
 
 logger.info(f"Python version: {sys.version_info}\nDiscord.py version: {version_info}")
 _DOT_ENV_PATH = ".env"
@@ -21,14 +21,26 @@ try:
     GAME_LANGUAGE = ast.literal_eval(os.getenv('GAME_LANGUAGE', None))  # string or list of strings
     assert GAME_LANGUAGE is None or isinstance(GAME_LANGUAGE, (str, list))
     AWAKE_REFRESH_PERIOD = int(os.getenv('AWAKE_REFRESH_PERIOD', 50 * 60))
+    METRICS_PUSH_PERIOD = int(os.getenv('METRICS_PUSH_PERIOD', 60))  # in seconds, 0: metrics are not sent
     WEBSITE = os.getenv('WEBSITE', None)
+    PORT = int(os.getenv('PORT', 0))  # if set, the website is served by the bot on this port
     MAX_GUILDS = int(os.getenv('MAX_GUILDS', 1))
     MAX_PENDING_GUILDS = int(os.getenv('MAX_PENDING_GUILDS', 5))
     GAME_LINK = os.getenv("GAME_LINK", "")
     _TOKEN = os.getenv('DISCORD_TOKEN')
     TOKEN_SITE = os.getenv('TOKEN_SITE')
     SONG_PATH = os.getenv("SONG_PATH", "files/_songs/")
+    YTDL_MAX_WORKERS = int(os.getenv("YTDL_MAX_WORKERS", 2))  # threads dedicated to YouTube info extraction
+    YTDL_CACHE_TTL = int(os.getenv("YTDL_CACHE_TTL", 60 * 60))  # lifetime in seconds of YouTube info in cache
+    YTDL_CACHE_SIZE = int(os.getenv("YTDL_CACHE_SIZE", 128))  # maximum number of YouTube info in cache
+    AUDIO_CACHE_SIZE = int(os.getenv("AUDIO_CACHE_SIZE", 32 * 1024 * 1024))  # max size in bytes of cached audio
+    ATTACHMENT_CACHE_SIZE = int(os.getenv("ATTACHMENT_CACHE_SIZE", 32 * 1024 * 1024))  # max size in bytes of files
     VERBOSE = int(os.getenv("VERBOSE", 20) or 20)  # 0: no message, 10: few messages, 20: verbose
+    BLOCKING_CALL_THRESHOLD = float(os.getenv("BLOCKING_CALL_THRESHOLD", 0.2))  # in seconds, reported in debug mode
+    INTENTS_PROFILE = os.getenv("INTENTS_PROFILE", "auto")  # "auto": intents of events handled by listeners only
+    MESSAGE_CACHE_SIZE = int(os.getenv("MESSAGE_CACHE_SIZE", 100))  # chat messages kept in cache (not menus)
+    CHUNK_GUILDS_AT_STARTUP = bool(int(os.getenv("CHUNK_GUILDS_AT_STARTUP", 0)))  # else, chunked on initialization
+    LOG_FILE_LEVEL = os.getenv("LOG_FILE_LEVEL", "debug")  # level of logs/debug.log ("info" skips debug formatting)
     CLIENT_ID = int(os.getenv("CLIENT_ID", None))
     PASSWORD_BOT_INVITE = os.getenv("PASSWORD_BOT_INVITE", None)
     PASSWORD_REMOVE_BOT = os.getenv("PASSWORD_REMOVE_BOT", None)
@@ -49,6 +61,7 @@ else:
     if MAX_GUILDS > 1:
         logger.error(f"More than one guild is not supported yet!")
         exit(3)
+    change_logger_level(LOG_FILE_LEVEL, handler_index=2)  # debug file handler
     logger.info(f"Environment variables:\nGAME_LANGUAGE: {GAME_LANGUAGE}"
                 f"\nVERBOSE: {VERBOSE}\nDEBUG_MODE: {DEBUG_MODE}")
 
@@ -57,8 +70,22 @@ class CustomBot(Bot):
     def __repr__(self):
         return f"<Bot display_name='{self.user.display_name}'>"
 
+    async def close(self):
+        from default_collections import ChannelCollection  # avoid circular imports
+        from flask_server.aio_app import WebServer
+        from helpers.http_client import close_session
+        from helpers.rest_accounting import RestAccounting
+        if not self.is_closed():  # the connection is still open: the report of the session can be sent
+            await RestAccounting().send_report(ChannelCollection.LOG.object_reference)
+        else:
+            RestAccounting().log_report()
+        await WebServer().stop()
+        await close_session()
+        await super().close()
+
 
 bot_intents = Intents.default()
-bot_intents.members = True
+bot_intents.members = True  # with INTENTS_PROFILE "auto", unused intents are disabled before the bot runs
 
-BOT = CustomBot(command_prefix="$", intents=bot_intents)
+BOT = CustomBot(command_prefix="$", intents=bot_intents, max_messages=MESSAGE_CACHE_SIZE,
+                chunk_guilds_at_startup=CHUNK_GUILDS_AT_STARTUP)
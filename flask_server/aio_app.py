@@ -0,0 +1,243 @@
+"""Website served by the bot, in its event loop (same routes and templates as the Flask app).
+
+State (bot availability, game link, metrics) is shared in memory with the bot: no HTTP round-trip is needed.
+"""
+import asyncio
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+import discord
+import jinja2
+from aiohttp import web
+
+from constants import GAME_LINK, TOKEN_SITE, CLIENT_ID, PASSWORD_BOT_INVITE, BOT
+from flask_server.render_cache import RenderCache, StaticCache, Response
+from helpers.json_helpers import TranslationDict
+from logger import logger, lazy_debug
+from models.types import Singleton
+
+MESSAGES = TranslationDict(path="configuration/minigames/map_game/")
+_ROOT = os.path.dirname(__file__)
+INVITE_CHECK_TTL = 5 * 60  # in seconds, validity of an invite link check
+
+_templates = jinja2.Environment(loader=jinja2.FileSystemLoader(os.path.join(_ROOT, "templates")),
+                                autoescape=jinja2.select_autoescape(["html"]))
+
+
+class WebState:
+    game_link = GAME_LINK
+    client_id = CLIENT_ID
+    bot_available = None  # None: bot starting / False: not available / True: available
+    metrics = ""  # Prometheus metrics posted by another bot (the bot serving the website exposes its own metrics)
+
+
+def update_state(**values):
+    """Update WebState attributes (e.g. game_link, bot_available). Pages are rendered again."""
+    for key, value in values.items():
+        setattr(WebState, key, value)
+    _pages.invalidate()
+
+
+_invite_checks: Dict[str, Tuple[bool, float]] = {}  # {link: (is valid, check time)}
+_running_checks: Dict[str, asyncio.Future] = {}  # {link: check in progress}, one check at a time per link
+
+
+async def _fetch_invite_validity(link: str) -> bool:
+    try:
+        invite = await BOT.fetch_invite(link, with_counts=False)
+    except discord.NotFound as err:
+        logger.debug(f"Invalid link {link}. Error: {err}")
+        is_valid = False
+    except (discord.HTTPException, asyncio.TimeoutError, aiohttp.ClientError) as err:  # checked again next time
+        logger.warning(f"Failed to check invite link {link}: {err!r}")
+        return _invite_checks.get(link, (True, 0.))[0]
+    else:
+        logger.debug(f"Valid link {link}. Invite: {invite}")
+        is_valid = True
+    _invite_checks[link] = (is_valid, time.time())
+    return is_valid
+
+
+async def check_invite_link(link: str) -> bool:
+    """Whether the invite link is valid, checked with Discord by the bot (results are kept a few minutes).
+
+    Concurrent requests share the same check. While an expired result is checked again, it is returned as is.
+    """
+    if not link.startswith("https://discord"):
+        return False
+    if not BOT.is_ready():
+        return True  # cannot check yet
+    is_valid, check_time = _invite_checks.get(link, (None, 0.))
+    if is_valid is not None and time.time() - check_time <= INVITE_CHECK_TTL:
+        return is_valid
+    check = _running_checks.get(link)
+    if check is None:
+        check = _running_checks[link] = asyncio.ensure_future(_fetch_invite_validity(link))
+        check.add_done_callback(lambda _check: _running_checks.pop(link, None))
+    if is_valid is not None:
+        return is_valid  # last known result
+    return await asyncio.shield(check)  # the check goes on if this request is cancelled
+
+
+def _render(template_name: str, **context) -> str:
+    return _templates.get_template(template_name).render(**context)
+
+
+_pages = RenderCache(_render)
+_static_files = StaticCache(os.path.join(_ROOT, "static"))
+
+
+def render_template(template_name: str, **context) -> web.Response:
+    return web.Response(text=_render(template_name, **context), content_type="text/html")
+
+
+def _to_response(response: Response) -> web.Response:
+    status, body, headers = response
+    return web.Response(status=status, body=body, headers=headers)
+
+
+async def _json_body(request: web.Request) -> dict:
+    try:
+        body = await request.json()
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+def _metrics_text() -> str:
+    from helpers.instrumentation import Metrics  # avoid circular imports
+    return Metrics().to_prometheus() if WebServer().running else WebState.metrics
+
+
+# Routes
+
+async def index(request: web.Request):
+    game_link = WebState.game_link if await check_invite_link(WebState.game_link) else "#"
+    bot_available = WebState.bot_available
+    bot_invite_path = "/bot_invite" if bot_available else "/" if bot_available is None else "#"
+    lazy_debug("Get request to /: game link=%s, bot_invite_path=%s", game_link, bot_invite_path)
+    page = _pages.get("index.html", game_link=game_link, bot_invite_path=bot_invite_path)
+    return _to_response(page.respond(request.headers))
+
+
+async def bot_invite_page(request: web.Request):
+    lazy_debug("Get request to /bot_invite. Current bot availability: %s", WebState.bot_available)
+    return _to_response(_pages.get("bot_invite.html").respond(request.headers))
+
+
+async def static(request: web.Request):
+    static_file = _static_files.get(request.match_info["filename"])
+    if static_file is None:
+        raise web.HTTPNotFound()
+    return _to_response(static_file.respond(request.headers))
+
+
+async def bot_invite(request: web.Request):
+    code = (await _json_body(request)).get("code", None)
+    if code != PASSWORD_BOT_INVITE:
+        return web.json_response({"ok": False}, status=401)
+    if not WebState.client_id:
+        return web.json_response({"ok": False}, status=400)
+    invite_link = f"https://discord.com/oauth2/authorize?client_id={WebState.client_id}&scope=bot&permissions=8"
+    logger.info(f"Returning bot invite link: {invite_link}")
+    return web.json_response({"ok": True, "link": invite_link})
+
+
+async def invite(request: web.Request):
+    if request.method == "GET":  # no token required, the link is shown on the website
+        return web.json_response({"ok": True, "link": WebState.game_link})
+    body = await _json_body(request)
+    if body.get("token", None) != TOKEN_SITE:
+        return web.json_response({"ok": False}, status=401)
+    if request.method == "DELETE":
+        logger.info(f"Invite link {WebState.game_link} deleted.")
+        update_state(game_link="")
+        return web.json_response({"ok": True, "mode": "delete"})
+    new_game_link = body.get("link", None)
+    if new_game_link and new_game_link.startswith("https://discord."):
+        update_state(game_link=new_game_link)
+        logger.info(f"Invitation link updated to {new_game_link}")
+        return web.json_response({"ok": True, "mode": "create"})
+    return web.json_response({"ok": False}, status=400)
+
+
+async def change_availability(request: web.Request):
+    if request.method == "GET":  # no token required
+        return web.json_response({"ok": True, "available": WebState.bot_available})
+    if (await _json_body(request)).get("token", None) != TOKEN_SITE:
+        return web.json_response({"ok": False}, status=401)
+    update_state(bot_available=request.method == "POST")
+    return web.json_response({"ok": True, "mode": "add" if WebState.bot_available else "remove"})
+
+
+async def post_metrics(request: web.Request):
+    body = await _json_body(request)
+    if body.get("token", None) != TOKEN_SITE:
+        return web.json_response({"ok": False}, status=401)
+    WebState.metrics = body.get("metrics", "")
+    return web.json_response({"ok": True})
+
+
+async def metrics(request: web.Request):
+    return web.Response(text=_metrics_text(), headers={"Content-Type": "text/plain; version=0.0.4"})
+
+
+async def map_route(request: web.Request):
+    code = request.match_info["code"]
+    if code != MESSAGES["MAP_CODE"]:
+        return render_template("error_code.html",
+                               message=MESSAGES["ERROR_MESSAGE"].format(code=code),
+                               title=MESSAGES["ERROR_TITLE"])
+    raise web.HTTPFound(f"{MESSAGES['REAL_LINK_PREFIX']}{code}")
+
+
+def create_app() -> web.Application:
+    app = web.Application()
+    app.add_routes([
+        web.get("/", index),
+        web.get("/bot_invite", bot_invite_page),
+        web.post("/api/bot_invite", bot_invite),
+        web.get("/api/invite", invite),
+        web.post("/api/invite", invite),
+        web.delete("/api/invite", invite),
+        web.get("/api/availability", change_availability),
+        web.post("/api/availability", change_availability),
+        web.delete("/api/availability", change_availability),
+        web.post("/api/metrics", post_metrics),
+        web.get("/metrics", metrics),
+        web.get("/map/{code}", map_route),
+        web.get("/static/{filename:.+}", static),
+    ])
+    return app
+
+
+class WebServer(metaclass=Singleton):
+    """Website running in the event loop of the bot."""
+
+    def __init__(self):
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def running(self) -> bool:
+        return self._runner is not None
+
+    async def start(self, port: int, host="0.0.0.0"):
+        if self._runner:
+            return
+        runner = web.AppRunner(create_app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        self._runner = runner
+        logger.info(f"Website served on port {port}")
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+            logger.info("Website stopped")
+
+
+if __name__ == '__main__':
+    web.run_app(create_app(), port=int(os.getenv("PORT", 5000)))
@@ -1,14 +1,16 @@
 import asyncio
 import functools
+import os
 
 import discord
-from flask import Flask, render_template, redirect, request
+from flask import Flask, render_template, redirect, request, abort
 
 from constants import GAME_LINK, _TOKEN, TOKEN_SITE, CLIENT_ID, PASSWORD_BOT_INVITE
+from flask_server.render_cache import RenderCache, StaticCache
 from helpers.json_helpers import TranslationDict
-from logger import logger
+from logger import logger, lazy_debug
 
-app = Flask(__name__)
+app = Flask(__name__, static_folder=None)  # static files are served from StaticCache
 
 MESSAGES = TranslationDict(path="configuration/minigames/map_game/")
 
@@ -17,6 +19,16 @@ class Config:
     game_link = GAME_LINK
     client_id = CLIENT_ID
     bot_available = None  # None: bot starting / False: not available / True: available
+    metrics = ""  # Prometheus metrics posted by the bot
+
+
+pages = RenderCache(render_template)  # pages only depend on Config: invalidated when it changes
+static_files = StaticCache(os.path.join(os.path.dirname(__file__), "static"))
+
+
+def _respond(cached_response):
+    status, body, headers = cached_response.respond(request.headers)
+    return body, status, headers
 
 
 # TODO: not working:
@@ -51,16 +63,23 @@ def index():
     is_link_valid = Config.game_link.startswith("https://discord")  # todo: replace by a discord check (issue: async)
     game_link = Config.game_link if is_link_valid else "#"
     bot_invite_path = "/bot_invite" if Config.bot_available else "/" if Config.bot_available is None else "#"
-    logger.info(f"Get request to /. Returning index.html rendered: "
-                f"game link={game_link}, bot_invite_path={bot_invite_path}")
-    return render_template("index.html", game_link=game_link, bot_invite_path=bot_invite_path)
+    lazy_debug("Get request to /: game link=%s, bot_invite_path=%s", game_link, bot_invite_path)
+    return _respond(pages.get("index.html", game_link=game_link, bot_invite_path=bot_invite_path))
 
 
 # An invite link for the bot
 @app.route('/bot_invite', methods=['GET'])
 def bot_invite_page():
-    logger.info(f"Get request to /bot_invite. Current bot availability: {Config.bot_available}")
-    return render_template("bot_invite.html")
+    lazy_debug("Get request to /bot_invite. Current bot availability: %s", Config.bot_available)
+    return _respond(pages.get("bot_invite.html"))
+
+
+@app.route('/static/<path:filename>', methods=['GET'])
+def static(filename):
+    static_file = static_files.get(filename)
+    if static_file is None:
+        abort(404)
+    return _respond(static_file)
 
 
 @app.route('/api/bot_invite', methods=['POST'])
@@ -77,8 +96,12 @@ def bot_invite():
     return {"ok": True, "link": invite_link}, 200
 
 
-@app.route('/api/invite', methods=['POST', 'DELETE'])
+@app.route('/api/invite', methods=['GET', 'POST', 'DELETE'])
 def invite():
+    # GET method (no token required, the link is shown on the website)
+    if request.method == "GET":
+        return {"ok": True, "link": Config.game_link}, 200
+
     token_site = request.json.get("token", None)
     if token_site != TOKEN_SITE:
         return {"ok": False}, 401
@@ -87,19 +110,25 @@ def invite():
     if request.method == "DELETE":
         logger.info(f"Invite link {Config.game_link} deleted.")
         Config.game_link = ""
+        pages.invalidate()
         return {"ok": True, "mode": "delete"}, 200
 
     # POST method
     new_game_link = request.json.get("link", None)
     if new_game_link and new_game_link.startswith("https://discord."):
         Config.game_link = new_game_link
+        pages.invalidate()
         logger.info(f"Invitation link updated to {new_game_link}")
         return {"ok": True, "mode": "create"}, 200
     return {"ok": False}, 400
 
 
-@app.route('/api/availability', methods=['POST', 'DELETE'])
+@app.route('/api/availability', methods=['GET', 'POST', 'DELETE'])
 def change_availability():
+    # GET method (no token required)
+    if request.method == "GET":
+        return {"ok": True, "available": Config.bot_available}, 200
+
     token_site = request.json.get("token", None)
     if token_site != TOKEN_SITE:
         return {"ok": False}, 401
@@ -107,15 +136,32 @@ def change_availability():
     # DELETE METHOD
     if request.method == "DELETE":
         Config.bot_available = False
+        pages.invalidate()
         return {"ok": True, "mode": "remove"}, 200
 
     # POST method
     if request.method == "POST":
         Config.bot_available = True
+        pages.invalidate()
         return {"ok": True, "mode": "add"}, 200
     return {"ok": False}, 400
 
 
+@app.route('/api/metrics', methods=['POST'])
+def post_metrics():
+    token_site = request.json.get("token", None)
+    if token_site != TOKEN_SITE:
+        return {"ok": False}, 401
+    Config.metrics = request.json.get("metrics", "")
+    return {"ok": True}, 200
+
+
+# Prometheus endpoint (metrics of the bot, updated each time it stays awake)
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Config.metrics, 200, {"Content-Type": "text/plain; version=0.0.4"}
+
+
 @app.route('/map/<code>')
 def map_route(code):
     if code != MESSAGES["MAP_CODE"]:
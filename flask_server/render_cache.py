@@ -0,0 +1,103 @@
+"""Cache of rendered pages and static files, with conditional requests (ETag, Last-Modified) and gzip.
+
+It does not depend on the web framework: responses are returned as (status, body, headers).
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+MIN_GZIP_SIZE = 512  # smaller bodies are not compressed
+STATIC_MAX_AGE = 24 * 60 * 60  # in seconds, browsers revalidate static files after this delay
+
+Response = Tuple[int, bytes, Dict[str, str]]
+
+
+class CachedResponse:
+    """Body of a response, compressed once, with its validators."""
+    __slots__ = ("body", "gzipped", "etag", "gzip_etag", "mtime", "last_modified", "content_type", "cache_control")
+
+    def __init__(self, body: bytes, content_type: str, mtime: float = None, max_age=0):
+        self.body = body
+        compressed = gzip.compress(body) if len(body) >= MIN_GZIP_SIZE else None
+        self.gzipped = compressed if compressed and len(compressed) < len(body) else None
+        self.etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        self.gzip_etag = f'{self.etag[:-1]}-gz"'  # strong validators must differ between encodings
+        self.mtime = int(mtime if mtime is not None else time.time())
+        self.last_modified = formatdate(self.mtime, usegmt=True)
+        self.content_type = content_type
+        self.cache_control = f"public, max-age={max_age}" if max_age else "no-cache"  # no-cache: revalidate
+
+    def _not_modified(self, request_headers: Mapping[str, str]) -> bool:
+        if_none_match = request_headers.get("If-None-Match")
+        if if_none_match is not None:  # has precedence over If-Modified-Since
+            return if_none_match.strip() == "*" or any(tag.strip().replace("W/", "", 1) in (self.etag, self.gzip_etag)
+                                                       for tag in if_none_match.split(","))
+        if_modified_since = request_headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return self.mtime <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def respond(self, request_headers: Mapping[str, str]) -> Response:
+        use_gzip = self.gzipped is not None and "gzip" in request_headers.get("Accept-Encoding", "")
+        headers = {"ETag": self.gzip_etag if use_gzip else self.etag, "Last-Modified": self.last_modified,
+                   "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        if self._not_modified(request_headers):
+            return 304, b"", headers
+        headers["Content-Type"] = self.content_type
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return 200, self.gzipped, headers
+        return 200, self.body, headers
+
+
+class RenderCache:
+    """Pages rendered once for each context. The context must only contain hashable values (e.g. strings).
+
+    Cached pages are kept until invalidate() is called, e.g. when the state used to build contexts changes.
+    """
+
+    def __init__(self, render: Callable[..., str]):
+        self._render = render  # render(template_name, **context) -> html
+        self._pages: Dict[Tuple, CachedResponse] = {}
+
+    def get(self, template_name: str, **context) -> CachedResponse:
+        key = (template_name, *sorted(context.items()))
+        page = self._pages.get(key)
+        if page is None:
+            html = self._render(template_name, **context)
+            page = self._pages[key] = CachedResponse(html.encode("utf-8"), "text/html; charset=utf-8")
+        return page
+
+    def invalidate(self):
+        self._pages.clear()
+
+    def __len__(self):
+        return len(self._pages)
+
+
+class StaticCache:
+    """Static files read and compressed once (files are expected to be small and not modified while running)."""
+
+    def __init__(self, directory: str):
+        self._directory = os.path.abspath(directory)
+        self._files: Dict[str, CachedResponse] = {}
+
+    def get(self, filename: str) -> Optional[CachedResponse]:
+        path = os.path.abspath(os.path.join(self._directory, filename))
+        cached = self._files.get(path)  # different names (e.g. "a/../b.css" and "b.css") share the same entry
+        if cached is None:
+            if not path.startswith(self._directory + os.sep) or not os.path.isfile(path):
+                return None  # outside of the static directory or not found
+            with open(path, "rb") as file:
+                body = file.read()
+            content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            cached = self._files[path] = CachedResponse(body, content_type, os.path.getmtime(path),
+                                                        max_age=STATIC_MAX_AGE)
+        return cached
@@ -1,17 +1,65 @@
 import asyncio
-from typing import Dict
+from typing import Any, Dict, Set, Callable, Iterator
 
 import discord
-from discord import TextChannel
+from discord import TextChannel, Member, Role
 
 from game_models.abstract_minigame import AbstractMiniGame
 from helpers import format_channel, return_
+from helpers.rest_accounting import rest_label
 from logger import logger
 
 
+class ChannelMemberSet:
+    """Members who can read a channel and pass a filter.
+
+    The set is computed once, then maintained incrementally from member, channel and role events,
+    so that its length is always available without iterating over the members of the guild.
+    """
+
+    def __init__(self, channel: discord.abc.GuildChannel, member_filter: Callable[[Member], bool] = None):
+        self._channel = channel
+        self._member_filter = member_filter
+        self._member_ids: Set[int] = set()
+
+    def _accepts(self, member: Member) -> bool:
+        if not self._channel.permissions_for(member).read_messages:
+            return False
+        return self._member_filter is None or self._member_filter(member)
+
+    def set_channel(self, channel: discord.abc.GuildChannel):
+        self._channel = channel
+
+    def refresh(self):
+        """Compute the set again, from all members of the guild."""
+        self._member_ids = {member.id for member in self._channel.guild.members if self._accepts(member)}
+
+    def update_member(self, member: Member):
+        if self._accepts(member):
+            self._member_ids.add(member.id)
+        else:
+            self._member_ids.discard(member.id)
+
+    def remove_member(self, member: Member):
+        self._member_ids.discard(member.id)
+
+    def __contains__(self, member: Member) -> bool:
+        return member.id in self._member_ids
+
+    def __len__(self) -> int:
+        return len(self._member_ids)
+
+    def __iter__(self) -> Iterator[Member]:
+        for member_id in self._member_ids.copy():
+            member = self._channel.guild.get_member(member_id)
+            if member is not None:
+                yield member
+
+
 class ChannelGameStatus:
     def __init__(self, channel: discord.abc.GuildChannel):
         self._channel = channel
+        self.member_set = ChannelMemberSet(channel, self._is_player)  # refreshed when a channel game starts
         self._data = {}  # not cleared nor reset
         self.number_of_games = 0  # not cleared
         self.active = False
@@ -27,8 +75,16 @@ class ChannelGameStatus:
     def data(self):
         return self._data
 
+    @property
+    def channel(self):
+        return self._channel
+
+    def _is_player(self, member: Member) -> bool:  # to be overridden to filter players
+        return not member.bot
+
     def clear(self):
         self._channel = self._channel.guild.get_channel(self._channel.id)  # refresh channels (members can change !)
+        self.member_set.set_channel(self._channel)
         self.active = False
 
     def reset(self):
@@ -36,6 +92,24 @@ class ChannelGameStatus:
         self.number_of_games = 0
         logger.info(f"Game reset in channel {format_channel(self._channel)} (Status type: {self.__class__.__name__})")
 
+    # State snapshot (see ChannelMiniGame.export_state)
+    def export_state(self) -> dict:  # to be extended
+        return {"active": self.active, "number_of_games": self.number_of_games}
+
+    def import_state(self, state: dict):  # to be extended. Called after clear: default values are already set
+        self.active = state["active"]
+        self.number_of_games = state["number_of_games"]
+
+    @staticmethod
+    def _export_members(members: Dict[Member, Any]) -> Dict[str, Any]:
+        return {str(member.id): value for member, value in members.items()}
+
+    def _import_members(self, members: Dict[str, Any]) -> Dict[Member, Any]:
+        """Members who left the guild are ignored."""
+        guild = self._channel.guild
+        return {member: value for member, value in ((guild.get_member(int(member_id)), value)
+                                                    for member_id, value in members.items()) if member is not None}
+
 
 class ChannelGameStatuses:
     def __init__(self, default_factory=ChannelGameStatus):
@@ -73,6 +147,7 @@ class ChannelGameStatuses:
 
 class ChannelMiniGame(AbstractMiniGame):
     _max_games_per_channel = None  # A channel game is played as many times as wanted by default
+    _restore_channel_states = False  # whether statuses of channels are restored after a restart (see export_state)
 
     def __init__(self, **kwargs):
         self._max_plays = kwargs.pop("max_games", self._max_games_per_channel)  # None for infinite number of games
@@ -90,9 +165,36 @@ class ChannelMiniGame(AbstractMiniGame):
             return []
         return [channel_enum.value.object_reference for channel_enum in self._allowed_channels]
 
+    def _set_channel_data(self, channel):  # to be overridden, to set data of the channel status
+        pass
+
     def reset_channel_stats(self, channel):
         self._channels[channel].clear()
 
+    def refresh_members(self, channel):
+        """Compute members of the channel again. Events are not received while the mini-game is not active."""
+        self._channels[channel].member_set.set_channel(channel.guild.get_channel(channel.id) or channel)
+        self._channels[channel].member_set.refresh()
+
+    # State snapshot (see helpers.state_store)
+
+    def export_state(self):
+        if not self._restore_channel_states or not self._active:
+            return None
+        return {"channels": {str(channel.id): status.export_state() for channel, status in self._channels.items()}}
+
+    async def import_state(self, state):
+        for channel_id, channel_state in state["channels"].items():
+            channel = self.guild.get_channel(int(channel_id))
+            if channel is None:
+                logger.warning(f"Channel {channel_id} not found: its game status is not restored")
+                continue
+            self._set_channel_data(channel)
+            self.refresh_members(channel)
+            self.reset_channel_stats(channel)
+            self._channels[channel].import_state(channel_state)
+        self._active = True
+
     # Start
 
     def _init(self) -> bool:
@@ -100,13 +202,43 @@ class ChannelMiniGame(AbstractMiniGame):
             return True  # ChannelMinigame allowed everywhere.
         for channel_enum in self._allowed_channels:
             channel = channel_enum.value.object_reference
+            self.refresh_members(channel)
             self.reset_channel_stats(channel)
         return True
 
     async def _init_channel(self, channel) -> bool:
+        self.refresh_members(channel)
         self.reset_channel_stats(channel)
         return True
 
+    # Members of channels
+
+    async def on_member_join(self, member: Member):
+        for status in self._channels.values():
+            status.member_set.update_member(member)
+
+    async def on_member_remove(self, member: Member):
+        for status in self._channels.values():
+            status.member_set.remove_member(member)
+
+    async def on_member_update(self, before: Member, after: Member):
+        if before.roles == after.roles:
+            return
+        for status in self._channels.values():
+            status.member_set.update_member(after)
+
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if after in self._channels and before.overwrites != after.overwrites:
+            self._channels[after].member_set.set_channel(after)
+            self._channels[after].member_set.refresh()
+
+    async def on_guild_role_update(self, before: Role, after: Role):
+        if before.permissions == after.permissions:
+            return
+        for channel, status in self._channels.items():  # e.g. read_messages granted or revoked by the role
+            if status.active:
+                self.refresh_members(channel)
+
     async def start_channel(self, channel) -> bool:
         if self._channels[channel].lock_init.locked():  # already starting the channel
             logger.info(f"The mini-game {self.__class__.__name__} is already starting in channel {channel}!")
@@ -126,7 +258,9 @@ class ChannelMiniGame(AbstractMiniGame):
                 logger.info(
                     f"Minigame {self.__class__.__name__} already started in channel {format_channel(channel)}")
                 return False
-            if await self._init_channel(channel):
+            with rest_label(f"{self.__class__.__name__}._init_channel"):
+                is_initialized = await self._init_channel(channel)
+            if is_initialized:
                 self._channels[channel].active = True
                 logger.debug(f"Game {self.__class__.__name__} started in channel {format_channel(channel)}")
                 if self._listener_manager:
@@ -151,7 +285,8 @@ class ChannelMiniGame(AbstractMiniGame):
             return
         async with self._channels[channel].lock_victory:
             if self._channels[channel].active:
-                await return_(self._on_channel_helped_victory(channel))
+                with rest_label(f"{self.__class__.__name__}._on_channel_helped_victory"):
+                    await return_(self._on_channel_helped_victory(channel))
                 self._channels[channel].number_of_games += 1
             await self.stop_channel(channel)
 
@@ -168,7 +303,8 @@ class ChannelMiniGame(AbstractMiniGame):
             logger.debug("Victory already started!")
             return
         async with self._channels[channel].lock_victory:
-            await return_(self._on_channel_victory(channel))
+            with rest_label(f"{self.__class__.__name__}._on_channel_victory"):
+                await return_(self._on_channel_victory(channel))
             if self._channels[channel].active:
                 self._channels[channel].number_of_games += 1
             await self.stop_channel(channel)
@@ -199,5 +335,6 @@ class TextChannelMiniGame(ChannelMiniGame):
         if not isinstance(channel, TextChannel):
             logger.warning(f"Channel {channel} is not a text channel")
             return False
+        self.refresh_members(channel)
         self.reset_channel_stats(channel)
         return True
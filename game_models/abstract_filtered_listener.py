@@ -7,7 +7,7 @@ from discord import Message, Reaction, Member, User
 from default_collections import ChannelCollection, RoleCollection
 from game_models.abstract_listener import AbstractListener
 from helpers import user_to_member
-from logger import logger
+from logger import lazy_debug
 from models import ChannelDescription, RoleDescription
 from models.abstract_models import SpecifiedDictCollection
 
@@ -118,7 +118,7 @@ class AbstractFilteredListener(AbstractListener):
         if message is None:
             # logger.debug(f"Message discarded: {message}")
             return
-        logger.debug(f"Message {message.content[:100]} passed the filter in mini-game {self.__class__.__name__}")
+        lazy_debug("Message %.100s passed the filter in mini-game %s", message.content, self.__class__.__name__)
         res = self._analyze_message(message)
         if inspect.isawaitable(res):
             res = await res
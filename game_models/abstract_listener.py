@@ -5,10 +5,13 @@ from typing import Union, List, Awaitable, Optional, Tuple
 
 import discord
 from discord import (Member, Message, User, Guild, Reaction, VoiceState, RawReactionActionEvent, NotFound, Forbidden,
-                     HTTPException, Emoji, PartialEmoji)
+                     HTTPException, Emoji, PartialEmoji, Role)
+from discord.abc import GuildChannel
 
 from constants import BOT
 from helpers import TranslationDict
+from helpers.interactive_messages import InteractiveMessageCache
+from helpers.rest_accounting import rest_label
 from logger import logger
 from models.types import AbstractGuildListener
 
@@ -21,7 +24,7 @@ async def reconstitute_reaction_and_user(payload: RawReactionActionEvent) -> Tup
             logger.warning(f"Member can not be retrieved for this reaction: {payload}"
                            f"\nPermission denied or not in guild ?")
         channel = guild.get_channel(payload.channel_id)
-        message = await channel.fetch_message(payload.message_id)
+        message = await InteractiveMessageCache().fetch(channel, payload.message_id)
     except (NotFound, Forbidden, HTTPException, AttributeError) as err:
         logger.debug(f"Impossible to fetch message linked to raw add reaction: {err}")
         return None, None
@@ -92,9 +95,10 @@ class AbstractListener(AbstractGuildListener):
             if self._active:  # mini-game already started
                 logger.debug(f"{self.__class__.__name__} already started!")
                 return False
-            _res = self._init()
-            if inspect.isawaitable(_res):
-                _res = await _res
+            with rest_label(f"{self.__class__.__name__}._init"):  # REST calls are attributed to the game phase
+                _res = self._init()
+                if inspect.isawaitable(_res):
+                    _res = await _res
             if not _res:
                 return False
             self._active = True
@@ -107,9 +111,10 @@ class AbstractListener(AbstractGuildListener):
         return True
 
     async def stop(self) -> bool:
-        _res = self._close()
-        if inspect.isawaitable(_res):
-            _res = await _res
+        with rest_label(f"{self.__class__.__name__}._close"):
+            _res = self._close()
+            if inspect.isawaitable(_res):
+                _res = await _res
         if not _res:
             return False
         self._active = False
@@ -121,6 +126,15 @@ class AbstractListener(AbstractGuildListener):
     def reload(self, versions=None, clear=True):
         self._messages.load(versions=versions, clear=clear)
 
+    # State snapshot (see helpers.state_store)
+    def export_state(self) -> Optional[dict]:  # to be overridden
+        """Returns the state to restore after a restart (JSON-serialisable, with ids instead of objects)."""
+        return None
+
+    async def import_state(self, state: dict):  # to be overridden
+        """Restores a state returned by export_state, without calling _init (no message is sent again)."""
+        pass
+
     async def on_ready(self):
         if self._auto_start:
             await self.start()
@@ -161,8 +175,14 @@ class AbstractListener(AbstractGuildListener):
     async def on_member_remove(self, member: Member):
         pass
 
-    # async def on_member_update(self, before: Member, after: Member):
-    #     pass
+    async def on_member_update(self, before: Member, after: Member):
+        pass
+
+    async def on_guild_channel_update(self, before: GuildChannel, after: GuildChannel):
+        pass
+
+    async def on_guild_role_update(self, before: Role, after: Role):
+        pass
 
     async def on_member_ban(self, guild: Guild, user: Union[User, Member]):
         pass
@@ -2,6 +2,7 @@ import asyncio
 
 from game_models.abstract_filtered_listener import AbstractFilteredListener
 from helpers.discord_helpers import return_
+from helpers.rest_accounting import rest_label
 from logger import logger
 
 
@@ -62,7 +63,8 @@ class AbstractMiniGame(AbstractFilteredListener):
             return
         logger.debug(f"Acquiring victory lock for listener {self.name}")
         async with self.__lock_victory:
-            await return_(self._on_victory(*args, **kwargs))
+            with rest_label(f"{self.__class__.__name__}._on_victory"):
+                await return_(self._on_victory(*args, **kwargs))
             logger.info(f"Victory for game {self.__class__.__name__}")
             await self.stop()
         logger.debug(f"Victory lock released for listener {self.name}")
@@ -77,6 +79,7 @@ class AbstractMiniGame(AbstractFilteredListener):
         logger.debug(f"Acquiring victory lock for listener {self.name}")
         async with self.__lock_victory:
             if self.active:
-                await return_(self._on_helped_victory())
+                with rest_label(f"{self.__class__.__name__}._on_helped_victory"):
+                    await return_(self._on_helped_victory())
             await self.stop()
         logger.debug(f"Victory lock released for listener {self.name}")
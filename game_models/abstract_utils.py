@@ -6,6 +6,7 @@ from constants import VERBOSE
 from game_models.abstract_filtered_listener import AbstractFilteredListener
 from helpers import long_send, return_
 from helpers.commands_helpers import get_args_from_text
+from helpers.rest_accounting import set_rest_label
 from logger import logger
 
 
@@ -102,6 +103,7 @@ class CommandUtils(AbstractFilteredListener):
                     if arg in args:
                         args.pop(args.index(arg))
                         await getattr(self, pre_method)(message, args)
+            set_rest_label(f"{self.__class__.__name__}.{method}")  # REST calls are attributed to the command
             return await return_(getattr(self, method)(message, args))
         logger.debug(f"Command not found: {command}")
 
@@ -1,6 +1,6 @@
 from typing import List, Union
 
-from discord import TextChannel
+from discord import TextChannel, NotFound, HTTPException
 from discord.abc import GuildChannel
 
 from constants import BOT
@@ -8,6 +8,8 @@ from default_collections import RoleCollection, CategoryChannelCollection, Chann
     GuildCollection
 from helpers import (format_list, format_message, long_send, get_guild_info, get_channels_info,
                      get_roles_info, get_members_info)
+from helpers.attachment_cache import AttachmentCache
+from helpers.channel_purge import PurgeStrategy, purge_channel, purge_channels
 from helpers.commands_helpers import find_channel_mentions_in_message
 from helpers.message_helpers import safe_send
 from helpers.set_channels import fetch_channels
@@ -38,37 +40,60 @@ def filter_channels(channels: List[GuildChannel], ignore: List[Union[GuildChanne
     return filtered_channels
 
 
-async def clean_channels(channels, limit=None, ignore="default", force=None):
+async def clean_channels(channels, limit=None, ignore="default", force=None, strategy=PurgeStrategy.PURGE,
+                         report_channel: TextChannel = None):
+    """Purge game channels concurrently (see helpers.channel_purge). Progress is shown in report_channel.
+
+    With the RECREATE and AUTO strategies, recreated channels have new ids: channel descriptions are fetched again,
+    but mini-games started in these channels must be restarted.
+    """
     if ignore == "default":
         ignore = [CategoryChannelCollection.MASTER.value, CategoryChannelCollection.DEV.value]
     ignore = ignore or []
     force = force or []
     filtered_channels = filter_channels(channels, ignore, force)
     logger.info(f"Cleaning channels {filtered_channels}")
-    result = True
+    channel_descriptions = {}
     for channel_enum in ChannelCollection.to_list():
         channel = channel_enum.value.object_reference
-        if channel is None or channel not in filtered_channels:
-            continue
-        if not await clean_channel(channel, limit):
-            result = False
+        if isinstance(channel, TextChannel) and channel in filtered_channels:
+            channel_descriptions[channel] = channel_enum.value
+    progress_message = await safe_send(report_channel, f"Cleaning {len(channel_descriptions)} channels...")
+
+    async def on_progress(_report, done, total):
+        if not progress_message:
+            return
+        try:
+            await progress_message.edit(content=f"Cleaning channels... {done}/{total}")
+        except (NotFound, HTTPException) as err:
+            logger.debug(f"Failed to show progress of channel cleaning: {err}")
+
+    reports = await purge_channels(list(channel_descriptions), limit, strategy=strategy, on_progress=on_progress)
+    AttachmentCache().clear_urls()  # attachments deleted with their messages
+    recreated_channels = [report.new_channel for report in reports if report.new_channel]
+    if recreated_channels:  # ids have changed: all channel descriptions are fetched again
+        await fetch_channels(recreated_channels[0].guild, ChannelCollection.to_list())
+    if reports:
+        await safe_send(report_channel, "\n".join(str(report) for report in reports))
     logger.info("Channels cleared!")
-    return result
+    return all(report.error is None for report in reports)
 
 
 async def clean_channel(channel: TextChannel, limit: int = None):
-    """Remove messages of the channel (up to the limit, 1000 per default)
+    """Remove messages of the channel (up to the limit, all messages per default)
 
     You must have the manage_messages permission to delete messages.
     The read_message_history permission is also needed to retrieve message history.
+    Messages older than 14 days are deleted slowly, in the background.
     """
     if not isinstance(channel, TextChannel) or channel not in channel.guild.channels:
         logger.debug(f"Cannot reset a {channel.__class__.__name__} channel, only TextChannel types supported.")
         return False
     await safe_send(channel, f"Deleting messages (up to {limit})...")
-    await channel.purge(limit=limit)
-    logger.debug(f"Maximum {limit} messages deleted")
-    return True
+    report = await purge_channel(channel, limit)
+    AttachmentCache().clear_urls()  # attachments deleted with their messages
+    logger.debug(str(report))
+    return report.error is None
 
 
 async def delete_channel(channel, reason=None):
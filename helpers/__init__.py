@@ -1,4 +1,4 @@
-from helpers.discord_helpers import (return_, user_to_member)
+from helpers.discord_helpers import (return_, user_to_member, member_memo)
 from helpers.format_objects import (format_channel, format_member, format_message, format_role, format_list,
                                     format_dict, get_guild_info, get_members_info, get_roles_info, get_channels_info)
 from helpers.json_helpers import TranslationDict
@@ -8,6 +8,7 @@ from helpers.sound_helpers import SoundTools
 __all__ = [
     'return_',
     'user_to_member',
+    'member_memo',
     'format_channel',
     'format_member',
     'format_message',
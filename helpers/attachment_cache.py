@@ -0,0 +1,110 @@
+import asyncio
+import io
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import discord
+from discord import File, Message, TextChannel, Embed
+
+from constants import ATTACHMENT_CACHE_SIZE
+from helpers.optimize_assets import get_optimized_path
+from logger import logger
+from models.types import Singleton
+
+_URL_TTL = 12 * 60 * 60  # attachment urls of Discord CDN are signed and expire
+
+
+class AttachmentCache(metaclass=Singleton):
+    """Cache of files sent as attachments.
+
+    Each file is read once from the disk (in an executor), then a new File object is created from memory for each
+    message (a File object cannot be sent twice). Files are kept in a LRU cache bounded by its size in bytes.
+    The optimised variant of a file is used if it exists (see optimize_assets).
+    The CDN url of an attachment can also be remembered, to send an embed instead of uploading the file again.
+    """
+
+    def __init__(self, max_size: int = ATTACHMENT_CACHE_SIZE):
+        self._max_size = max_size
+        self._data: OrderedDict = OrderedDict()  # {path: bytes}, least recently used first
+        self._size = 0
+        self._urls: Dict[str, Tuple[float, str]] = {}  # {path: (timestamp, url)}
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _put(self, path: str, data: bytes):
+        if len(data) > self._max_size:
+            logger.debug(f"File {path} is too big to be cached ({len(data)} bytes)")
+            return
+        if path in self._data:
+            self._size -= len(self._data.pop(path))
+        while self._data and self._size + len(data) > self._max_size:
+            old_path, old_data = self._data.popitem(last=False)
+            self._size -= len(old_data)
+            logger.debug(f"File {old_path} removed from attachment cache")
+        self._data[path] = data
+        self._size += len(data)
+
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        with open(get_optimized_path(path), "rb") as file:
+            return file.read()
+
+    async def read(self, path: str) -> bytes:
+        data = self._data.get(path)
+        if data is None:
+            data = await asyncio.get_event_loop().run_in_executor(None, self._read_file, path)
+            self._put(path, data)
+        else:
+            self._data.move_to_end(path)
+        return data
+
+    async def file(self, path: str, filename: str = None, spoiler=False) -> File:
+        """Returns a new File object for the file at path."""
+        filename = filename or os.path.basename(get_optimized_path(path))
+        return File(io.BytesIO(await self.read(path)), filename=filename, spoiler=spoiler)
+
+    def get_url(self, path: str) -> Optional[str]:
+        timestamp, url = self._urls.get(path, (0, None))
+        if url and time.monotonic() - timestamp > _URL_TTL:
+            self._urls.pop(path, None)
+            return None
+        return url
+
+    def remember_url(self, path: str, message: Message):
+        if message and message.attachments:
+            self._urls[path] = (time.monotonic(), message.attachments[0].url)
+
+    def clear_urls(self):
+        """Forget CDN urls, for instance because messages with attachments have been deleted."""
+        self._urls.clear()
+
+    def clear(self):
+        self._data.clear()
+        self._size = 0
+        self._urls.clear()
+
+
+async def cached_file(path: str, filename: str = None, spoiler=False) -> File:
+    return await AttachmentCache().file(path, filename=filename, spoiler=spoiler)
+
+
+async def send_cached_file(channel: discord.abc.Messageable, content: str = None, *, path: str,
+                           reuse_url=False, **kwargs) -> Message:
+    """Send a message with a file, read from memory.
+
+    If reuse_url is True and the file has already been uploaded, an embed with the url of the previous attachment
+    is sent instead of the file. Only use it if previous messages with this file are not deleted.
+    """
+    cache = AttachmentCache()
+    url = cache.get_url(path) if reuse_url else None
+    if url and (not isinstance(channel, TextChannel) or channel.permissions_for(channel.guild.me).embed_links):
+        logger.debug(f"Reusing attachment url for {path}")
+        return await channel.send(content, embed=Embed().set_image(url=url), **kwargs)
+    message = await channel.send(content, file=await cache.file(path), **kwargs)
+    if reuse_url:
+        cache.remember_url(path, message)
+    return message
@@ -0,0 +1,145 @@
+import asyncio
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Optional, Iterable, Tuple
+
+import discord
+from discord import AudioSource, ClientException
+
+from constants import SONG_PATH, AUDIO_CACHE_SIZE
+from logger import logger
+from models.types import Singleton
+
+
+class CachedOpusAudio(AudioSource):
+    """Audio source playing Opus packets already encoded in memory: no FFmpeg process is spawned."""
+
+    def __init__(self, packets: List[bytes]):
+        self._packets = packets
+        self._index = 0
+
+    def read(self) -> bytes:
+        if self._index >= len(self._packets):
+            return b''
+        packet = self._packets[self._index]
+        self._index += 1
+        return packet
+
+    def is_opus(self) -> bool:
+        return True
+
+
+class CachedPCMAudio(CachedOpusAudio):
+    """Audio source playing 20ms PCM frames already decoded in memory, as required by the mixer."""
+
+    def is_opus(self) -> bool:
+        return False
+
+
+def get_local_song_path(song_path: str) -> Optional[str]:
+    """Returns the path of a local audio file (relative to SONG_PATH or not), or None if it doesn't exist."""
+    if os.path.isfile(os.path.join(SONG_PATH, song_path)):
+        return os.path.join(SONG_PATH, song_path)
+    if os.path.isfile(song_path):
+        return song_path
+    return None
+
+
+def transcode(path: str, pcm=False) -> List[bytes]:
+    """Transcode an audio file to a list of 20ms Opus packets (or PCM frames if pcm is True).
+    Blocking: runs FFmpeg until the end of the file."""
+    source = discord.FFmpegPCMAudio(path) if pcm else discord.FFmpegOpusAudio(path)
+    packets = []
+    try:
+        packet = source.read()
+        while packet:
+            packets.append(packet)
+            packet = source.read()
+    finally:
+        source.cleanup()
+    return packets
+
+
+class AudioCache(metaclass=Singleton):
+    """LRU cache of local audio files transcoded to Opus, bounded by its size in bytes.
+
+    Songs played by the mixer are cached as PCM frames instead (about 10 times bigger), as Opus cannot be mixed.
+    """
+
+    def __init__(self, max_size: int = AUDIO_CACHE_SIZE):
+        self._max_size = max_size
+        self._packets: OrderedDict = OrderedDict()  # {(path, pcm): [packet, ...]}, least recently used first
+        self._sizes = {}
+        self._size = 0
+        self._lock = Lock()  # transcoding is done in executor threads
+        self._pending = {}  # {(path, pcm): Future}
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, path: str, pcm=False) -> Optional[CachedOpusAudio]:
+        """Returns a new audio source for a cached file (PCM if pcm is True), or None if the file is not cached."""
+        key = (path, pcm)
+        with self._lock:
+            packets = self._packets.get(key)
+            if packets is None:
+                return None
+            self._packets.move_to_end(key)
+        return CachedPCMAudio(packets) if pcm else CachedOpusAudio(packets)
+
+    def _put(self, key: Tuple[str, bool], packets: List[bytes]) -> bool:
+        size = sum(len(packet) for packet in packets)
+        if size > self._max_size:
+            logger.debug(f"Audio file {key[0]} is too big to be cached ({size} bytes)")
+            return False
+        with self._lock:
+            if key in self._packets:
+                self._size -= self._sizes.pop(key)
+                self._packets.pop(key)
+            while self._packets and self._size + size > self._max_size:
+                old_key, _ = self._packets.popitem(last=False)
+                self._size -= self._sizes.pop(old_key)
+                logger.debug(f"Audio file {old_key[0]} removed from cache")
+            self._packets[key] = packets
+            self._sizes[key] = size
+            self._size += size
+        return True
+
+    def load(self, path: str, pcm=False) -> bool:
+        """Transcode and cache a local audio file (blocking)."""
+        if (path, pcm) in self._packets:
+            return True
+        try:
+            packets = transcode(path, pcm=pcm)
+        except ClientException as err:
+            logger.warning(f"Failed to transcode {path} (FFmpeg missing ?): {err}")
+            return False
+        return self._put((path, pcm), packets)
+
+    async def load_async(self, path: str, pcm=False, loop=None) -> bool:
+        """Transcode and cache a local audio file in an executor. Concurrent calls for the same path are merged."""
+        key = (path, pcm)
+        if key in self._packets:
+            return True
+        if key in self._pending:
+            return await asyncio.shield(self._pending[key])
+        loop = loop or asyncio.get_event_loop()
+        future = loop.run_in_executor(None, self.load, path, pcm)
+        self._pending[key] = future
+        try:
+            return await future
+        finally:
+            self._pending.pop(key, None)
+
+    async def preload(self, song_paths: Iterable[str], pcm=False, loop=None) -> int:
+        """Cache the local audio files among song_paths (e.g. songs of a jingle palette, other links are ignored).
+        Returns the number of files cached."""
+        nb_cached = 0
+        for song_path in song_paths:
+            path = get_local_song_path(song_path)
+            if path and await self.load_async(path, pcm=pcm, loop=loop):
+                nb_cached += 1
+        logger.debug(f"{nb_cached} audio file(s) preloaded, audio cache size: {self._size} bytes")
+        return nb_cached
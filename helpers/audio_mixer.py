@@ -0,0 +1,171 @@
+import audioop
+from threading import Lock
+from typing import Callable, Any, List, Optional
+
+from discord import AudioSource, ClientException
+from discord.opus import Encoder
+
+from logger import logger
+
+_SAMPLE_WIDTH = 2  # 16-bit PCM
+_FRAMES_PER_SECOND = 1000 // Encoder.FRAME_LENGTH  # 50 frames of 20ms
+SILENCE = b'\x00' * Encoder.FRAME_SIZE
+
+
+class MixerTrack:
+    """A PCM audio source mixed by an AudioMixer, with its own volume and fades."""
+
+    def __init__(self, source: AudioSource, volume=1.0, fade_in=0.0, after: Callable[[Exception], Any] = None):
+        self.source = source
+        self.after = after
+        self._volume = volume
+        self._gain = 0.0 if fade_in > 0 else volume
+        self._gain_step = 0.0
+        self._stop_after_fade = False
+        self._stopped = False
+        if fade_in > 0:
+            self._fade_to(volume, fade_in)
+
+    @property
+    def volume(self) -> float:
+        return self._volume
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
+    def _fade_to(self, gain, duration):
+        nb_frames = max(1, int(duration * _FRAMES_PER_SECOND))
+        self._gain_step = (gain - self._gain) / nb_frames
+
+    def set_volume(self, volume: float, fade=0.0):
+        self._volume = max(volume, 0.0)
+        if fade > 0:
+            self._fade_to(self._volume, fade)
+        else:
+            self._gain, self._gain_step = self._volume, 0.0
+
+    def stop(self, fade_out=0.0):
+        """Stop the track, after a fade out if fade_out (in seconds) is positive."""
+        if fade_out > 0:
+            self._stop_after_fade = True
+            self._fade_to(0.0, fade_out)
+        else:
+            self._stopped = True
+
+    def _update_gain(self):
+        if not self._gain_step:
+            return
+        self._gain += self._gain_step
+        target = 0.0 if self._stop_after_fade else self._volume
+        if (self._gain_step > 0 and self._gain >= target) or (self._gain_step < 0 and self._gain <= target):
+            self._gain, self._gain_step = target, 0.0
+            if self._stop_after_fade:
+                self._stopped = True
+
+    def read(self) -> Optional[bytes]:
+        """Returns a 20ms PCM frame, or None if the track is over."""
+        if self._stopped:
+            return None
+        data = self.source.read()
+        if not data:
+            self._stopped = True
+            return None
+        if len(data) < Encoder.FRAME_SIZE:
+            data += SILENCE[len(data):]
+        gain = self._gain
+        self._update_gain()
+        if gain != 1.0:
+            data = audioop.mul(data, _SAMPLE_WIDTH, gain)
+        return data
+
+
+class AudioMixer(AudioSource):
+    """Audio source summing several PCM sources, 20ms frame by 20ms frame.
+
+    Tracks can be added or removed while the mixer is playing, without restarting the voice stream.
+    When there is no track to play, silence is sent during idle_timeout seconds, then the mixer ends.
+    """
+
+    def __init__(self, idle_timeout=5.0):
+        self._tracks: List[MixerTrack] = []
+        self._lock = Lock()  # read is called from the audio player thread
+        self._max_idle_frames = int(idle_timeout * _FRAMES_PER_SECOND)
+        self._idle_frames = 0
+        self._ended = False
+
+    @property
+    def tracks(self) -> List[MixerTrack]:
+        with self._lock:
+            return list(self._tracks)
+
+    @property
+    def ended(self) -> bool:
+        return self._ended
+
+    def add_track(self, source: AudioSource, volume=1.0, fade_in=0.0,
+                  after: Callable[[Exception], Any] = None) -> MixerTrack:
+        if source.is_opus():
+            raise ClientException("Opus sources cannot be mixed, a PCM source is required")
+        track = MixerTrack(source, volume=volume, fade_in=fade_in, after=after)
+        with self._lock:
+            self._tracks.append(track)
+        return track
+
+    def remove_track(self, track: MixerTrack, fade_out=0.0):
+        track.stop(fade_out=fade_out)
+
+    def clear(self, fade_out=0.0):
+        for track in self.tracks:
+            track.stop(fade_out=fade_out)
+
+    @staticmethod
+    def _finalize(track: MixerTrack, error: Exception = None):
+        track.source.cleanup()
+        if track.after is not None:
+            try:
+                track.after(error)
+            except Exception as err:
+                logger.exception(err)
+
+    def read(self) -> bytes:
+        if self._ended:
+            return b''
+        mixed = None
+        for track in self.tracks:
+            try:
+                frame = track.read()
+            except Exception as err:
+                logger.error(f"Error while reading mixed track: {err}")
+                track.stop()
+                self._remove(track, err)
+                continue
+            if frame is None:
+                self._remove(track)
+            elif mixed is None:
+                mixed = frame
+            else:
+                mixed = audioop.add(mixed, frame, _SAMPLE_WIDTH)  # clipped on overflow
+        if mixed is not None:
+            self._idle_frames = 0
+            return mixed
+        self._idle_frames += 1
+        if self._idle_frames > self._max_idle_frames:
+            self._ended = True
+            return b''
+        return SILENCE
+
+    def _remove(self, track: MixerTrack, error: Exception = None):
+        with self._lock:
+            if track not in self._tracks:
+                return
+            self._tracks.remove(track)
+        self._finalize(track, error)
+
+    def cleanup(self):
+        self._ended = True
+        with self._lock:
+            tracks, self._tracks = self._tracks, []
+        for track in tracks:
+            track.stop()
+            self._finalize(track)
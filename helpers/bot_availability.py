@@ -1,44 +1,76 @@
 import re
+from typing import Optional
 
 import discord
 from discord import Permissions
-import requests
 
 from constants import WEBSITE, TOKEN_SITE, BOT
+from helpers.http_client import request
 from logger import logger
 
+_API_PATH = "/api/availability"
+_website_availability: Optional[bool] = None  # last availability sent to the website (None: unknown)
 
-def remove_bot_availability_on_website() -> bool:
-    base_url = re.sub("/$", "", WEBSITE)
-    api_path = "/api/availability"
-    message = {"token": TOKEN_SITE}
-    try:
-        answer = requests.delete(base_url + api_path, json=message)
-    except Exception as err:
-        logger.error(f"Failed to send request to remove guild availability on website {base_url}: {err}")
-        return False
-    if 200 <= answer.status_code < 300:
-        logger.info("Bot availability removed on website")
-        return True
-    else:
-        logger.warning("Error while removing bot availability on website")
-        return False
+
+def _availability_url():
+    return re.sub("/$", "", WEBSITE) + _API_PATH
 
 
-def add_bot_availability_on_website() -> bool:
-    bot_invite_link = discord.utils.oauth_url(client_id=BOT.user.id, permissions=Permissions(8))
-    logger.info(f"The bot is not in a guild! To invite it, use the following link: {bot_invite_link}")
-    base_url = re.sub("/$", "", WEBSITE)
-    api_path = "/api/availability"
-    message = {"token": TOKEN_SITE}
-    try:
-        answer = requests.post(base_url + api_path, json=message)
-    except Exception as err:
-        logger.error(f"Failed to send request to remove guild availability on website {base_url}: {err}")
+def _local_web_state():
+    """State of the website if it is served by the bot (no request needed), else None."""
+    from flask_server.aio_app import WebServer, WebState  # avoid circular imports
+    return WebState if WebServer().running else None
+
+
+async def set_bot_availability_on_website(available: bool, force=False) -> bool:
+    """Send the bot availability to the website, only if it changed since the last time (unless force is True)."""
+    global _website_availability
+    if not force and _website_availability is available:
+        logger.debug(f"Bot availability already {'added' if available else 'removed'} on website")
+        return True
+    if _local_web_state():
+        from flask_server.aio_app import update_state  # avoid circular imports
+        update_state(bot_available=available)
+        _website_availability = available
+        return True
+    status, _ = await request("POST" if available else "DELETE", _availability_url(), json={"token": TOKEN_SITE})
+    if status is None:
+        logger.error(f"Failed to send request to {'add' if available else 'remove'} guild availability "
+                     f"on website {WEBSITE}")
         return False
-    if 200 <= answer.status_code < 300:
-        logger.info("Bot availability added on website")
+    if 200 <= status < 300:
+        _website_availability = available
+        logger.info(f"Bot availability {'added' if available else 'removed'} on website")
         return True
-    else:
-        logger.warning("Error while adding bot availability on website")
+    logger.warning(f"Error while {'adding' if available else 'removing'} bot availability on website")
+    return False
+
+
+async def remove_bot_availability_on_website(force=False) -> bool:
+    return await set_bot_availability_on_website(False, force=force)
+
+
+async def add_bot_availability_on_website(force=False) -> bool:
+    if force or _website_availability is not True:  # else, no request is sent
+        bot_invite_link = discord.utils.oauth_url(client_id=BOT.user.id, permissions=Permissions(8))
+        logger.info(f"The bot is not in a guild! To invite it, use the following link: {bot_invite_link}")
+    return await set_bot_availability_on_website(True, force=force)
+
+
+async def sync_bot_availability_on_website(available: bool) -> bool:
+    """Get the availability known by the website and update it if necessary (the website may have restarted).
+
+    Returns False if the website cannot be reached.
+    """
+    global _website_availability
+    status, content = await request("GET", _availability_url())  # also keeps the website awake
+    if status is None:
         return False
+    if _local_web_state():
+        _website_availability = _local_web_state().bot_available
+    elif 200 <= status < 300 and isinstance(content, dict):
+        _website_availability = content.get("available")
+    else:  # website not supporting availability requests: send it anyway
+        _website_availability = None
+    await set_bot_availability_on_website(available)
+    return True
@@ -0,0 +1,107 @@
+import sys
+import types
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+from discord import Client, Guild, Intents
+from discord.state import ConnectionState
+
+from constants import MESSAGE_CACHE_SIZE
+from models import Event
+from models.types import Singleton
+
+# Intents only needed to dispatch these events: disabled if no listener handles them
+EVENT_INTENTS: Dict[Event, Tuple[str, ...]] = {
+    Event.TYPING: ("guild_typing", "dm_typing"),
+    Event.MEMBER_BAN: ("bans",),
+    Event.MEMBER_UNBAN: ("bans",),
+}
+UNUSED_INTENTS = ("integrations", "webhooks", "invites")  # no handler for these events in the bot
+
+_NOT_OWNED = (Guild, ConnectionState, Client, type, types.ModuleType, types.FunctionType, types.MethodType)
+
+
+def all_subclasses(cls) -> Set[type]:
+    subclasses = set(cls.__subclasses__())
+    for subclass in cls.__subclasses__():
+        subclasses |= all_subclasses(subclass)
+    return subclasses
+
+
+def overridden_events(listener_classes: Iterable[type], base_class: type) -> Set[Event]:
+    """Events whose handler (e.g. on_typing) is overridden by at least one listener class."""
+    return {event for event in Event for cls in listener_classes
+            if getattr(cls, event.value, None) is not getattr(base_class, event.value, None)}
+
+
+def apply_intents_profile(intents: Intents, listener_classes: Iterable[type], base_class: type) -> List[str]:
+    """Disable (in place) intents of events not handled by listener classes. Returns the intents disabled."""
+    handled_events = overridden_events(listener_classes, base_class)
+    needed = {flag for event in handled_events for flag in EVENT_INTENTS.get(event, ())}
+    disabled = [flag for event, flags in EVENT_INTENTS.items() for flag in flags if flag not in needed]
+    disabled = sorted(set(disabled) | set(UNUSED_INTENTS))
+    for flag in disabled:
+        setattr(intents, flag, False)
+    return disabled
+
+
+def deep_size(obj, seen: Set[int] = None) -> int:
+    """Approximate memory size (in bytes) of obj and of the objects it owns (guild, state and client excluded)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, _NOT_OWNED):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return size + sum(deep_size(item, seen) for item in obj)
+    for cls in type(obj).__mro__:
+        slots = getattr(cls, "__slots__", ())
+        for slot in (slots,) if isinstance(slots, str) else slots:
+            if slot != "__weakref__":
+                size += deep_size(getattr(obj, slot, None), seen)
+    if hasattr(obj, "__dict__"):
+        size += deep_size(obj.__dict__, seen)
+    return size
+
+
+def guild_footprint(bot: Client, guild: Guild) -> str:
+    seen = set()
+    size = sum(deep_size(getattr(guild, slot, None), seen) for slot in Guild.__slots__ if slot != "_state")
+    messages = [message for message in bot.cached_messages if message.guild == guild]
+    size += deep_size(messages, seen)
+    return (f"{guild}: {len(guild.members)}/{guild.member_count} members cached, {len(guild.channels)} channels, "
+            f"{len(guild.roles)} roles, {len(messages)} messages, ~{size / 1024:.0f} KiB")
+
+
+class GatewayEventCounter(metaclass=Singleton):
+    """Counts gateway events received (by type), e.g. until the bot is ready."""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    async def on_socket_response(self, msg):
+        self.counts[msg.get("t") or f"op {msg.get('op')}"] += 1
+
+    def install(self, bot: Client):
+        bot.add_listener(self.on_socket_response)
+
+    def uninstall(self, bot: Client):
+        bot.remove_listener(self.on_socket_response)
+
+    def report(self) -> str:
+        counts = sorted(self.counts.items(), key=lambda item: -item[1])
+        return f"{sum(self.counts.values())} gateway events ({', '.join(f'{key}: {nb}' for key, nb in counts)})"
+
+
+def startup_report(bot: Client, disabled_intents: List[str]) -> str:
+    """Intents, gateway events received and memory used by each guild cache."""
+    enabled = [flag for flag, value in bot.intents if value]
+    lines = [f"Intents: {', '.join(enabled)} (disabled: {', '.join(disabled_intents) or 'none'})",
+             f"Message cache: {MESSAGE_CACHE_SIZE} messages",
+             GatewayEventCounter().report()]
+    lines += [guild_footprint(bot, guild) for guild in bot.guilds]
+    return "Startup report:\n" + "\n".join(lines)
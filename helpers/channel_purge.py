@@ -0,0 +1,139 @@
+import asyncio
+import datetime
+import time
+from enum import Enum
+from typing import List, Optional, Callable, Awaitable, Set
+
+from discord import TextChannel, Message, HTTPException, Forbidden, NotFound
+
+from helpers.format_objects import format_channel
+from logger import logger
+
+BULK_DELETE_MAX_AGE = datetime.timedelta(days=14, minutes=-10)  # Discord refuses bulk deletion of older messages
+BULK_DELETE_SIZE = 100  # maximum number of messages per bulk deletion
+OLD_MESSAGE_DELETE_INTERVAL = 1.  # in seconds, older messages are deleted one by one, slowly
+DEFAULT_CONCURRENCY = 4  # channels purged at the same time (rate limits of deletions are per channel)
+RECREATE_THRESHOLD = 100  # with the AUTO strategy, channels with more old messages are recreated
+
+_background_tasks: Set[asyncio.Task] = set()  # deletion of old messages
+
+
+class PurgeStrategy(Enum):
+    PURGE = "purge"  # delete messages: recent ones in bulk, older ones one by one
+    RECREATE = "recreate"  # clone the channel, then delete the original one (the channel id changes!)
+    AUTO = "auto"  # recreate the channel if it has many old messages, else purge it
+
+
+class PurgeReport:
+    """Result of the purge of a channel."""
+
+    def __init__(self, channel: TextChannel):
+        self.channel = channel
+        self.new_channel: Optional[TextChannel] = None  # set if the channel has been recreated
+        self.strategy = PurgeStrategy.PURGE
+        self.deleted = 0
+        self.old_messages = 0  # deleted one by one, in the background if not awaited
+        self.duration = 0.
+        self.error: Optional[str] = None
+
+    def __str__(self):
+        if self.error:
+            return f"{format_channel(self.channel, pretty=True)}: failed after {self.duration:.1f}s ({self.error})"
+        if self.new_channel:
+            return f"{format_channel(self.new_channel, pretty=True)}: recreated in {self.duration:.1f}s"
+        return (f"{format_channel(self.channel, pretty=True)}: {self.deleted} messages deleted in "
+                f"{self.duration:.1f}s" + (f", {self.old_messages} old messages" if self.old_messages else ""))
+
+
+async def _delete_old_messages(channel: TextChannel, messages: List[Message], interval=OLD_MESSAGE_DELETE_INTERVAL):
+    for message in messages:
+        try:
+            await message.delete()
+        except NotFound:
+            pass  # already deleted
+        except (Forbidden, HTTPException) as err:
+            logger.warning(f"Failed to delete old messages of channel {format_channel(channel)}: {err}")
+            return
+        if interval:
+            await asyncio.sleep(interval)  # leave room for other requests
+    logger.debug(f"{len(messages)} old messages deleted in channel {format_channel(channel)}")
+
+
+async def _bulk_delete(channel: TextChannel, messages: List[Message]):
+    try:
+        await channel.delete_messages(messages)
+    except NotFound:  # a message was already deleted
+        for message in messages:
+            try:
+                await message.delete()
+            except NotFound:
+                pass
+
+
+async def _recreate_channel(channel: TextChannel, report: PurgeReport):
+    new_channel = await channel.clone(reason="Channel purge")
+    await new_channel.edit(position=channel.position)
+    await channel.delete(reason="Channel purge")
+    report.new_channel = new_channel
+    report.strategy = PurgeStrategy.RECREATE
+
+
+async def purge_channel(channel: TextChannel, limit: int = None, strategy=PurgeStrategy.PURGE,
+                        wait_old_messages=False) -> PurgeReport:
+    """Delete messages of the channel (all messages if limit is None).
+
+    Messages younger than 14 days are deleted in bulk (100 at once). Older messages must be deleted one by one:
+    it is done slowly in a background task, unless wait_old_messages is True (then only rate limits apply).
+    With the AUTO strategy, the channel is recreated if it has more than RECREATE_THRESHOLD old messages.
+    With the RECREATE strategy, the channel is replaced by a clone: references to the channel must be updated.
+    You must have the manage_messages and read_message_history permissions (manage_channels to recreate).
+    """
+    report = PurgeReport(channel)
+    start = time.perf_counter()
+    try:
+        if strategy is PurgeStrategy.RECREATE:
+            await _recreate_channel(channel, report)
+            return report
+        min_bulk_date = datetime.datetime.utcnow() - BULK_DELETE_MAX_AGE
+        recent_messages, old_messages = [], []
+        async for message in channel.history(limit=limit):  # sorted: newest messages first
+            (old_messages if message.created_at < min_bulk_date else recent_messages).append(message)
+        report.old_messages = len(old_messages)
+        if strategy is PurgeStrategy.AUTO and len(old_messages) > RECREATE_THRESHOLD:
+            await _recreate_channel(channel, report)  # no need to delete recent messages first
+            return report
+        for i in range(0, len(recent_messages), BULK_DELETE_SIZE):
+            batch = recent_messages[i:i + BULK_DELETE_SIZE]
+            await _bulk_delete(channel, batch)
+            report.deleted += len(batch)
+        if old_messages and wait_old_messages:
+            await _delete_old_messages(channel, old_messages, interval=0)  # throttled by the HTTP rate limiter
+        elif old_messages:
+            task = asyncio.ensure_future(_delete_old_messages(channel, old_messages))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+    except (Forbidden, HTTPException) as err:
+        report.error = str(err)
+        logger.warning(f"Failed to purge channel {format_channel(channel)}: {err}")
+    finally:
+        report.duration = time.perf_counter() - start
+    return report
+
+
+async def purge_channels(channels: List[TextChannel], limit: int = None, strategy=PurgeStrategy.PURGE,
+                         concurrency=DEFAULT_CONCURRENCY, wait_old_messages=False,
+                         on_progress: Callable[[PurgeReport, int, int], Awaitable] = None) -> List[PurgeReport]:
+    """Purge channels concurrently. on_progress(report, number_of_channels_done, total) is awaited after each one."""
+    semaphore = asyncio.Semaphore(concurrency)
+    reports = []
+
+    async def _purge(channel):
+        async with semaphore:
+            report = await purge_channel(channel, limit, strategy=strategy, wait_old_messages=wait_old_messages)
+        reports.append(report)
+        logger.info(f"Purge {len(reports)}/{len(channels)}: {report}")
+        if on_progress:
+            await on_progress(report, len(reports), len(channels))
+
+    await asyncio.gather(*(_purge(channel) for channel in channels))
+    return reports
@@ -0,0 +1,20 @@
+"""Counters of operations on hot paths (e.g. member resolution), exposed by Metrics.
+
+This module has no dependency, so that any module can count operations without circular imports.
+"""
+from collections import defaultdict
+from typing import Dict
+
+_counters: Dict[str, int] = defaultdict(int)
+
+
+def increment(counter: str, value=1):
+    _counters[counter] += value
+
+
+def get_counters() -> Dict[str, int]:
+    return dict(_counters)
+
+
+def reset_counters():
+    _counters.clear()
@@ -1,13 +1,20 @@
+import contextvars
 import inspect
-from typing import Union, Awaitable, Any, Optional
+from contextlib import contextmanager
+from typing import Union, Awaitable, Any, Optional, Dict, Tuple
 
 import discord
 from discord import Guild, CategoryChannel, Message, Reaction
 
+from helpers.counters import increment
 from logger import logger
 
 MAX_MSG_SIZE = 2000
 
+# Members already resolved while handling the current event: {(guild_id, user_id): member}
+_member_memo: contextvars.ContextVar[Optional[Dict[Tuple[int, int], Optional[discord.Member]]]] = \
+    contextvars.ContextVar("member_memo", default=None)
+
 
 async def return_(result_maybe_awaitable: Union[Any, Awaitable[Any]]):
     if inspect.isawaitable(result_maybe_awaitable):
@@ -15,16 +22,34 @@ async def return_(result_maybe_awaitable: Union[Any, Awaitable[Any]]):
     return result_maybe_awaitable
 
 
+@contextmanager
+def member_memo():
+    """Users converted to members in the context (e.g. the handling of an event by all listeners) are memoized."""
+    token = _member_memo.set({})
+    try:
+        yield
+    finally:
+        _member_memo.reset(token)
+
+
 def user_to_member(guild: Union[Guild, 'GuildWrapper'], user: discord.User):
     """Convert a user to a member (which has more attributes)"""
     if guild is None:
         return None
-    for member in guild.members:
-        if member.id == user.id:
-            return member
-    if not user.bot:  # webhooks are not members
+    if isinstance(user, discord.Member) and user.guild.id == guild.id:
+        increment("user_to_member_direct")
+        return user
+    memo, key = _member_memo.get(), (guild.id, user.id)
+    if memo is not None and key in memo:
+        increment("user_to_member_memo_hits")
+        return memo[key]
+    increment("user_to_member_lookups")
+    member = guild.get_member(user.id)  # dictionary lookup, independent of the number of members
+    if memo is not None:
+        memo[key] = member
+    if member is None and not user.bot:  # webhooks are not members
         logger.warning(f"User {user} not found in current guild!")
-    return None
+    return member
 
 
 def find_other_channel_in_same_category(category: Optional[CategoryChannel], channel_name_pattern):
@@ -0,0 +1,116 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from discord import Guild, Role
+from discord.abc import GuildChannel
+
+from helpers.format_objects import format_channel
+from models import ChannelDescription, RoleDescription
+
+
+class GuildSnapshot:
+    """Channels and roles of a guild, indexed by id, taken once."""
+
+    def __init__(self, guild: Guild):
+        self.guild = guild
+        self.channels: Dict[int, GuildChannel] = {channel.id: channel for channel in guild.channels}
+        self.roles: Dict[int, Role] = {role.id: role for role in guild.roles}
+
+
+class DescriptionDiff:
+    """Differences between a description and the guild object it references."""
+    __slots__ = ("description", "reference", "errors", "missing")
+
+    def __init__(self, description, reference):
+        self.description = description
+        self.reference = reference  # live object (from the snapshot), or None if missing
+        self.errors: List[str] = []
+        self.missing = reference is None
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class GuildDiff:
+    """Structural diff between descriptions (channels and roles) and a guild, computed in one pass.
+
+    Reported differences: missing objects, wrong types, wrong categories, wrong overwrites and fields, outdated
+    references, wrong order of channels, channels not described (extra_channels).
+    It is used by the guild check (✅) and by the guild update (♻), which only edits what differs.
+    """
+
+    def __init__(self, guild: Guild, channel_descriptions: List[ChannelDescription] = (),
+                 role_descriptions: List[RoleDescription] = (), allowed_role_descriptions=None):
+        self.snapshot = GuildSnapshot(guild)
+        allowed_role_descriptions = allowed_role_descriptions or list(role_descriptions)
+        self.channels: Dict[ChannelDescription, DescriptionDiff] = {
+            descr: self._diff_channel(descr, allowed_role_descriptions) for descr in channel_descriptions}
+        self.roles: Dict[RoleDescription, DescriptionDiff] = {descr: self._diff_role(descr)
+                                                              for descr in role_descriptions}
+        self.misordered_categories = self._diff_order()
+        referenced_ids = {diff.reference.id for diff in self.channels.values() if diff.reference}
+        self.extra_channels: List[GuildChannel] = [channel for channel_id, channel in self.snapshot.channels.items()
+                                                   if channel_id not in referenced_ids]
+
+    def _diff_channel(self, description: ChannelDescription, allowed_role_descriptions) -> DescriptionDiff:
+        reference = description.object_reference
+        live = self.snapshot.channels.get(reference.id) if reference else None
+        diff = DescriptionDiff(description, live)
+        if reference is None:
+            diff.errors.append(f"`{description}`: no corresponding channel / reference has not been set to description")
+        elif live is None:
+            diff.errors.append(f"`{description}`: channel referenced is not in guild")
+        elif live.type is not description.channel_type:
+            diff.errors.append(f"`{description}`: reference has not the correct type")
+        else:
+            diff.errors.extend(description.compare_to_reference(live, allowed_role_descriptions))
+            if reference is not live and not diff.errors:  # outdated reference, e.g. after a reconnection
+                diff.errors.extend(description.compare_object_and_real_references(self.snapshot.guild))
+        return diff
+
+    def _diff_role(self, description: RoleDescription) -> DescriptionDiff:
+        reference = description.object_reference
+        live = self.snapshot.roles.get(reference.id) if isinstance(reference, Role) else None
+        diff = DescriptionDiff(description, live)
+        if reference is None:
+            diff.errors.append(f"`{description}`: no corresponding role in guild")
+        elif not isinstance(reference, Role):
+            diff.errors.append(f"`{description}`: reference is not a Role")
+        elif live is None:
+            diff.errors.append(f"`{description}`: role referenced is not in guild")
+        else:
+            diff.errors.extend(description.compare_to_reference(live))
+            if reference is not live and not diff.errors:  # outdated reference, e.g. after a reconnection
+                diff.errors.extend(description.compare_object_and_real_references(self.snapshot.guild))
+        return diff
+
+    def _diff_order(self) -> List[Optional[GuildChannel]]:
+        """Categories (None for channels without category) in which channels are not in the described order."""
+        by_category = defaultdict(list)  # channels of each type sorted as described, by category
+        for diff in self.channels.values():
+            if diff.reference is not None:
+                by_category[(diff.reference.category, diff.reference.type)].append(diff.reference)
+        misordered = []
+        for (category, _channel_type), channels in by_category.items():
+            if channels != sorted(channels, key=lambda channel: (channel.position, channel.id)):
+                misordered.append(category)
+        return misordered
+
+    def is_ok(self, description, reference=None) -> bool:
+        """Whether the object referenced by description (or reference, if given) is as described."""
+        diff = self.channels.get(description) or self.roles.get(description)
+        if diff is None or not diff.ok:
+            return False
+        return reference is None or reference.id == diff.reference.id
+
+    @property
+    def order_ok(self) -> bool:
+        return not self.misordered_categories
+
+    def errors(self) -> List[str]:
+        errors = [error for diff in self.channels.values() for error in diff.errors]
+        errors.extend(f"Channels of category {format_channel(category, pretty=True)} are not in the expected order"
+                      for category in self.misordered_categories)
+        errors.extend(error for diff in self.roles.values() for error in diff.errors)
+        return errors
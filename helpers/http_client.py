@@ -0,0 +1,52 @@
+import asyncio
+import random
+from typing import Optional, Tuple, Any
+
+import aiohttp
+
+from logger import logger
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Returns the HTTP session shared by the bot (connections are kept alive between requests)."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15))
+    return _session
+
+
+async def close_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def request(method: str, url: str, *, retries=3, backoff=0.5, **kwargs) -> Tuple[Optional[int], Any]:
+    """Send an HTTP request with the shared session.
+
+    Connection errors and server errors (5xx) are retried with an exponential backoff and a random jitter.
+    Returns the status code (None if the server could not be reached) and the JSON content (None if not JSON).
+    """
+    status, error = None, None
+    for attempt in range(retries + 1):
+        try:
+            async with get_session().request(method, url, **kwargs) as response:
+                status = response.status
+                try:
+                    content = await response.json(content_type=None)
+                except ValueError:
+                    content = None
+            if status < 500:
+                return status, content
+            error = f"status {status}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            error = err
+        if attempt < retries:
+            delay = backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+            logger.debug(f"Request {method} {url} failed ({error}). Retrying in {delay:.1f}s...")
+            await asyncio.sleep(delay)
+    logger.warning(f"Request {method} {url} failed after {retries + 1} attempts: {error}")
+    return status, None
@@ -0,0 +1,150 @@
+import asyncio
+import bisect
+import re
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from constants import WEBSITE, TOKEN_SITE
+from helpers import counters
+from helpers.http_client import request
+from logger import logger, dropped_records
+from models.types import Singleton
+
+# Upper bounds of histogram buckets, in seconds (Prometheus style, the last bucket is +Inf)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    """Cumulative histogram of durations (in seconds)."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.
+        self.max = 0.
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimated quantile: upper bound of the bucket containing it (max value for the last bucket)."""
+        if not self.count:
+            return 0.
+        rank, cumulative = q * self.count, 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.
+
+
+class Metrics(metaclass=Singleton):
+    """Timings of event handlers (by event and listener class) and event-loop lag."""
+
+    def __init__(self):
+        self._handlers: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self._errors: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._loop_lag = Histogram()
+        self._start_time = time.time()
+
+    def reset(self):
+        self._handlers.clear()
+        self._errors.clear()
+        counters.reset_counters()
+        self._loop_lag = Histogram()
+        self._start_time = time.time()
+
+    def observe_handler(self, event: str, listener_name: str, duration: float, error=False):
+        self._handlers[(event, listener_name)].observe(duration)
+        if error:
+            self._errors[(event, listener_name)] += 1
+
+    def get_counters(self) -> Dict[str, int]:
+        operations = counters.get_counters()
+        operations["log_records_dropped"] = dropped_records()  # since the start of the bot
+        return operations
+
+    async def sample_loop_lag(self, interval=1.):
+        """Coroutine measuring the delay of the event loop to wake up after a sleep."""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            self._loop_lag.observe(max(0., time.perf_counter() - start - interval))
+
+    def summary(self, top=15) -> str:
+        """Human-readable summary: slowest handlers first (by total time spent)."""
+        lines = [f"Metrics for the last {time.time() - self._start_time:.0f}s",
+                 f"Event-loop lag: p50={1000 * self._loop_lag.quantile(0.5):.1f}ms "
+                 f"p99={1000 * self._loop_lag.quantile(0.99):.1f}ms max={1000 * self._loop_lag.max:.1f}ms"]
+        lines.append("Counters: " + ", ".join(f"{name}={value}" for name, value in sorted(self.get_counters().items())))
+        lines.append("")
+        handlers = sorted(self._handlers.items(), key=lambda item: item[1].sum, reverse=True)
+        for key, histogram in handlers[:top]:
+            event, listener_name = key
+            lines.append(f"{event} > {listener_name}: n={histogram.count} errors={self._errors.get(key, 0)} "
+                         f"total={histogram.sum:.2f}s mean={1000 * histogram.mean:.1f}ms "
+                         f"p99={1000 * histogram.quantile(0.99):.1f}ms max={1000 * histogram.max:.1f}ms")
+        if len(handlers) > top:
+            lines.append(f"... and {len(handlers) - top} other handlers")
+        return "\n".join(lines)
+
+    def to_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        lines = ["# HELP bot_handler_duration_seconds Duration of event handlers.",
+                 "# TYPE bot_handler_duration_seconds histogram"]
+        for (event, listener_name), histogram in sorted(self._handlers.items()):
+            lines.extend(_format_histogram("bot_handler_duration_seconds", histogram,
+                                           f'event="{event}",listener="{listener_name}"'))
+        lines.extend(["# HELP bot_handler_errors_total Number of event handlers that raised an error.",
+                      "# TYPE bot_handler_errors_total counter"])
+        for (event, listener_name), errors in sorted(self._errors.items()):
+            lines.append(f'bot_handler_errors_total{{event="{event}",listener="{listener_name}"}} {errors}')
+        lines.extend(["# HELP bot_event_loop_lag_seconds Delay of the event loop to wake up after a sleep.",
+                      "# TYPE bot_event_loop_lag_seconds histogram"])
+        lines.extend(_format_histogram("bot_event_loop_lag_seconds", self._loop_lag))
+        lines.extend(["# HELP bot_operations_total Number of operations on hot paths (e.g. member resolution).",
+                      "# TYPE bot_operations_total counter"])
+        for name, value in sorted(self.get_counters().items()):
+            lines.append(f'bot_operations_total{{operation="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def _format_histogram(name: str, histogram: Histogram, labels: str = "") -> List[str]:
+    sep = "," if labels else ""
+    lines, cumulative = [], 0
+    for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+    labels = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{labels} {histogram.sum}")
+    lines.append(f"{name}_count{labels} {histogram.count}")
+    return lines
+
+
+async def post_metrics_on_website() -> bool:
+    """Send Prometheus metrics to the website, where they are exposed at /metrics."""
+    from flask_server.aio_app import WebServer  # avoid circular imports
+    if WebServer().running:  # metrics are read directly
+        return True
+    status, _ = await request("POST", re.sub("/$", "", WEBSITE) + "/api/metrics", retries=0,
+                              json={"token": TOKEN_SITE, "metrics": Metrics().to_prometheus()})
+    if status is None or not 200 <= status < 300:
+        logger.debug(f"Failed to post metrics on website {WEBSITE} (status: {status})")
+        return False
+    return True
+
+
+async def push_metrics_on_website(period: float):
+    """Coroutine sending metrics to the website regularly, so that they stay fresh between keep-awake requests."""
+    while True:
+        await asyncio.sleep(period)
+        await post_metrics_on_website()
@@ -0,0 +1,129 @@
+from typing import Dict, Optional, Tuple
+
+from discord import Client, Message, NotFound
+from discord.abc import Messageable
+
+from logger import logger
+from models.types import Singleton
+
+
+class InteractiveMessageCache(metaclass=Singleton):
+    """Messages players interact with: control panels, listener menus, reaction and role menus, jingle palettes.
+
+    Registered messages are never evicted: discord.py finds them as cached messages, so their reactions and contents
+    are kept up-to-date and reaction events are dispatched for them, whereas chat messages only use the bounded
+    message cache (MESSAGE_CACHE_SIZE). A message can be registered by id only (e.g. after a restart):
+    it is fetched once, when it is needed for the first time.
+    Messages are unregistered with their channel or guild. On reconnection (READY), discord.py clears its cache and
+    stops updating the messages it had: registered messages are kept by id only, and fetched again when needed.
+    """
+
+    def __init__(self):
+        self._messages: Dict[int, Optional[Message]] = {}  # {message id: message, None if not fetched yet}
+        self._locations: Dict[int, Tuple[Optional[int], Optional[int]]] = {}  # {message id: (guild id, channel id)}
+        self._get_cached_message = None  # message cache of discord.py
+        self._installed = False
+
+    def install(self, bot: Client):
+        """Make discord.py find registered messages in its message cache."""
+        if self._installed:
+            return
+        state = bot._connection
+        get_cached_message = state._get_message
+        parse_message_delete = state.parsers["MESSAGE_DELETE"]
+        parse_message_delete_bulk = state.parsers["MESSAGE_DELETE_BULK"]
+        parse_channel_delete = state.parsers["CHANNEL_DELETE"]
+        parse_guild_delete = state.parsers["GUILD_DELETE"]
+        parse_ready = state.parsers["READY"]
+
+        def get_message(message_id):
+            return self._messages.get(message_id) or get_cached_message(message_id)
+
+        def parse_delete(data):  # unregister first: discord.py removes deleted messages from its own cache only
+            self.unregister(int(data["id"]))
+            parse_message_delete(data)
+
+        def parse_delete_bulk(data):
+            for message_id in data.get("ids", []):
+                self.unregister(int(message_id))
+            parse_message_delete_bulk(data)
+
+        def parse_delete_channel(data):
+            self.unregister_channel(int(data["id"]))
+            parse_channel_delete(data)
+
+        def parse_delete_guild(data):
+            if not data.get("unavailable", False):  # the bot left the guild, or the guild was deleted
+                self.unregister_guild(int(data["id"]))
+            parse_guild_delete(data)
+
+        def parse_new_session(data):
+            self.forget_messages()
+            parse_ready(data)
+
+        state._get_message = get_message
+        state.parsers["MESSAGE_DELETE"] = parse_delete
+        state.parsers["MESSAGE_DELETE_BULK"] = parse_delete_bulk
+        state.parsers["CHANNEL_DELETE"] = parse_delete_channel
+        state.parsers["GUILD_DELETE"] = parse_delete_guild
+        state.parsers["READY"] = parse_new_session
+        self._get_cached_message = get_cached_message
+        self._installed = True
+        logger.info("Interactive message cache installed")
+
+    def register(self, message: Message) -> Message:
+        self._messages[message.id] = message
+        self._locations[message.id] = (getattr(message.guild, "id", None), message.channel.id)
+        return message
+
+    def register_id(self, message_id: int, guild_id: int = None, channel_id: int = None):
+        """Register a message that is not available yet. It will be kept once fetched."""
+        self._messages.setdefault(message_id, None)
+        self._locations.setdefault(message_id, (guild_id, channel_id))
+
+    def unregister(self, message_id: int):
+        self._messages.pop(message_id, None)
+        self._locations.pop(message_id, None)
+
+    def unregister_channel(self, channel_id: int):
+        """Unregister messages of a deleted channel."""
+        for message_id in [message_id for message_id, (_guild_id, _channel_id) in self._locations.items()
+                           if _channel_id == channel_id]:
+            self.unregister(message_id)
+
+    def unregister_guild(self, guild_id: int):
+        """Unregister messages of a guild, e.g. when the guild is removed from the game."""
+        for message_id in [message_id for message_id, (_guild_id, _channel_id) in self._locations.items()
+                           if _guild_id == guild_id]:
+            self.unregister(message_id)
+
+    def forget_messages(self):
+        """Keep registered messages by id only: they are fetched again when needed (e.g. on reconnection)."""
+        self._messages = dict.fromkeys(self._messages)
+
+    def get(self, message_id: int) -> Optional[Message]:
+        """Registered message or message in discord.py cache, if available."""
+        message = self._messages.get(message_id)
+        if message is None and self._get_cached_message:
+            message = self._get_cached_message(message_id)
+        return message
+
+    async def fetch(self, channel: Messageable, message_id: int) -> Message:
+        """Cached message, else fetched message (kept if registered). Raises the errors of fetch_message."""
+        message = self.get(message_id)
+        if message is not None:
+            return message
+        try:
+            message = await channel.fetch_message(message_id)
+        except NotFound:
+            self.unregister(message_id)
+            raise
+        if message_id in self._messages:
+            self.register(message)
+        return message
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __contains__(self, message_id: int):
+        return message_id in self._messages
@@ -1,54 +1,111 @@
 import re
+from typing import Optional
 
-import requests
 from discord import TextChannel, HTTPException
 from discord.abc import GuildChannel
 
 from constants import WEBSITE, TOKEN_SITE
 from default_collections import GeneralMessages
+from helpers.http_client import request
 from logger import logger
 
 
-async def delete_invite(origin_channel: TextChannel = None):
-    base_url = re.sub("/$", "", WEBSITE)
-    api_path = "/api/invite"
-    message = {"token": TOKEN_SITE}
-    try:
-        answer = requests.delete(base_url + api_path, json=message)
-    except Exception as err:
-        logger.error(f"Failed to send request to remove guild availability on website {base_url}: {err}")
-        if origin_channel:
-            await origin_channel.send("Failed to delete invite link from website")
+_API_PATH = "/api/invite"
+_posted_link: Optional[str] = None  # last invite link sent to the website ("": deleted, None: unknown)
+
+
+def _invite_url():
+    return re.sub("/$", "", WEBSITE) + _API_PATH
+
+
+def _is_website_local() -> bool:
+    """Whether the website is served by the bot (its state is then shared with the bot)."""
+    from flask_server.aio_app import WebServer  # avoid circular imports
+    return WebServer().running
+
+
+def _set_local_game_link(link: str) -> bool:
+    """Set the game link of the website if it is served by the bot. Returns False if it is not."""
+    if not _is_website_local():
         return False
-    if 200 <= answer.status_code < 300:
-        logger.info(f"Invite successful deleted on website {base_url}")
+    from flask_server.aio_app import update_state  # avoid circular imports
+    update_state(game_link=link)
+    return True
+
+
+async def delete_invite(origin_channel: TextChannel = None, force=False):
+    global _posted_link
+    if not force and _posted_link == "":
+        logger.debug("Invite link already deleted from website")
         if origin_channel:
             await origin_channel.send("Invite link deleted from website")
-    else:
-        logger.warning(f"Error while posting invite deletion on website {base_url}")
+        return True
+    status, _ = (200, None) if _set_local_game_link("") else await request(
+        "DELETE", _invite_url(), json={"token": TOKEN_SITE})
+    if status is None:
+        logger.error(f"Failed to send request to delete invite link on website {WEBSITE}")
         if origin_channel:
             await origin_channel.send("Failed to delete invite link from website")
+        return False
+    if 200 <= status < 300:
+        _posted_link = ""
+        logger.info(f"Invite successful deleted on website {WEBSITE}")
+        if origin_channel:
+            await origin_channel.send("Invite link deleted from website")
+        return True
+    logger.warning(f"Error while posting invite deletion on website {WEBSITE}")
+    if origin_channel:
+        await origin_channel.send("Failed to delete invite link from website")
+    return False
 
 
-async def post_invite_link(link, origin_channel: TextChannel = None):
-    base_url = re.sub("/$", "", WEBSITE)
-    api_path = "/api/invite"
-    message = {"token": TOKEN_SITE, "link": str(link)}
-    try:
-        answer = requests.post(base_url + api_path, json=message)
-    except Exception as err:
-        logger.error(f"Failed to send request to remove guild availability on website {base_url}: {err}")
+async def post_invite_link(link, origin_channel: TextChannel = None, force=False):
+    global _posted_link
+    link = str(link)
+    if not force and _posted_link == link:
+        logger.debug(f"Invite link {link} already on website")
+        if origin_channel:
+            await origin_channel.send("Invite link has been added to website")
+        return True
+    status, _ = (200, None) if _set_local_game_link(link) else await request(
+        "POST", _invite_url(), json={"token": TOKEN_SITE, "link": link})
+    if status is None:
+        logger.error(f"Failed to send request to post invite link on website {WEBSITE}")
         if origin_channel:
             await origin_channel.send("Failed to post invite link on website")
         return False
-    if 200 <= answer.status_code < 300:
-        logger.info(f"Invite successful on website {base_url}")
+    if 200 <= status < 300:
+        _posted_link = link
+        logger.info(f"Invite successful on website {WEBSITE}")
         if origin_channel:
             await origin_channel.send("Invite link has been added to website")
-    else:
-        logger.warning(f"Error while posting new invite link on website {base_url}")
-        if origin_channel:
-            await origin_channel.send("Failed to post invite link on website")
+        return True
+    logger.warning(f"Error while posting new invite link on website {WEBSITE}")
+    if origin_channel:
+        await origin_channel.send("Failed to post invite link on website")
+    return False
+
+
+async def sync_invite_on_website() -> bool:
+    """Get the invite link known by the website and send it again if necessary (the website may have restarted).
+
+    Returns False if the website cannot be reached.
+    """
+    global _posted_link
+    if _posted_link is None or _is_website_local():  # nothing sent yet / same state as the bot
+        return True
+    status, content = await request("GET", _invite_url())
+    if status is None:
+        return False
+    if not (200 <= status < 300 and isinstance(content, dict)):  # website not supporting invite requests
+        _posted_link = None  # unknown: sent again next time
+        return True
+    if content.get("link", "") == _posted_link:
+        return True
+    logger.info(f"Invite link not up-to-date on website {WEBSITE}: sending it again")
+    if _posted_link:
+        return await post_invite_link(_posted_link, force=True)
+    return await delete_invite(force=True)
 
 
 async def create_invite(channel: GuildChannel, origin_channel: TextChannel, **kwargs):
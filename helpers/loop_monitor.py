@@ -0,0 +1,59 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from logger import logger
+
+
+class LoopMonitor:
+    """Watchdog reporting callbacks that block the event loop for longer than a threshold (in seconds).
+
+    The event loop updates a heartbeat regularly. A separate thread checks the heartbeat and,
+    when the loop is stuck, logs the current stack of the loop thread (i.e. the blocking call).
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, threshold=0.2, interval=0.05):
+        self._loop = loop
+        self._threshold = threshold
+        self._interval = interval
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def _beat(self):
+        self._last_beat = time.monotonic()
+        if self._running:
+            self._loop.call_later(self._interval, self._beat)
+
+    def _start_in_loop(self):
+        self._loop_thread_id = threading.get_ident()
+        self._beat()
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._loop.call_soon_threadsafe(self._start_in_loop)
+        self._thread = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._thread.start()
+        logger.info(f"Event loop monitor started (threshold: {self._threshold}s)")
+
+    def stop(self):
+        self._running = False
+
+    def _watch(self):
+        reported_beat = None
+        while self._running:
+            time.sleep(self._interval)
+            last_beat = self._last_beat
+            blocked_duration = time.monotonic() - last_beat
+            if blocked_duration < self._threshold or last_beat == reported_beat or self._loop_thread_id is None:
+                continue
+            reported_beat = last_beat  # report each blocking call once
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "(stack not available)"
+            logger.warning(f"Event loop blocked for more than {blocked_duration:.2f}s! Blocking call:\n{stack}")
@@ -0,0 +1,134 @@
+import json
+import os
+import sys
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed to generate optimised assets, not to run the bot
+    Image = None
+
+ASSETS_PATH = "files/"
+OPTIMIZED_PATH = "files/_optimized/"
+MANIFEST_PATH = os.path.join(OPTIMIZED_PATH, "manifest.json")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+_manifest = None
+
+
+def load_manifest(path=MANIFEST_PATH) -> dict:
+    """Returns the manifest of optimised assets: {original_path: {"path": ..., "original_size": ..., "size": ...}}"""
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                _manifest = json.load(file)
+        except (OSError, ValueError):
+            _manifest = {}
+    return _manifest
+
+
+def get_optimized_path(path: str) -> str:
+    """Returns the path of the optimised variant of an asset if it exists and is up-to-date, else the path itself."""
+    entry = load_manifest().get(os.path.normpath(path))
+    if not entry or not os.path.isfile(entry["path"]):
+        return path
+    try:
+        if os.path.getsize(path) != entry["original_size"]:  # original file changed since optimisation
+            return path
+    except OSError:
+        return path
+    return entry["path"]
+
+
+def optimize_image(path, output_dir, max_dimension=1280, image_format="webp", quality=80):
+    """Save a downscaled and compressed version of an image. Returns the path of the new file.
+
+    The extension of the original file is kept in the name (a.png -> a.png.webp), so that a.png and a.jpg
+    do not overwrite each other.
+    """
+    image = Image.open(path)
+    image.thumbnail((max_dimension, max_dimension))
+    name = os.path.basename(path)
+    os.makedirs(output_dir, exist_ok=True)
+    if image_format == "webp":
+        output_path = os.path.join(output_dir, name + ".webp")
+        image.save(output_path, "WEBP", quality=quality, method=6)
+    else:
+        output_path = os.path.join(output_dir, name + ".png")
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        image.quantize(colors=256, method=Image.FASTOCTREE).save(output_path, "PNG", optimize=True)
+    return output_path
+
+
+def optimize_assets(directories=(ASSETS_PATH,), max_dimension=1280, image_format="webp", quality=80):
+    """Optimise all images in directories (inside files/) and write the manifest. Returns the manifest."""
+    manifest = {}
+    for directory in directories:
+        relative_directory = os.path.relpath(directory, ASSETS_PATH)
+        if relative_directory == os.pardir or relative_directory.startswith(os.pardir + os.sep) \
+                or os.path.isabs(relative_directory):
+            print(f"Ignoring '{directory}': only directories inside '{ASSETS_PATH}' can be optimised")
+            continue
+        for root, dirs, files in os.walk(directory):
+            if os.path.normpath(root).startswith(os.path.normpath(OPTIMIZED_PATH)):
+                continue
+            for filename in sorted(files):
+                if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                path = os.path.normpath(os.path.join(root, filename))
+                output_dir = os.path.join(OPTIMIZED_PATH, os.path.relpath(root, ASSETS_PATH))
+                try:
+                    output_path = optimize_image(path, output_dir, max_dimension, image_format, quality)
+                except OSError as err:
+                    print(f"Cannot optimise '{path}': {err}")
+                    continue
+                original_size, size = os.path.getsize(path), os.path.getsize(output_path)
+                if size >= original_size:  # keep the original file
+                    os.remove(output_path)
+                    continue
+                manifest[path] = {"path": os.path.normpath(output_path), "original_size": original_size, "size": size}
+    os.makedirs(OPTIMIZED_PATH, exist_ok=True)
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+
+def print_report(manifest):
+    total_original, total = 0, 0
+    for path, entry in manifest.items():
+        total_original += entry["original_size"]
+        total += entry["size"]
+        print(f"{path}: {entry['original_size'] / 1024:.0f} kB -> {entry['size'] / 1024:.0f} kB "
+              f"({100 * entry['size'] / entry['original_size']:.0f}%)")
+    if total_original:
+        print(f"Total: {total_original / 1024:.0f} kB -> {total / 1024:.0f} kB ({100 * total / total_original:.0f}%)")
+    else:
+        print("No asset optimised.")
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if "--help" in args:
+        print("Syntax: python helpers/optimize_assets.py [DIRECTORY...] [OPTIONS]\n"
+              "Creates optimised variants of images (default directory: files/) in files/_optimized/ "
+              "and a manifest used by the bot to send them. Directories must be inside files/.\n"
+              "Options:\n"
+              "  --max-dimension N: maximum width/height of images (default: 1280)\n"
+              "  --png: quantised PNG instead of WebP\n"
+              "  --quality N: WebP quality (default: 80)\n"
+              "Requires Pillow (pip install Pillow).")
+        exit(0)
+    if Image is None:
+        print("Pillow is required: pip install Pillow")
+        exit(1)
+    options = {"max_dimension": 1280, "image_format": "webp", "quality": 80}
+    if "--png" in args:
+        args.remove("--png")
+        options["image_format"] = "png"
+    for option in ("--max-dimension", "--quality"):
+        if option in args:
+            ind = args.index(option)
+            options[option[2:].replace("-", "_")] = int(args[ind + 1])
+            del args[ind:ind + 2]
+    print_report(optimize_assets(args or (ASSETS_PATH,), **options))
@@ -0,0 +1,143 @@
+import contextvars
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+from discord import DiscordException
+from discord.abc import Messageable
+from discord.http import HTTPClient, Route
+
+from helpers.message_helpers import long_send
+from logger import logger
+from models.types import Singleton
+
+# Label of what caused the REST calls in the current task (listener event, command or control panel action).
+# Tasks created while handling an event inherit the label.
+_rest_label: contextvars.ContextVar[str] = contextvars.ContextVar("rest_label", default="other")
+_rest_route: contextvars.ContextVar[str] = contextvars.ContextVar("rest_route", default="")
+
+_RATE_LIMIT_LOG = "We are being rate limited"
+
+
+@contextmanager
+def rest_label(label: str):
+    """REST calls made in the context are attributed to label."""
+    token = _rest_label.set(label)
+    try:
+        yield
+    finally:
+        _rest_label.reset(token)
+
+
+def set_rest_label(label: str):
+    """Attribute the next REST calls of the current context (e.g. the current event handling) to label."""
+    _rest_label.set(label)
+
+
+class _RouteStats:
+    __slots__ = ("count", "errors", "rate_limited", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.rate_limited = 0  # number of 429 responses (the request is retried by discord.py)
+        self.duration = 0.  # including the time spent waiting for rate limits
+
+
+class _RateLimitFilter(logging.Filter):
+    """Counts rate limits (429), that are only logged by discord.py."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.msg, str) and record.msg.startswith(_RATE_LIMIT_LOG):
+            RestAccounting().get_stats(_rest_label.get(), _rest_route.get()).rate_limited += 1
+        return True
+
+
+class RestAccounting(metaclass=Singleton):
+    """Accounting of Discord REST calls: count, latency, errors and rate limits by label and route."""
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str], _RouteStats] = defaultdict(_RouteStats)
+        self._start_time = time.time()
+        self._installed = False
+
+    def install(self, http: HTTPClient):
+        """Wrap the request method of the HTTP client of the bot."""
+        if self._installed:
+            return
+        request = http.request
+
+        async def accounted_request(route: Route, **kwargs):
+            route_name = f"{route.method} {route.path}"
+            token = _rest_route.set(route_name)
+            stats = self.get_stats(_rest_label.get(), route_name)
+            start = time.perf_counter()
+            try:
+                return await request(route, **kwargs)
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                stats.count += 1
+                stats.duration += time.perf_counter() - start
+                _rest_route.reset(token)
+
+        http.request = accounted_request
+        logging.getLogger("discord.http").addFilter(_RateLimitFilter())
+        self._installed = True
+        logger.info("REST accounting installed")
+
+    @property
+    def installed(self) -> bool:
+        return self._installed
+
+    def log_report(self):
+        """Log the report, e.g. when the bot stops (nothing is logged if REST calls are not accounted)."""
+        if self._installed:
+            logger.info(self.report())
+
+    async def send_report(self, channel: Messageable) -> bool:
+        """Send the report to channel (e.g. the LOG channel, when the bot stops). It is logged too, as a fallback."""
+        if not self._installed:
+            return False
+        self.log_report()
+        if channel is None:
+            return False
+        try:
+            await long_send(channel, self.report(), quotes=True)
+        except DiscordException as err:
+            logger.warning(f"Failed to send the REST report: {err}")
+            return False
+        return True
+
+    def get_stats(self, label: str, route_name: str) -> _RouteStats:
+        return self._stats[(label, route_name)]
+
+    def reset(self):
+        self._stats.clear()
+        self._start_time = time.time()
+
+    def report(self, top_routes=3) -> str:
+        """Report of REST calls by label (most expensive first), with the most called routes of each label."""
+        by_label = defaultdict(list)
+        for (label, route_name), stats in self._stats.items():
+            by_label[label].append((route_name, stats))
+        total = sum(stats.count for stats in self._stats.values())
+        lines = [f"REST calls for the last {time.time() - self._start_time:.0f}s: {total} calls"]
+        for label, routes in sorted(by_label.items(), key=lambda item: -sum(stats.count for _, stats in item[1])):
+            count = sum(stats.count for _, stats in routes)
+            rate_limited = sum(stats.rate_limited for _, stats in routes)
+            errors = sum(stats.errors for _, stats in routes)
+            duration = sum(stats.duration for _, stats in routes)
+            lines.append(f"\n{label}: {count} calls, {rate_limited} rate limited (429), {errors} errors, "
+                         f"{duration:.1f}s")
+            routes.sort(key=lambda item: item[1].count, reverse=True)
+            for route_name, stats in routes[:top_routes]:
+                mean_duration = stats.duration / max(stats.count, 1)
+                lines.append(f"  {route_name}: {stats.count} calls, mean {1000 * mean_duration:.0f}ms"
+                             f"{f', {stats.rate_limited} rate limited' if stats.rate_limited else ''}")
+            if len(routes) > top_routes:
+                lines.append(f"  ... and {len(routes) - top_routes} other routes")
+        return "\n".join(lines)
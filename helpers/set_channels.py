@@ -4,6 +4,7 @@ from typing import List, Union, Tuple
 from discord import Guild
 from discord.abc import GuildChannel
 
+from helpers.guild_diff import GuildDiff
 from logger import logger
 from models import ChannelDescription
 from models.abstract_models import reorder_items
@@ -39,9 +40,11 @@ def clear_channel_descriptions(channel_descriptions: List[ChannelDescription], c
 
 
 async def update_channels(guild: Union[Guild, GuildWrapper], channel_descriptions: List[ChannelDescription],
-                          delete_old=True, key="name", reorder=True, clear_references=True) -> bool:
+                          delete_old=True, key="name", reorder=True, clear_references=True,
+                          diff: GuildDiff = None) -> bool:
     return await fetch_channels(guild, channel_descriptions, key=key, clear_references=clear_references,
-                                check_category=True, update=True, create=True, delete_old=delete_old, reorder=reorder)
+                                check_category=True, update=True, create=True, delete_old=delete_old, reorder=reorder,
+                                diff=diff)
 
 
 def _assign_channel(ind_to_pop: List[Tuple[int, GuildChannel]], guild_channels: List[GuildChannel],
@@ -84,7 +87,8 @@ def _assign_channel(ind_to_pop: List[Tuple[int, GuildChannel]], guild_channels:
 
 async def fetch_channels(guild, channel_descriptions: List[ChannelDescription],
                          key: str = "name", clear_references=True,
-                         check_category=True, update=False, create=False, delete_old=False, reorder=False) -> bool:
+                         check_category=True, update=False, create=False, delete_old=False, reorder=False,
+                         diff: GuildDiff = None) -> bool:
     """Detect existing channels and set them to ChannelDescription.object_reference attribute.
 
     :param guild: Guild
@@ -96,18 +100,24 @@ async def fetch_channels(guild, channel_descriptions: List[ChannelDescription],
     :param create: if True, create missing channels
     :param delete_old: if True, channels that are not in channel_descriptions list are deleted
     :param reorder: if True, channels are reordered in the order they appear in channel_descriptions
+    :param diff: GuildDiff computed before the call: channels already as described are not updated,
+    and channels are not reordered if their order is already correct.
     :return: True if fetch/update was correct, False if at least one error was found.
     """
     # Sort by Category (ChannelType value: 4), then VoiceChannel (2), then TextChannel (0)
     channel_descriptions = sorted(channel_descriptions, key=lambda cd: - cd.channel_type.value)
     async with LOCK:  # Lock channel_descriptions
         channels_ok = True
+        changed = False  # channels updated or created
         if clear_references:  # clear pre-existing object references
             clear_channel_descriptions(channel_descriptions)
         guild_channels = guild.channels
         for channel_description in channel_descriptions:
             # if the object reference already exists.
             if channel_description.object_reference and update:
+                if diff and diff.is_ok(channel_description, channel_description.object_reference):
+                    continue
+                changed = True
                 if await channel_description.update_object(channel_description.object_reference):
                     continue
 
@@ -120,10 +130,12 @@ async def fetch_channels(guild, channel_descriptions: List[ChannelDescription],
                     continue
             if ind_to_pop:  # assign object_reference to channel + remove channel attributed from guild_channels
                 channel = _assign_channel(ind_to_pop, guild_channels, channel_description, key, strict=check_category)
-                if channel and update:
+                if channel and update and not (diff and diff.is_ok(channel_description, channel)):
+                    changed = True
                     await channel_description.update_object(channel)
             if channel_description.object_reference is None:  # channel not found
                 if create:
+                    changed = True
                     await channel_description.create_object(guild)
                 else:
                     logger.debug(f"WARN: Channel {channel_description} doesn't exist in the guild!")
@@ -132,7 +144,9 @@ async def fetch_channels(guild, channel_descriptions: List[ChannelDescription],
             logger.info(f"Channels {'updated' if update else 'fetched'} successfully: {channel_descriptions}")
         else:
             logger.warning(f"Channels {'updated' if update else 'fetched'} with errors: {channel_descriptions}")
-        if reorder:
+        if reorder and diff and diff.order_ok and not changed:
+            logger.info("Channels already in order")
+        elif reorder:
             if not await reorder_items(channel_descriptions):
                 channels_ok = False
                 logger.warning("Channels reordered with errors")
@@ -2,6 +2,7 @@ from discord import Guild, HTTPException
 
 from default_collections import (RoleCollection, ChannelCollection, CategoryChannelCollection, CharacterCollection,
                                  GuildCollection)
+from helpers.guild_diff import GuildDiff
 from helpers.set_channels import update_channels
 from helpers.set_roles import update_roles
 from logger import logger
@@ -18,8 +19,10 @@ async def update_guild_roles(guild: Guild, delete_old=False, clear_references=Tr
 
 async def update_guild_channels(guild: Guild, delete_old=False, clear_references=True) -> bool:
     logger.info("Doing: update server channels")
-    upd_ok = await update_channels(guild, CategoryChannelCollection.to_list() + ChannelCollection.to_list(),
-                                   delete_old=delete_old, clear_references=clear_references)
+    channel_descriptions = CategoryChannelCollection.to_list() + ChannelCollection.to_list()
+    diff = GuildDiff(guild, channel_descriptions, allowed_role_descriptions=RoleCollection.to_list())
+    upd_ok = await update_channels(guild, channel_descriptions, delete_old=delete_old,
+                                   clear_references=clear_references, diff=diff)
     logger.info(f"Done{'' if upd_ok else ' with errors'}: update server channels")
     return upd_ok
 
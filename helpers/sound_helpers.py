@@ -1,13 +1,14 @@
 import asyncio
-import os
 from typing import Callable, Any, Optional
 
 import discord
 from discord import ClientException, VoiceChannel, Guild, AudioSource, VoiceClient
 from discord.opus import OpusNotLoaded
 
-from constants import BOT, SONG_PATH
-from helpers.youtube_helpers import YTDLSource
+from constants import BOT
+from helpers.audio_cache import AudioCache, get_local_song_path
+from helpers.audio_mixer import AudioMixer, MixerTrack
+from helpers.youtube_helpers import YTDLSource, is_youtube_link
 from logger import logger
 from models.types import GuildSingleton
 
@@ -18,6 +19,7 @@ class SoundTools(GuildSingleton):
         self._connection: Optional[VoiceClient] = None
         self._dispatcher = None
         self._last_source_path = None
+        self._mixer: Optional[AudioMixer] = None
 
     @property
     def last_source_path(self):
@@ -78,6 +80,26 @@ class SoundTools(GuildSingleton):
             return False
         return True
 
+    @staticmethod
+    async def _get_source(song_path: str, opus_allowed=True) -> Optional[AudioSource]:
+        """Returns an audio source for a local file or a YouTube link, or None if the path is invalid.
+
+        If opus_allowed is False, a PCM source is returned (required by the mixer).
+        """
+        local_path = get_local_song_path(song_path)
+        if local_path:
+            source = AudioCache().get(local_path, pcm=not opus_allowed)
+            if source is None:
+                # First use: play with FFmpeg and cache the Opus (or PCM) version for the next times
+                source = discord.FFmpegPCMAudio(local_path)
+                asyncio.ensure_future(AudioCache().load_async(local_path, pcm=not opus_allowed, loop=BOT.loop))
+        elif is_youtube_link(song_path):
+            source = await YTDLSource.from_url(song_path, loop=BOT.loop, stream=True)
+        else:
+            logger.error(f"Song path is invalid: {song_path}")
+            return None
+        return source
+
     async def play(self, voice_channel: VoiceChannel, song_path: str, force=False,
                    after: Callable[[Exception], Any] = None) -> bool:
         """Play a song in a VoiceChannel
@@ -98,17 +120,49 @@ class SoundTools(GuildSingleton):
         if self._connection.is_playing() or self._connection.is_paused():
             logger.debug("Cannot play, because a song is already playing or is paused!")
             return False
-        if os.path.isfile(os.path.join(SONG_PATH, song_path)):
-            song_path = os.path.join(SONG_PATH, song_path)
-        if os.path.isfile(song_path):
-            source = discord.FFmpegPCMAudio(song_path)
-        elif song_path.find("youtu.be") >= 0 or song_path.find("youtube.com") >= 0:
-            source = await YTDLSource.from_url(song_path, loop=BOT.loop, stream=True)
-        else:
-            logger.error(f"Song path is invalid: {song_path}")
+        source = await self._get_source(song_path)
+        if source is None:
             return False
         return await self._play(source, after=after)
 
+    async def mix(self, voice_channel: VoiceChannel, song_path: str, volume=1.0, fade_in=0.0, force=False,
+                  after: Callable[[Exception], Any] = None) -> Optional[MixerTrack]:
+        """Play a song in a VoiceChannel, over the songs already mixed.
+
+        :param voice_channel: VoiceChannel where to play the song
+        :param song_path: path to an audio file
+        :param volume: volume of the song (1.0: original volume)
+        :param fade_in: duration of the fade in, in seconds
+        :param force: if True, stop the current song if it was not mixed.
+        If False, the song is not played if a song not mixed is already playing (or paused)
+        :param after: the finalizer that is called after the song is exhausted or removed from the mix.
+        :return: the MixerTrack of the song (to change its volume or remove it), or None on error.
+        """
+        self._last_source_path = song_path
+        if not await self._connect(voice_channel):
+            return None
+        mixer_playing = self._mixer is not None and not self._mixer.ended and self._connection.source is self._mixer
+        if not mixer_playing and (self._connection.is_playing() or self._connection.is_paused()):
+            if not force:
+                logger.debug("Cannot mix, because a song not mixed is already playing or is paused!")
+                return None
+            await self._close()
+        source = await self._get_source(song_path, opus_allowed=False)
+        if source is None:
+            return None
+        if mixer_playing:
+            return self._mixer.add_track(source, volume=volume, fade_in=fade_in, after=after)
+        self._mixer = AudioMixer()
+        track = self._mixer.add_track(source, volume=volume, fade_in=fade_in, after=after)
+        if not await self._play(self._mixer):
+            return None
+        return track
+
+    def remove_track(self, track: MixerTrack, fade_out=0.0):
+        """Remove a song from the mix, after a fade out if fade_out (in seconds) is positive."""
+        if self._mixer is not None:
+            self._mixer.remove_track(track, fade_out=fade_out)
+
     async def stop(self, *_args, **_kwargs):
         return await self._close()
 
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Optional, Union, List
+
+from discord import Guild
+
+from default_collections import RoleCollection
+from logger import logger
+from models import RoleDescription
+
+STATE_PATH = "files/_state/"
+_SAVE_DELAY = 2.  # in seconds, the state is written at most once per delay
+_MAX_AGE = 6 * 60 * 60  # in seconds, older states are not restored (the game is probably over)
+
+
+class StateStore:
+    """Snapshot of the game state of a guild, written to local disk and restored after a restart.
+
+    The provider (the ListenerManager of the guild) exports a JSON-serialisable dictionary with ids only.
+    Call mark_dirty after each change: the state is written after a short delay, once for many changes.
+    """
+    _stores: Dict[int, 'StateStore'] = {}
+
+    def __init__(self, guild_id: int, path: str = STATE_PATH, delay=_SAVE_DELAY):
+        self._guild_id = guild_id
+        self._file_path = os.path.join(path, f"state_{guild_id}.json")
+        self._delay = delay
+        self.provider = None  # object with export_state and import_state methods
+        self.restored = False
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._last_data: Optional[str] = None
+
+    @classmethod
+    def get(cls, guild_ref: Union[int, Guild]) -> 'StateStore':
+        guild_id = getattr(guild_ref, "id", guild_ref)
+        store = cls._stores.get(guild_id)
+        if store is None:
+            store = cls._stores[guild_id] = cls(guild_id)
+        return store
+
+    @classmethod
+    def remove(cls, guild_ref: Union[int, Guild]):
+        store = cls._stores.pop(getattr(guild_ref, "id", guild_ref), None)
+        if store and store._save_handle:
+            store._save_handle.cancel()
+
+    def mark_dirty(self):
+        if self.provider is None or self._save_handle is not None:
+            return
+        self._save_handle = asyncio.get_event_loop().call_later(self._delay, self.save)
+
+    def save(self) -> bool:
+        self._save_handle = None
+        if self.provider is None:
+            return False
+        try:
+            state = self.provider.export_state()
+            state_data = json.dumps(state, separators=(",", ":"), ensure_ascii=False)
+        except (TypeError, ValueError) as err:
+            logger.error(f"Failed to export game state of guild {self._guild_id}: {err}")
+            return False
+        if state_data == self._last_data:
+            return True  # nothing changed
+        data = json.dumps({"time": time.time(), "state": state}, separators=(",", ":"), ensure_ascii=False)
+        tmp_path = self._file_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self._file_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                file.write(data)
+            os.replace(tmp_path, self._file_path)  # atomic: a crash never leaves a partial file
+        except OSError as err:
+            logger.error(f"Failed to write game state of guild {self._guild_id}: {err}")
+            return False
+        self._last_data = state_data
+        logger.debug(f"Game state of guild {self._guild_id} saved ({len(data)} bytes)")
+        return True
+
+    def load(self) -> Optional[dict]:
+        try:
+            with open(self._file_path, "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as err:
+            logger.error(f"Failed to read game state of guild {self._guild_id}: {err}")
+            return None
+        if time.time() - snapshot.get("time", 0) > _MAX_AGE:
+            logger.info(f"Game state of guild {self._guild_id} is too old to be restored")
+            return None
+        return snapshot.get("state")
+
+    async def restore(self) -> bool:
+        """Restore the state saved before the restart, once. Returns True if a state has been restored."""
+        if self.restored or self.provider is None:
+            return False
+        self.restored = True
+        state = self.load()
+        if not state:
+            return False
+        try:
+            await self.provider.import_state(state)
+        except Exception as err:
+            logger.error(f"Failed to restore game state of guild {self._guild_id}: {err}")
+            logger.exception(err)
+            return False
+        logger.info(f"Game state of guild {self._guild_id} restored")
+        return True
+
+
+# Helpers to export/import options of reaction menus
+
+def role_descriptions_to_state(role_descriptions: Optional[List[RoleDescription]]) -> Optional[List[dict]]:
+    """Keys of descriptions of RoleCollection, names of other roles."""
+    if role_descriptions is None:
+        return None
+    return [{"key": role_descr.key} if RoleCollection.get(role_descr.key, None) is role_descr
+            else {"name": role_descr.name} for role_descr in role_descriptions]
+
+
+def role_descriptions_from_state(guild: Guild, items: Optional[List[dict]]) -> Optional[List[RoleDescription]]:
+    if items is None:
+        return None
+    res = []
+    for item in items:
+        if "key" in item:
+            role_descr = RoleCollection.get(item["key"], None)
+        else:
+            role = next((role for role in guild.roles if role.name == item.get("name")), None)
+            role_descr = RoleDescription.from_role(role) if role else None
+        if role_descr is None:
+            logger.warning(f"Role {item} not found while restoring game state")
+            continue
+        res.append(role_descr)
+    return res
+
+
+def options_to_state(options) -> dict:
+    return {key: role_descriptions_to_state(value) if key in ("required_roles", "ignored_roles") else value
+            for key, value in vars(options).items()}
+
+
+def options_from_state(options_class, guild: Guild, state: dict):
+    kwargs = {key: role_descriptions_from_state(guild, value) if key in ("required_roles", "ignored_roles")
+              else value for key, value in state.items()}
+    return options_class(**kwargs)
@@ -1,8 +1,15 @@
 import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple, Iterable, Optional
 
 import discord
 import youtube_dl as youtube_dl
 
+from constants import YTDL_MAX_WORKERS, YTDL_CACHE_TTL, YTDL_CACHE_SIZE
+from logger import logger
+
 youtube_dl.utils.bug_reports_message = lambda: ''
 
 ytdl_format_options = {
@@ -25,6 +32,81 @@ ffmpeg_options = {
 
 ytdl = youtube_dl.YoutubeDL(ytdl_format_options)
 
+# Dedicated thread pool: slow extractions must not starve the default executor
+_ytdl_executor = ThreadPoolExecutor(max_workers=YTDL_MAX_WORKERS, thread_name_prefix="ytdl")
+# LRU cache {(url, stream): (timestamp, data)}, least recently used first. Stream urls given by YouTube expire after
+# a few hours: expired entries are removed.
+_info_cache: 'OrderedDict[Tuple[str, bool], Tuple[float, dict]]' = OrderedDict()
+_pending_extractions: Dict[Tuple[str, bool], asyncio.Future] = {}
+
+
+def is_youtube_link(link: str) -> bool:
+    return link.find("youtu.be") >= 0 or link.find("youtube.com") >= 0
+
+
+def _get_cached_info(key: Tuple[str, bool]) -> Optional[dict]:
+    cached = _info_cache.get(key)
+    if cached is None:
+        return None
+    if time.monotonic() - cached[0] >= YTDL_CACHE_TTL:
+        del _info_cache[key]
+        return None
+    _info_cache.move_to_end(key)
+    return cached[1]
+
+
+def _cache_info(key: Tuple[str, bool], data: dict):
+    now = time.monotonic()
+    for expired_key in [cached_key for cached_key, (timestamp, _) in _info_cache.items()
+                        if now - timestamp >= YTDL_CACHE_TTL]:
+        del _info_cache[expired_key]
+    _info_cache[key] = (now, data)
+    _info_cache.move_to_end(key)
+    while len(_info_cache) > YTDL_CACHE_SIZE:
+        _info_cache.popitem(last=False)
+
+
+def _extract_info(url, stream):
+    data = ytdl.extract_info(url, download=not stream)
+    if 'entries' in data:
+        # take first item from a playlist
+        data = data['entries'][0]
+    return data
+
+
+async def extract_info(url, *, loop=None, stream=False) -> dict:
+    """Get video info, from cache if possible. Concurrent requests for the same url are merged."""
+    key = (url, stream)
+    cached = _get_cached_info(key)
+    if cached is not None:
+        return cached
+    if key in _pending_extractions:
+        return await asyncio.shield(_pending_extractions[key])
+    loop = loop or asyncio.get_event_loop()
+    future = loop.run_in_executor(_ytdl_executor, _extract_info, url, stream)
+    _pending_extractions[key] = future
+    try:
+        data = await future
+    finally:
+        _pending_extractions.pop(key, None)
+    _cache_info(key, data)
+    return data
+
+
+async def prefetch(urls: Iterable[str], *, loop=None, stream=True) -> int:
+    """Extract info of YouTube links in advance. Returns the number of links successfully prefetched."""
+    urls = [url for url in urls if is_youtube_link(url)]
+    results = await asyncio.gather(*[extract_info(url, loop=loop, stream=stream) for url in urls],
+                                   return_exceptions=True)
+    nb_ok = 0
+    for url, res in zip(urls, results):
+        if isinstance(res, Exception):
+            logger.warning(f"Failed to prefetch {url}: {res}")
+        else:
+            nb_ok += 1
+    logger.debug(f"{nb_ok}/{len(urls)} YouTube link(s) prefetched")
+    return nb_ok
+
 
 class YTDLSource(discord.PCMVolumeTransformer):
     def __init__(self, source, *, data, volume=0.5):
@@ -37,12 +119,6 @@ class YTDLSource(discord.PCMVolumeTransformer):
 
     @classmethod
     async def from_url(cls, url, *, loop=None, stream=False):
-        loop = loop or asyncio.get_event_loop()
-        data = await loop.run_in_executor(None, lambda: ytdl.extract_info(url, download=not stream))
-
-        if 'entries' in data:
-            # take first item from a playlist
-            data = data['entries'][0]
-
+        data = await extract_info(url, loop=loop, stream=stream)
         filename = data['url'] if stream else ytdl.prepare_filename(data)
         return cls(discord.FFmpegPCMAudio(filename, **ffmpeg_options), data=data)
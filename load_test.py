@@ -0,0 +1,77 @@
+# load_test.py
+# Load test of the website: concurrent clients request pages for a while, as when an invite link is shared publicly.
+import asyncio
+import sys
+import time
+from collections import Counter
+
+from aiohttp import ClientSession, ClientError, TCPConnector
+
+DEFAULT_URL = "http://127.0.0.1:5000"
+DEFAULT_PATHS = ("/", "/bot_invite", "/static/error_code.css")
+DEFAULT_CONCURRENCY = 50
+DEFAULT_DURATION = 10.  # in seconds
+
+
+async def _client(session: ClientSession, urls, deadline, revalidate, latencies, statuses):
+    etags = {}
+    i = 0
+    while time.perf_counter() < deadline:
+        url = urls[i % len(urls)]
+        i += 1
+        headers = {"Accept-Encoding": "gzip"}
+        if revalidate and url in etags:
+            headers["If-None-Match"] = etags[url]
+        start = time.perf_counter()
+        try:
+            async with session.get(url, headers=headers, allow_redirects=False) as response:
+                await response.read()
+                statuses[response.status] += 1
+                if "ETag" in response.headers:
+                    etags[url] = response.headers["ETag"]
+        except (ClientError, asyncio.TimeoutError) as err:
+            statuses[type(err).__name__] += 1
+        latencies.append(time.perf_counter() - start)
+
+
+async def load_test(base_url=DEFAULT_URL, paths=DEFAULT_PATHS, concurrency=DEFAULT_CONCURRENCY,
+                    duration=DEFAULT_DURATION, revalidate=False) -> dict:
+    """Returns requests per second, latency quantiles (in ms) and the count of each status."""
+    urls = [base_url.rstrip("/") + path for path in paths]
+    latencies, statuses = [], Counter()
+    async with ClientSession(connector=TCPConnector(limit=concurrency)) as session:
+        deadline = time.perf_counter() + duration
+        start = time.perf_counter()
+        await asyncio.gather(*(_client(session, urls, deadline, revalidate, latencies, statuses)
+                               for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def quantile(q):
+        return 1000 * latencies[min(int(q * len(latencies)), len(latencies) - 1)] if latencies else 0.
+
+    return {"requests": len(latencies), "rps": len(latencies) / elapsed, "p50": quantile(0.5),
+            "p99": quantile(0.99), "max": quantile(1), "statuses": dict(statuses)}
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if "--help" in args:
+        print("Syntax: python load_test.py [URL] [OPTIONS]\n"
+              f"Requests pages of a running website (default: {DEFAULT_URL}) with concurrent clients.\n"
+              "Options:\n"
+              f"  --concurrency N: number of concurrent clients (default: {DEFAULT_CONCURRENCY})\n"
+              f"  --duration S: duration of the test in seconds (default: {DEFAULT_DURATION})\n"
+              f"  --paths P1,P2: paths requested in turn (default: {','.join(DEFAULT_PATHS)})\n"
+              "  --revalidate: send If-None-Match with the last ETag received, as browsers do")
+        exit(0)
+    _url = args[0] if args and not args[0].startswith("--") else DEFAULT_URL
+    _concurrency = int(args[args.index("--concurrency") + 1]) if "--concurrency" in args else DEFAULT_CONCURRENCY
+    _duration = float(args[args.index("--duration") + 1]) if "--duration" in args else DEFAULT_DURATION
+    _paths = args[args.index("--paths") + 1].split(",") if "--paths" in args else DEFAULT_PATHS
+    _results = asyncio.get_event_loop().run_until_complete(
+        load_test(_url, _paths, _concurrency, _duration, revalidate="--revalidate" in args))
+    print(f"{_results['requests']} requests in {_duration:.0f}s with {_concurrency} clients: "
+          f"{_results['rps']:.0f} requests/s\n"
+          f"Latency: p50={_results['p50']:.1f}ms p99={_results['p99']:.1f}ms max={_results['max']:.1f}ms\n"
+          f"Statuses: {_results['statuses']}")
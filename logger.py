@@ -1,10 +1,57 @@
 # -*- coding: utf-8 -*-
 # open source project
+import atexit
+import gzip
 import logging
 import os
+import queue
+import shutil
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List
 
 
 DEFAULT_CONSOLE_LEVEL = logging.INFO
+LOG_MAX_BYTES = 10 * 1024 * 1024  # size of a log file before rotation
+LOG_BACKUP_COUNT = 5  # number of rotated files kept for each log file
+LOG_QUEUE_SIZE = 10000  # records waiting to be written; newer records are dropped when the queue is full
+COMPRESS_ROTATED_LOGS = True
+
+_queue_listeners: Dict[str, QueueListener] = {}  # {logger name: listener writing log files in a thread}
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Never blocks: records are dropped (and counted) if the writing thread is late, e.g. during an error storm."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _gzip_namer(name):
+    return name + ".gz"
+
+
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _rotating_file_handler(path, level, formatter, compress=COMPRESS_ROTATED_LOGS) -> RotatingFileHandler:
+    handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8",
+                                  delay=True)
+    if compress:
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+    handler.setLevel(level)
+    handler.setFormatter(formatter)
+    return handler
 
 
 def _initialize_logger(output_dir, logger_name="custom"):
@@ -18,19 +65,18 @@ def _initialize_logger(output_dir, logger_name="custom"):
     handler.setFormatter(formatter)
     _logger.addHandler(handler)
 
-    # create error file handler and set level to error
-    handler = logging.FileHandler(os.path.join(output_dir, "error.log"), "w", encoding=None, delay=True)
-    handler.setLevel(logging.ERROR)
-    formatter = logging.Formatter(u"%(asctime)s - %(levelname)s - %(message)s")
-    handler.setFormatter(formatter)
-    _logger.addHandler(handler)
-
-    # create debug file handler and set level to debug
-    handler = logging.FileHandler(os.path.join(output_dir, "debug.log"), "w")
+    # create error and debug file handlers, written in a thread to avoid blocking the event loop
+    error_handler = _rotating_file_handler(os.path.join(output_dir, "error.log"), logging.ERROR,
+                                           logging.Formatter(u"%(asctime)s - %(levelname)s - %(message)s"))
+    debug_handler = _rotating_file_handler(os.path.join(output_dir, "debug.log"), logging.DEBUG, formatter)
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    handler = _DroppingQueueHandler(log_queue)
     handler.setLevel(logging.DEBUG)
-    formatter = logging.Formatter(u"%(asctime)s - %(levelname)s - %(module)s %(funcName)s %(lineno)d - %(message)s")
-    handler.setFormatter(formatter)
     _logger.addHandler(handler)
+    listener = QueueListener(log_queue, error_handler, debug_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # write pending records before exit
+    _queue_listeners[logger_name] = listener
     return _logger
 
 
@@ -41,6 +87,31 @@ logger = _initialize_logger(_log_path)
 logger.debug("Logger loaded successfully. Logging directory: {}".format(_log_path))
 
 
+def get_handlers(logger=logger) -> List[logging.Handler]:
+    """Handlers of the logger, file handlers written in a thread included: [console, error file, debug file]"""
+    listener = _queue_listeners.get(logger.name)
+    return ([handler for handler in logger.handlers if not isinstance(handler, QueueHandler)]
+            + list(listener.handlers if listener else []))
+
+
+def rotate_log_files(logger=logger):
+    """Start new log files, previous ones are kept as backups. To be called once, when the bot starts
+    (modules importing the logger, e.g. scripts and benchmarks, must not rotate the files of a running bot)."""
+    for handler in get_handlers(logger):
+        if isinstance(handler, RotatingFileHandler) and os.path.exists(handler.baseFilename) \
+                and os.path.getsize(handler.baseFilename):
+            handler.acquire()  # the file may be written by the listener thread
+            try:
+                handler.doRollover()
+            finally:
+                handler.release()
+
+
+def dropped_records(logger=logger) -> int:
+    """Number of records not written in log files because the queue was full."""
+    return sum(handler.dropped for handler in logger.handlers if isinstance(handler, _DroppingQueueHandler))
+
+
 def change_logger_level(level=logging.INFO, logger=logger, handler_index=0):
     conv_lvl = {"debug": logging.DEBUG, "info": logging.INFO,
                 "warning": logging.WARNING, "warn": logging.WARN,
@@ -48,11 +119,45 @@ def change_logger_level(level=logging.INFO, logger=logger, handler_index=0):
     if isinstance(level, str):
         level = level.lower()
         level = conv_lvl.get(level, logging.INFO)
-    logger.handlers[handler_index].setLevel(level)
+    get_handlers(logger)[handler_index].setLevel(level)
+    listener = _queue_listeners.get(logger.name)
+    if listener:  # records are not queued if no file handler writes them
+        queue_level = min(handler.level for handler in listener.handlers)
+        for handler in logger.handlers:
+            if isinstance(handler, QueueHandler):
+                handler.setLevel(queue_level)
     logger.debug("Logger level has been changed to '{}' (handler n°{}).".format(level, handler_index))
     return logger
 
 
+def is_logged(level, logger=logger) -> bool:
+    """Returns whether a record of this level would be emitted by at least one handler of the logger."""
+    return logger.isEnabledFor(level) and any(level >= handler.level for handler in logger.handlers)
+
+
+class LazyFormat:
+    """Argument of a log message, computed only if the record is emitted:
+    logger.debug("Message %s", LazyFormat(format_message, message, 50))
+    """
+    __slots__ = ("_func", "_args")
+
+    def __init__(self, func, *args):
+        self._func = func
+        self._args = args
+
+    def __str__(self):
+        return str(self._func(*self._args))
+
+
+def lazy_debug(msg, *args, logger=logger):
+    """Log msg % args at debug level, only if a handler emits debug records (no formatting otherwise).
+
+    Use it on hot paths (e.g. event handlers) instead of logger.debug with a f-string.
+    """
+    if is_logged(logging.DEBUG, logger):
+        logger.debug(msg, *args, stacklevel=2)  # module, function and line of the caller
+
+
 # For testing purposes.
 if __name__ == '__main__':
     logger.debug("Debug message.")
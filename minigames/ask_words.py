@@ -2,11 +2,12 @@ import asyncio
 import random
 
 import discord
-from discord import Forbidden, HTTPException, Member, VoiceState, File, NotFound
+from discord import Forbidden, HTTPException, Member, VoiceState, NotFound
 
 from default_collections import Emojis, ChannelCollection, RoleCollection, CharacterCollection
 from functions.text_analysis import check_answer, check_answer_and_return_it, TextAnalysisOptions
 from game_models.abstract_channel_mini_game import ChannelGameStatus, ChannelGameStatuses, TextChannelMiniGame
+from helpers.attachment_cache import cached_file
 from helpers.json_helpers import TranslationDict
 from logger import logger
 
@@ -53,16 +54,33 @@ class AskWordsChannelStatus(ChannelGameStatus):
     def clear(self):
         super().clear()
         self.members.clear()
-        self.members.update({member: 0 for member in self._channel.members if not member.bot})
+        self.members.update({member: 0 for member in self.member_set})
         self.mandatory_answers.clear()
         self.correct_answers.clear()
         self.optional_answers.clear()
         self.waiting = False
         self.count_messages = 0
 
+    def export_state(self):  # the webhook is fetched again when needed
+        return {**super().export_state(), "members": self._export_members(self.members),
+                "mandatory_answers": list(self.mandatory_answers), "correct_answers": list(self.correct_answers),
+                "optional_answers": list(self.optional_answers), "waiting": self.waiting,
+                "count_messages": self.count_messages, "initial_message_sent": self.initial_message_sent}
+
+    def import_state(self, state):
+        super().import_state(state)
+        self.members.update(self._import_members(state["members"]))
+        self.mandatory_answers.update(state["mandatory_answers"])
+        self.correct_answers.update(state["correct_answers"])
+        self.optional_answers.update(state["optional_answers"])
+        self.waiting = state["waiting"]
+        self.count_messages = state["count_messages"]
+        self.initial_message_sent = state["initial_message_sent"]
+
 
 class AskWordsGame(TextChannelMiniGame):
     _default_messages = MESSAGES
+    _restore_channel_states = True
 
     def __init__(self, **kwargs):
         self._correct_answers_proportion = kwargs.pop("correct_answers_proportions", 0.2)
@@ -209,7 +227,7 @@ class AskWordsGame(TextChannelMiniGame):
                 logger.exception(err)
                 self._channels[channel].webhook = None
             if self._channels[channel].count_messages == 10:
-                self._channels[channel].webhook.send(file=File(self._messages["CHARACTER_MESSAGE_FILE"]))
+                self._channels[channel].webhook.send(file=await cached_file(self._messages["CHARACTER_MESSAGE_FILE"]))
         self._channels[channel].count_messages += 1
 
         # Check forbidden answers (exact word check)
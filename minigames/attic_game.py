@@ -5,13 +5,14 @@ from enum import Enum
 from typing import Dict
 
 import discord
-from discord import TextChannel, File, User
+from discord import TextChannel, User
 
 from default_collections import ChannelCollection, RoleCollection
 from default_collections.game_collection import MinigameCollection
 from functions.text_analysis import check_answer
 from game_models.abstract_channel_mini_game import ChannelGameStatus, ChannelGameStatuses, TextChannelMiniGame
 from bot_management.listener_utils import start_next_minigame
+from helpers.attachment_cache import send_cached_file
 from helpers.json_helpers import TranslationDict
 from logger import logger
 
@@ -102,12 +103,14 @@ class AtticGameChannelStatus(ChannelGameStatus):
         self.current_light = LightType.flashlight
         self.special = False
 
+    def _is_player(self, member) -> bool:
+        master_role = self._data.get("master_role", RoleCollection.MASTER.value)
+        return not member.bot and not master_role.has_the_role(member)
+
     def clear(self):
         super().clear()
         self.members.clear()
-        master_role = self._data.get("master_role", RoleCollection.MASTER.value)
-        self.members.update({member: 0 for member in self._channel.members if
-                             not member.bot and not master_role.has_the_role(member)})
+        self.members.update({member: 0 for member in self.member_set})
         self.objects_found.clear()
         self.objects_found.update({key: False for key in self.data.get("objects", [])})
         self.objects_found[LightActions.flashlight] = True  # the only object found at the beginning
@@ -120,9 +123,30 @@ class AtticGameChannelStatus(ChannelGameStatus):
         self.current_light = LightType.flashlight
         self.special = False
 
+    def export_state(self):
+        return {**super().export_state(), "members": self._export_members(self.members),
+                "objects_found": self.objects_found.copy(), "actions_done": self.actions_done.copy(),
+                "light_actions": {emoji: self._export_members(members)
+                                  for emoji, members in self.light_actions.items()},
+                "files_sent": self.files_sent, "files_special_sent": self.files_special_sent,
+                "current_light": self.current_light.name, "special": self.special}
+
+    def import_state(self, state):
+        super().import_state(state)
+        self.members.update(self._import_members(state["members"]))
+        self.objects_found.update(state["objects_found"])
+        self.actions_done.update(state["actions_done"])
+        for emoji, members in state["light_actions"].items():
+            self.light_actions.setdefault(emoji, {}).update(self._import_members(members))
+        self.files_sent = state["files_sent"]
+        self.files_special_sent = state["files_special_sent"]
+        self.current_light = LightType[state["current_light"]]
+        self.special = state["special"]
+
 
 class AtticGame(TextChannelMiniGame):
     _default_messages = MESSAGES
+    _restore_channel_states = True
 
     def __init__(self, **kwargs):
         self._image_remaining_duration = kwargs.pop("image_remaining_duration", 10)
@@ -144,7 +168,7 @@ class AtticGame(TextChannelMiniGame):
         if not isinstance(channel, TextChannel):
             logger.warning(f"Channel {channel} is not a text channel")
             return False
-        self._channels[channel].set_data(objects=self._messages["OBJECTS_TO_FIND"])
+        self._set_channel_data(channel)
         if not (set(LightActions.to_dict().values()) | set(GameActions.to_dict().values())
                 <= set(self._channels[channel].data["objects"])):
             logger.error(f"Bad keys for data! data must contains at least all LightActions and GameActions emojis"
@@ -161,6 +185,9 @@ class AtticGame(TextChannelMiniGame):
         await channel.send(self._messages["INTRO"].format(start_emoji=self._messages["START_EMOJI"]))
         return True
 
+    def _set_channel_data(self, channel):
+        self._channels[channel].set_data(objects=self._messages["OBJECTS_TO_FIND"])
+
     async def _on_channel_helped_victory(self, channel):
         await channel.send(self._messages["HELPED_VICTORY"])
         await self.on_map_found(channel)
@@ -211,7 +238,7 @@ class AtticGame(TextChannelMiniGame):
                       f"exist in {self._messages['FILES_PATH']} directory!"
             logger.error(err_msg)
             await self._master_channel_description.object_reference.send(err_msg)
-        msg = await channel.send(self._messages["WHAT_DO_YOU_SEE"], file=File(path))
+        msg = await send_cached_file(channel, self._messages["WHAT_DO_YOU_SEE"], path=path)
         if special:
             self._channels[channel].files_special_sent = current_file + 1
             # if special, it means the map can be found, so the bag is at least virtually found.
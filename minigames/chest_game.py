@@ -2,12 +2,12 @@ import asyncio
 from collections import OrderedDict
 
 import discord
-from discord import File
 
 from bot_management import GuildManager
 from default_collections import RoleCollection, Emojis
 from functions.text_analysis import check_answer
 from game_models.abstract_channel_mini_game import ChannelGameStatus, ChannelGameStatuses, TextChannelMiniGame
+from helpers.attachment_cache import send_cached_file
 from helpers.json_helpers import TranslationDict
 from utils_listeners.role_by_reaction import RoleByReactionManager, RoleMenuOptions
 
@@ -42,9 +42,17 @@ class ChestGameChannelStatus(ChannelGameStatus):
         super().clear()
         self.success = False
 
+    def export_state(self):
+        return {**super().export_state(), "success": self.success}
+
+    def import_state(self, state):
+        super().import_state(state)
+        self.success = state["success"]
+
 
 class ChestGame(TextChannelMiniGame):
     _default_messages = MESSAGES
+    _restore_channel_states = True
 
     def __init__(self, **kwargs):
         self._max_users_with_role = kwargs.pop("max_users_with_role", 2)
@@ -66,7 +74,7 @@ class ChestGame(TextChannelMiniGame):
         await self._master_channel_description.object_reference.send(
             self._messages["MASTER"].format(
                 code=self._messages["MULTIPLE_CODES_LINK"].join(self._messages["FINAL_CODES"])))
-        await channel.send(self._messages["INTRO"], file=File(self._messages["INTRO_FILE"]))
+        await send_cached_file(channel, self._messages["INTRO"], path=self._messages["INTRO_FILE"], reuse_url=True)
         return True
 
     async def _on_channel_helped_victory(self, channel):
@@ -77,7 +85,7 @@ class ChestGame(TextChannelMiniGame):
 
     async def _on_channel_victory(self, channel):
         self._channels[channel].success = True
-        await channel.send(self._messages["VICTORY"], file=File(self._messages["VICTORY_FILE"]))
+        await send_cached_file(channel, self._messages["VICTORY"], path=self._messages["VICTORY_FILE"], reuse_url=True)
         await channel.send(self._messages["FIRST_REACTION"])
         await asyncio.sleep(4)
         if self._simple_mode:
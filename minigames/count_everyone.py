@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from discord import Message, TextChannel
+from discord import Message, TextChannel, Member
 
 from default_collections import Emojis, ChannelCollection, RoleCollection, MinigameCollection
 from game_models import ChannelGameStatus, ChannelGameStatuses
@@ -23,14 +23,12 @@ class Messages(TranslationDict):
 MESSAGES = Messages(path="configuration/minigames/count_everyone")
 
 
-def filter_members(members, forbidden_role_descriptions: List[RoleDescription],
-                   allowed_role_descriptions: Optional[List[RoleDescription]] = None, no_bot=True):
-    return [member for member in members
-            if (not no_bot or not member.bot)
-            and not any([role_descr.has_the_role(member) for role_descr in forbidden_role_descriptions])
+def is_allowed_member(member, forbidden_role_descriptions: List[RoleDescription],
+                      allowed_role_descriptions: Optional[List[RoleDescription]] = None, no_bot=True):
+    return ((not no_bot or not member.bot)
+            and not any(role_descr.has_the_role(member) for role_descr in forbidden_role_descriptions)
             and (not allowed_role_descriptions
-                 or any([role_descr.has_the_role(member) for role_descr in allowed_role_descriptions]))
-            ]
+                 or any(role_descr.has_the_role(member) for role_descr in allowed_role_descriptions)))
 
 
 class CountEveryoneChannelStatus(ChannelGameStatus):
@@ -41,13 +39,14 @@ class CountEveryoneChannelStatus(ChannelGameStatus):
         self.started_once = False
         self.success = False  # not reset by clear
 
+    def _is_player(self, member: Member) -> bool:
+        return is_allowed_member(member, forbidden_role_descriptions=self._data.get("ignored_role_d", []),
+                                 allowed_role_descriptions=self._data.get("allowed_role_d", []))
+
     def clear(self):
         super().clear()
         self.members.clear()
-        self.members.update(
-            {member: 0 for member in filter_members(self._channel.members,
-                                                    forbidden_role_descriptions=self._data.get("ignored_role_d", []),
-                                                    allowed_role_descriptions=self._data.get("allowed_role_d", []))})
+        self.members.update({member: 0 for member in self.member_set})
         self.counter = 1
 
     def reset(self):
@@ -55,15 +54,25 @@ class CountEveryoneChannelStatus(ChannelGameStatus):
         self.started_once = False
         self.success = False
 
+    def export_state(self):
+        return {**super().export_state(), "members": self._export_members(self.members), "counter": self.counter,
+                "started_once": self.started_once, "success": self.success}
+
+    def import_state(self, state):
+        super().import_state(state)
+        self.members.update(self._import_members(state["members"]))
+        self.counter = state["counter"]
+        self.started_once = state["started_once"]
+        self.success = state["success"]
+
     @property
-    def members_count(self):  # computed live
-        return len(filter_members(self._channel.members,
-                                  forbidden_role_descriptions=self._data.get("ignored_role_d", []),
-                                  allowed_role_descriptions=self._data.get("allowed_role_d", [])))
+    def members_count(self):  # maintained from member and channel events
+        return len(self.member_set)
 
 
 class CountEveryone(TextChannelMiniGame):
     _default_messages = MESSAGES
+    _restore_channel_states = True
 
     def __init__(self, **kwargs):
         self._next_minigame_class_d = MinigameCollection.get(kwargs.pop("next_minigame_class", "KITCHEN"))
@@ -79,8 +88,7 @@ class CountEveryone(TextChannelMiniGame):
         if not isinstance(channel, TextChannel):
             logger.warning(f"Channel {channel} is not a text channel")
             return False
-        self._channels[channel].set_data(ignored_role_d=self._ignored_role_descriptions,
-                                         allowed_role_d=self._allowed_role_descriptions)
+        self._set_channel_data(channel)
         if not await super()._init_channel(channel):
             return False
         await self._master_channel_description.object_reference.send(
@@ -89,6 +97,10 @@ class CountEveryone(TextChannelMiniGame):
         self._channels[channel].started_once = True
         return True
 
+    def _set_channel_data(self, channel):
+        self._channels[channel].set_data(ignored_role_d=self._ignored_role_descriptions,
+                                         allowed_role_d=self._allowed_role_descriptions)
+
     def reset_counter(self, channel):
         if not self._simple_mode:
             self.reset_channel_stats(channel)
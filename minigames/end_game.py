@@ -3,11 +3,12 @@ import random
 from typing import Optional
 
 import discord
-from discord import TextChannel, File, VoiceChannel, Member, VoiceState
+from discord import TextChannel, VoiceChannel, Member, VoiceState
 
 from default_collections import ChannelCollection
 from game_models.abstract_minigame import AbstractMiniGame
 from helpers import SoundTools
+from helpers.attachment_cache import send_cached_file
 from helpers.json_helpers import TranslationDict
 
 
@@ -54,10 +55,12 @@ class EndGame(AbstractMiniGame):
     async def _on_victory(self, *args, **kwargs):
         if len(CongratulationsGame.instances(self.guild)):
             await CongratulationsGame.instances(self.guild)[0].start()
-        await self._text_channel.send(self._messages["VICTORY"], file=File(self._messages["VICTORY_FILE"]))
+        await send_cached_file(self._text_channel, self._messages["VICTORY"], path=self._messages["VICTORY_FILE"],
+                               reuse_url=True)
         await self._voice_channel.edit(sync_permissions=True)
         await asyncio.sleep(10)
-        await self._text_channel.send(self._messages["VICTORY_2"], file=File(self._messages["VICTORY_FILE_2"]))
+        await send_cached_file(self._text_channel, self._messages["VICTORY_2"], path=self._messages["VICTORY_FILE_2"],
+                               reuse_url=True)
 
     async def _check_first_victory(self):
         if len(self._emojis_done) == len(self._messages["VALID_EMOJIS"]):
@@ -3,12 +3,12 @@ import random
 from enum import Enum
 
 import discord
-from discord import File
 
 from default_collections import Emojis, GeneralMessages, CharacterCollection
 from functions.text_analysis import TextAnalysisOptions, check_answer_and_return_it
 from game_models.abstract_channel_mini_game import ChannelGameStatus, ChannelGameStatuses, TextChannelMiniGame
 from helpers import TranslationDict, long_send
+from helpers.attachment_cache import cached_file
 from logger import logger
 
 
@@ -83,16 +83,28 @@ class EnigmaChannelStatus(ChannelGameStatus):
     def clear(self):
         super().clear()
         self.members.clear()
-        self.members.update({member: 0 for member in self._channel.members if not member.bot})
+        self.members.update({member: 0 for member in self.member_set})
         self.statuses.clear()
         self.statuses.update({key: Status.NEW for key in self._data.get("enigmas", [])})
         self.answered_answers.clear()
         self.answered_answers.update({key: set() for key in self._data.get("enigmas", [])})
         self.current = None
 
+    def export_state(self):  # the webhook is fetched again when the game is restored
+        return {**super().export_state(), "current": self.current,
+                "statuses": {key: status.value for key, status in self.statuses.items()},
+                "answered_answers": {key: list(answers) for key, answers in self.answered_answers.items()}}
+
+    def import_state(self, state):
+        super().import_state(state)
+        self.statuses.update({key: Status(value) for key, value in state["statuses"].items()})
+        self.answered_answers.update({key: set(answers) for key, answers in state["answered_answers"].items()})
+        self.current = state["current"]
+
 
 class EnigmasGame(TextChannelMiniGame):
     _default_messages = MESSAGES
+    _restore_channel_states = True
 
     def __init__(self, **kwargs):
         self._ask_for_next_enigma = kwargs.pop("ask_for_next_enigma", True)
@@ -106,8 +118,11 @@ class EnigmasGame(TextChannelMiniGame):
         self._enigma_mode = EnigmaMode[self._messages.get("MODE", "ORDERED")]
         return True
 
-    async def _init_channel(self, channel) -> bool:
+    def _set_channel_data(self, channel):
         self._channels[channel].set_data(enigmas=self._messages["ENIGMAS"])
+
+    async def _init_channel(self, channel) -> bool:
+        self._set_channel_data(channel)
         if not await super()._init_channel(channel):
             return False
         answers = "\n" + "\n".join([f"{v['question']} : {v['answers']}" for v in self._messages["ENIGMAS"].values()])
@@ -121,6 +136,17 @@ class EnigmasGame(TextChannelMiniGame):
         logger.debug(f"Enigmas started for channel {channel}")
         return True
 
+    def export_state(self):
+        state = super().export_state()
+        return state and {**state, "enigma_mode": self._enigma_mode.name}
+
+    async def import_state(self, state):
+        self._enigma_mode = EnigmaMode[state["enigma_mode"]]
+        await super().import_state(state)
+        for channel, status in self._channels.items():
+            if status.active:
+                status.webhook = await self._character_description.get_instance(channel)
+
     def reset_channel_stats(self, channel):
         super().reset_channel_stats(channel)
         logger.debug(f"Playing members: {self._channels[channel].members}")
@@ -224,7 +250,7 @@ class EnigmasGame(TextChannelMiniGame):
         if not enigma_key:
             self._channels[channel].webhook.send(self._messages["NO_MORE_ENIGMA"])
             return  # end of enigmas
-        files = [File(path) for path in self._messages["ENIGMAS"][enigma_key].get("files", [])]
+        files = [await cached_file(path) for path in self._messages["ENIGMAS"][enigma_key].get("files", [])]
         self._channels[channel].webhook.send(self._messages["ENIGMAS"][enigma_key]["question"], files=files or None)
         self._channels[channel].statuses[enigma_key] = Status.ASKED
         self._channels[channel].current = enigma_key
@@ -52,19 +52,33 @@ class FTRGameStatus(ChannelGameStatus):
         self.statuses = {}
         self.count_bad_answers = 0
 
+    def _is_player(self, member) -> bool:
+        master_role = self._data.get("master_role", RoleCollection.MASTER.value)
+        return not member.bot and not master_role.has_the_role(member)
+
     def clear(self):
         super().clear()
         self.members.clear()
-        master_role = self._data.get("master_role", RoleCollection.MASTER.value)
-        self.members.update({member: 0 for member in self._channel.members if
-                             not member.bot and not master_role.has_the_role(member)})
+        self.members.update({member: 0 for member in self.member_set})
         self.statuses.clear()
         self.statuses.update({key: Status.NEW for key in self._data.get("solutions", [])})
         self.count_bad_answers = 0
 
+    def export_state(self):
+        return {**super().export_state(), "members": self._export_members(self.members),
+                "statuses": {key: status.value for key, status in self.statuses.items()},
+                "count_bad_answers": self.count_bad_answers}
+
+    def import_state(self, state):
+        super().import_state(state)
+        self.members.update(self._import_members(state["members"]))
+        self.statuses.update({key: Status(value) for key, value in state["statuses"].items()})
+        self.count_bad_answers = state["count_bad_answers"]
+
 
 class FindTheRecipe(TextChannelMiniGame):
     _default_messages = MESSAGES
+    _restore_channel_states = True
 
     def __init__(self, **kwargs):
         self._next_minigame_class_d = MinigameCollection.get(kwargs.pop("next_minigame_class", None))
@@ -73,9 +87,12 @@ class FindTheRecipe(TextChannelMiniGame):
         super().__init__(**kwargs)
         self._channels: ChannelGameStatuses = ChannelGameStatuses(FTRGameStatus)
 
-    async def _init_channel(self, channel):
+    def _set_channel_data(self, channel):
         self._channels[channel].set_data(solutions=self._messages["SOLUTIONS"],
                                          master_role=self._master_role_description)
+
+    async def _init_channel(self, channel):
+        self._set_channel_data(channel)
         if not await super()._init_channel(channel):
             return False
         steps = "- " + "\n - ".join([f"{k}: {v['solution']}" for k, v in self._messages["SOLUTIONS"].items()])
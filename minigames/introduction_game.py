@@ -2,13 +2,15 @@ from collections import OrderedDict
 import inspect
 
 import discord
-from discord import TextChannel, PermissionOverwrite, File
+from discord import TextChannel, PermissionOverwrite
 
 from bot_management import GuildManager
 from constants import BOT
 from default_collections import Emojis, ChannelCollection, RoleCollection
 from game_models.abstract_minigame import AbstractMiniGame
 from helpers import send_dm_message, long_send
+from helpers.attachment_cache import cached_file, send_cached_file
+from helpers.channel_purge import purge_channel
 from helpers.json_helpers import TranslationDict
 from logger import logger
 from models import PermissionOverwriteDescription
@@ -122,8 +124,7 @@ class IntroductionGame(AbstractMiniGame):
                 await self.welcome_dm_message(member, origin_channel=self._support_channel_d.object_reference)
         # Purge introduction channel and send the first message
         intro_channel: TextChannel = self._introduction_channel_d.object_reference
-        while await intro_channel.history(limit=1).flatten():  # completely purge the channel
-            await self._introduction_channel_d.object_reference.purge(limit=1000)
+        await purge_channel(intro_channel, wait_old_messages=True)  # completely purge the channel
         await self.welcome_general_message(self._introduction_channel_d.object_reference)
         # Send instructions to master channel
         msg = self._messages["INTRO_MASTER"].format(emoji_1=self._messages["EMOJI_1"],
@@ -139,12 +140,33 @@ class IntroductionGame(AbstractMiniGame):
         await MusicTools.jingle_palette_from_message(music_msg)
         return True
 
+    def export_state(self):
+        if not self._active:
+            return None
+        return {"step": self._step, "counter_2_to_3": self._counter_2_to_3, "rules_msg_id": self._rules_msg_id,
+                "choose_team_msg_id": getattr(self._choose_team_msg, "id", None), "nb_players": self._nb_players,
+                "nb_teams": self._nb_teams, "max_number_per_team": self._max_number_per_team,
+                "simple_mode": self._simple_mode}
+
+    async def import_state(self, state):
+        self._step = state["step"]
+        self._counter_2_to_3 = state["counter_2_to_3"]
+        self._rules_msg_id = state["rules_msg_id"]
+        # Only the id of the message is used
+        self._choose_team_msg = discord.Object(state["choose_team_msg_id"]) if state["choose_team_msg_id"] else None
+        self._nb_players = state["nb_players"]
+        self._nb_teams, self._max_number_per_team = state["nb_teams"], state["max_number_per_team"]
+        self._simple_mode = state["simple_mode"]
+        if self._rules_msg_id:
+            self._rolemenu_manager = RoleByReactionManager.get(self.guild)
+        self._active = True
+
     async def welcome_general_message(self, channel):
         reception_channel = self._support_channel_d.object_reference
         master_mention = self._master_role_description.object_reference.mention
-        await channel.send(
-            self._messages["WELCOME"].format(master=master_mention, channel=reception_channel.mention),
-            file=discord.File(self._messages["WELCOME_FILE"])
+        await send_cached_file(
+            channel, self._messages["WELCOME"].format(master=master_mention, channel=reception_channel.mention),
+            path=self._messages["WELCOME_FILE"]
         )
 
     async def handle_dm_message_error(self, reason, user: discord.user.User, origin_channel=None):
@@ -152,7 +174,7 @@ class IntroductionGame(AbstractMiniGame):
         if origin_channel:
             await origin_channel.send(
                 self._messages["DM_MESSAGES_ERROR"].format(user_mention=user.mention, bot_mention=BOT.user.mention),
-                file=discord.File(self._messages["DM_MESSAGES_ERROR_FILE"])
+                file=await cached_file(self._messages["DM_MESSAGES_ERROR_FILE"])
             )
 
     async def welcome_dm_message(self, user: discord.user.User, origin_channel=None):
@@ -176,7 +198,7 @@ class IntroductionGame(AbstractMiniGame):
             msg = self._messages["SYNOPSIS"].format(**{key: descr.object_reference.mention
                                                        for key, descr in
                                                        self._character_role_descriptions_dict.items()})
-            await message.channel.send(msg, file=File(self._messages["SYNOPSIS_FILE"]))
+            await send_cached_file(message.channel, msg, path=self._messages["SYNOPSIS_FILE"])
             # Update channel permissions to allow send messages
             permissions = PermissionOverwriteDescription(read_message_history=True, add_reactions=False,
                                                          send_messages=True, view_channel=True)
@@ -1,10 +1,11 @@
 import asyncio
 
-from discord import TextChannel, ChannelType, File, HTTPException, NotFound
+from discord import TextChannel, ChannelType, HTTPException, NotFound
 
 from default_collections import ChannelCollection, RoleCollection
 from game_models import AbstractMiniGame
 from helpers import (TranslationDict, long_send)
+from helpers.attachment_cache import cached_file
 from logger import logger
 from utils_listeners import RoleByReactionManager, MusicTools, RoleMenuOptions
 
@@ -47,7 +48,7 @@ class MineMessages(AbstractMiniGame):
         master_channel: TextChannel = self._master_channel_description.object_reference
         try:
             await long_send(master_channel, self._messages["MASTER"])
-            await master_channel.send(file=File(self._messages["MASTER_FILE"]))
+            await master_channel.send(file=await cached_file(self._messages["MASTER_FILE"]))
         except (HTTPException, NotFound, FileNotFoundError) as err:
             logger.error(f"Cannot send master infos: {err}")
         init_messages = self._messages.get("INITIAL_MESSAGES", {})
@@ -62,7 +63,7 @@ class MineMessages(AbstractMiniGame):
                     for key, message_value in messages_dict.items():
                         if "FILE" in key:
                             try:
-                                await channel_descr.object_reference.send(file=File(message_value))
+                                await channel_descr.object_reference.send(file=await cached_file(message_value))
                             except (HTTPException, NotFound, AttributeError, FileNotFoundError) as err:
                                 logger.error(f"Cannot send game file: {err}")
                         else:
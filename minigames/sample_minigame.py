@@ -7,6 +7,7 @@ from discord import Message
 
 from logger import logger
 from helpers import TranslationDict, send_dm_message
+from helpers.attachment_cache import cached_file
 from game_models import AbstractMiniGame
 from default_collections import GeneralMessages, ChannelCollection, RoleCollection, Emojis
 
@@ -23,7 +24,7 @@ async def welcome_general_message(channel):
     master_mention = RoleCollection.MASTER.value.object_reference.mention
     await channel.send(
         GeneralMessages["WELCOME"].format(master=master_mention, channel=reception_channel.mention),
-        file=discord.File(GeneralMessages["WELCOME_FILE"])
+        file=await cached_file(GeneralMessages["WELCOME_FILE"])
     )
 
 
@@ -33,7 +34,7 @@ async def handle_dm_message_error(reason, user: discord.user.User, origin_channe
         bot_mention = RoleCollection.BOT.value.object_reference.mention
         await origin_channel.send(
             GeneralMessages["DM_MESSAGES_ERROR"].format(user_mention=user.mention, bot_mention=bot_mention),
-            file=discord.File(GeneralMessages["DM_MESSAGES_ERROR_FILE"])
+            file=await cached_file(GeneralMessages["DM_MESSAGES_ERROR_FILE"])
         )
 
 
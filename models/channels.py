@@ -1,4 +1,4 @@
-from typing import Dict, Union, Optional, Any
+from typing import Dict, Union, Optional, Any, Tuple
 
 import discord
 from discord import (PermissionOverwrite, Member, Role, CategoryChannel, ChannelType, Guild, Forbidden, HTTPException,
@@ -140,10 +140,24 @@ class ChannelDescription(DiscordObjectDict):
             else:
                 role_obj = role
             if isinstance(permissions, PermissionOverwriteDescription):
-                permissions = PermissionOverwrite(**permissions.to_dict())
+                permissions = permissions.to_overwrite()  # from bitfields computed once per description
             new_overwrites.update({role_obj: permissions})
         return new_overwrites
 
+    def compiled_overwrites(self) -> Dict[Union[Member, Role], Tuple[int, int]]:
+        """Overwrites as (allow, deny) bitfields, by role/member. Bitfields are computed once per description."""
+        compiled = {}
+        for role, permissions in (self._overwrites or {}).items():
+            role_obj = role.object_reference if isinstance(role, RoleDescription) else role
+            if not role_obj:
+                continue
+            if isinstance(permissions, PermissionOverwriteDescription):
+                compiled[role_obj] = permissions.pair()
+            else:
+                allow, deny = permissions.pair()
+                compiled[role_obj] = (allow.value, deny.value)
+        return compiled
+
     @staticmethod
     def _format_category_channel(category_channel: Optional['ChannelDescription']) -> Optional[CategoryChannel]:
         if category_channel is None:
@@ -261,19 +275,13 @@ class ChannelDescription(DiscordObjectDict):
         return role_descr
 
     # Export
-    @staticmethod
-    def _handle_category_overwrites(options):
-        overwrites = options.get('overwrites', None)
-        if overwrites:
+    def _handle_category_overwrites(self, options):
+        if options.get('overwrites', None):
             perms = []
-            for target, perm in overwrites.items():
-                if not isinstance(perm, PermissionOverwrite):
-                    raise InvalidArgument('Expected PermissionOverwrite received {0.__name__}'.format(type(perm)))
-
-                allow, deny = perm.pair()
+            for target, (allow, deny) in self.compiled_overwrites().items():  # only bitfields are needed
                 payload = {
-                    'allow': allow.value,
-                    'deny': deny.value,
+                    'allow': allow,
+                    'deny': deny,
                     'id': target.id
                 }
 
@@ -308,16 +316,15 @@ class ChannelDescription(DiscordObjectDict):
     def _compare_overwrites(self, ref_overwrites, errors, allowed_role_descriptions):
         allowed_role_descriptions = allowed_role_descriptions or None
         if not self._overwrites and self.category_description:
-            descr_overwrites = self.category_description.overwrites
+            descr_overwrites = self.category_description.compiled_overwrites()
         else:
-            descr_overwrites = self.overwrites
-        descr_overwrites = descr_overwrites or {}
-        for key, descr_permission in descr_overwrites.items():
+            descr_overwrites = self.compiled_overwrites()
+        for key, descr_pair in descr_overwrites.items():
             if key in ref_overwrites:
-                ref_permission = ref_overwrites[key]
-                if descr_permission.pair() != ref_permission.pair():
+                ref_allow, ref_deny = ref_overwrites[key].pair()
+                if descr_pair != (ref_allow.value, ref_deny.value):  # comparison of bitfields
                     errors.append(f"Incorrect permissions for role {key} in channel {self}: "
-                                  f"{descr_permission.pair()} != {ref_permission.pair()}")
+                                  f"{descr_pair} != {(ref_allow.value, ref_deny.value)}")
             else:
                 errors.append(f"Role not in overwrites of channel {self}: {key}")
         for key in ref_overwrites:
@@ -402,14 +409,15 @@ class ChannelDescription(DiscordObjectDict):
         # Channel creation
         try:
             channel_type = self.channel_type
+            options = self.to_dict()
             if channel_type is ChannelType.text:
-                channel_object = await guild.create_text_channel(**self.to_dict())
-                await channel_object.edit(sync_permissions=self.to_dict().get('sync_permissions', False))
+                channel_object = await guild.create_text_channel(**options)
+                await channel_object.edit(sync_permissions=options.get('sync_permissions', False))
             elif channel_type is ChannelType.voice:
-                channel_object = await guild.create_voice_channel(**self.to_dict())
-                await channel_object.edit(sync_permissions=self.to_dict().get('sync_permissions', False))
+                channel_object = await guild.create_voice_channel(**options)
+                await channel_object.edit(sync_permissions=options.get('sync_permissions', False))
             elif channel_type is ChannelType.category:
-                channel_object = await guild.create_category_channel(**self.to_dict())
+                channel_object = await guild.create_category_channel(**options)
             else:
                 logger.warning(f"Channel type '{channel_type}' is not supported! "
                                f"Channel {self} has not been created.")
@@ -433,9 +441,10 @@ class ChannelDescription(DiscordObjectDict):
         # Edit the channel
         self.object_reference = channel  # update reference
         try:
-            await channel.edit(**self.to_dict(update=True))
+            options = self.to_dict(update=True)
+            await channel.edit(**options)
             # patch a bug in discord.py v1.3.3 ?
-            await channel.edit(sync_permissions=self.to_dict(update=True).get('sync_permissions', False))
+            await channel.edit(sync_permissions=options.get('sync_permissions', False))
         except (Forbidden, HTTPException, InvalidArgument) as err:
             logger.warning(f"Error while editing channel {channel}: {err}")
             return False
@@ -1,4 +1,6 @@
-from typing import Dict, Union, Optional
+from typing import Dict, Union, Optional, Tuple
+
+from discord import Permissions, PermissionOverwrite
 
 from models.abstract_models import DiscordObjectDict
 
@@ -81,3 +83,31 @@ class PermissionOverwriteDescription(PermissionDescription):
     """Describes a PermissionOverwrite object"""
     def keys(self):
         return [key for key in self._export_keys]  # Include None values in result
+
+    def __setattr__(self, key, value):
+        if key in self._export_keys:  # compiled permissions must be computed again
+            self.__dict__.pop("_pair", None)
+            self.__dict__.pop("_overwrite", None)
+        super().__setattr__(key, value)
+
+    def pair(self) -> Tuple[int, int]:
+        """(allow, deny) bitfields, as in PermissionOverwrite.pair, computed once."""
+        if "_pair" not in self.__dict__:
+            allow, deny = 0, 0
+            for key in self._export_keys:
+                value = getattr(self, key)
+                if value is True:
+                    allow |= Permissions.VALID_FLAGS[key]
+                elif value is False:
+                    deny |= Permissions.VALID_FLAGS[key]
+            self.__dict__["_pair"] = (allow, deny)
+        return self.__dict__["_pair"]
+
+    def to_overwrite(self) -> PermissionOverwrite:
+        """New PermissionOverwrite object, copied from the one built once (callers may modify it)."""
+        if "_overwrite" not in self.__dict__:
+            allow, deny = self.pair()
+            self.__dict__["_overwrite"] = PermissionOverwrite.from_pair(Permissions(allow), Permissions(deny))
+        overwrite = PermissionOverwrite()
+        overwrite._values = self.__dict__["_overwrite"]._values.copy()
+        return overwrite
@@ -0,0 +1,76 @@
+from collections import defaultdict
+from typing import Dict, Set, Union
+
+from discord import Guild, Member
+
+from logger import logger
+
+
+class RoleIndex:
+    """Index of the members of a guild by role name.
+
+    Role descriptions are compared to roles by name (see RoleDescription.has_the_role), so the index
+    maps role names to sets of member ids. It must be kept up-to-date with member and role events.
+    """
+    _indexes: Dict[int, 'RoleIndex'] = {}
+
+    def __init__(self, guild: Guild):
+        self._guild = guild
+        self._members_by_role_name: Dict[str, Set[int]] = defaultdict(set)
+        self._role_names_by_member: Dict[int, Set[str]] = {}
+        self._built = False
+
+    @classmethod
+    def get(cls, guild: Guild) -> 'RoleIndex':
+        index = cls._indexes.get(guild.id)
+        if index is None:
+            index = cls._indexes[guild.id] = cls(guild)
+        return index
+
+    @classmethod
+    def remove(cls, guild_ref: Union[int, Guild]):
+        cls._indexes.pop(getattr(guild_ref, "id", guild_ref), None)
+
+    def invalidate(self):
+        """The index will be rebuilt at next use (for instance, when a role is renamed)."""
+        self._built = False
+
+    def build(self):
+        self._members_by_role_name.clear()
+        self._role_names_by_member.clear()
+        for member in self._guild.members:
+            self._add_member(member)
+        self._built = True
+        logger.debug(f"Role index built for guild {self._guild}: {len(self._role_names_by_member)} members")
+
+    def _add_member(self, member: Member):
+        names = {role.name for role in member.roles}
+        self._role_names_by_member[member.id] = names
+        for name in names:
+            self._members_by_role_name[name].add(member.id)
+
+    def remove_member(self, member: Member):
+        for name in self._role_names_by_member.pop(member.id, ()):
+            self._members_by_role_name[name].discard(member.id)
+
+    def update_member(self, member: Member):
+        if not self._built:
+            return  # will be built with up-to-date members
+        self.remove_member(member)
+        self._add_member(member)
+
+    def has_role(self, member: Member, role_name: str) -> bool:
+        """Whether the member has a role named role_name.
+
+        The index describes the current members of the guild: for other Member objects (e.g. the 'before' snapshot
+        of on_member_update, or a member who left the guild), the roles of the object are checked instead.
+        """
+        if member is not self._guild.get_member(member.id):
+            return any(role.name == role_name for role in member.roles)
+        if not self._built:
+            self.build()
+        names = self._role_names_by_member.get(member.id)
+        if names is None:  # member added to the cache after the last event
+            self._add_member(member)
+            names = self._role_names_by_member[member.id]
+        return role_name in names
@@ -7,6 +7,7 @@ from helpers import user_to_member
 from logger import logger
 from models.abstract_models import DiscordObjectDict, SpecifiedDictCollection
 from models.permissions import PermissionDescription
+from models.role_index import RoleIndex
 
 
 class RoleDescription(DiscordObjectDict):
@@ -134,7 +135,7 @@ class RoleDescription(DiscordObjectDict):
                 return self.object_reference == other
         else:  # equality in description name
             if isinstance(other, discord.Member):
-                return self.name in (role.name for role in other.roles)
+                return RoleIndex.get(other.guild).has_role(other, self.name)
             if isinstance(other, discord.Role):
                 return self.name == other.name
         return self.name == other
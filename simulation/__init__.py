@@ -0,0 +1,7 @@
+from simulation.fake_discord import FakeDiscord, FakeHTTPClient, FakeWebsite
+
+__all__ = [
+    'FakeDiscord',
+    'FakeHTTPClient',
+    'FakeWebsite',
+]
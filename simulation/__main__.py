@@ -0,0 +1,48 @@
+# Play a scripted game offline: python -m simulation [OPTIONS]
+import os
+import socket
+import sys
+
+DEFAULT_TEAMS = 3
+DEFAULT_PLAYERS = 4  # per team
+DEFAULT_LATENCY = 0.  # in milliseconds
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if "--help" in args:
+        print("Syntax: python -m simulation [OPTIONS]\n"
+              "Plays the introduction and the end game with the bot, on an in-memory Discord server.\n"
+              "Options:\n"
+              f"  --teams N: number of teams, from 1 to 3 (default: {DEFAULT_TEAMS})\n"
+              f"  --players N: number of players per team (default: {DEFAULT_PLAYERS})\n"
+              f"  --latency MS: delay of each REST call of the bot, in milliseconds (default: {DEFAULT_LATENCY:.0f})\n"
+              "  --verbose: print logs of the bot in the console")
+        exit(0)
+    _teams = int(args[args.index("--teams") + 1]) if "--teams" in args else DEFAULT_TEAMS
+    _players = int(args[args.index("--players") + 1]) if "--players" in args else DEFAULT_PLAYERS
+    _latency = float(args[args.index("--latency") + 1]) if "--latency" in args else DEFAULT_LATENCY
+    _port = _free_port()
+
+    # Environment of the bot, set before constants are loaded (variables of .env do not override them)
+    os.environ["WEBSITE"] = f"http://127.0.0.1:{_port}"
+    os.environ["GAME_LANGUAGE"] = '["fr", "simulation"]'  # the simulation version adds the channels of the game
+    os.environ["VERBOSE"] = "20"  # the control panel is required
+    os.environ.setdefault("CLIENT_ID", "0")
+    os.environ.setdefault("TOKEN_SITE", "token")
+
+    from logger import change_logger_level
+    if "--verbose" not in args:
+        change_logger_level("warning")
+    from constants import BOT
+    from simulation.scenario import Scenario
+
+    _scenario = Scenario(_teams, _players, latency=_latency / 1000)
+    BOT.loop.run_until_complete(_scenario.run(_port))
+    print(_scenario.report())
@@ -0,0 +1,578 @@
+"""In-memory Discord server to run the bot offline.
+
+Real discord.py objects (Guild, TextChannel, Member, Message, Reaction...) are built by the ConnectionState of the
+client from JSON payloads, as with a real gateway:
+- REST calls of the bot go through FakeHTTPClient: they are recorded, applied to the server data and answered.
+  The gateway events that Discord would send for them (MESSAGE_CREATE, GUILD_MEMBER_UPDATE...) are parsed at once.
+- Users of the simulation (players, game masters) act with FakeDiscord methods (send_message, add_reaction...),
+  which parse the corresponding gateway events. Event handlers scheduled by the client are tracked.
+"""
+import asyncio
+import copy
+import datetime
+import re
+from collections import Counter, OrderedDict
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Any
+from urllib.parse import unquote
+
+import discord
+from aiohttp import web
+from discord import Client, ClientUser
+from discord.http import HTTPClient, Route
+
+EVERYONE_PERMISSIONS = 104324673  # default permissions of @everyone in a new guild
+
+
+def _now() -> str:
+    return datetime.datetime.utcnow().isoformat()
+
+
+def _emoji_payload(emoji: str) -> Dict[str, Any]:
+    """Emoji of a route (e.g. '🔴' or 'name:id') as a gateway payload"""
+    name, _, emoji_id = emoji.partition(":")
+    return {"id": emoji_id or None, "name": name}
+
+
+def _not_found(message: str):
+    return discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), {"code": 0, "message": message})
+
+
+class FakeHTTPClient(HTTPClient):
+    """HTTP client of discord.py answering requests with a FakeDiscord server, after an optional latency."""
+
+    def __init__(self, server: 'FakeDiscord', latency=0., loop=None):
+        super().__init__(loop=loop)
+        self._server = server
+        self.latency = latency  # in seconds, delay of each request (Discord API round trip)
+
+    async def request(self, route: Route, *, files=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self._server.handle_request(route, files=files, **kwargs)
+
+    def send_files(self, channel_id, *, files, content=None, tts=False, embed=None, nonce=None,
+                   allowed_mentions=None):
+        payload = {"content": content, "tts": tts, "embed": embed, "nonce": nonce}
+        return self.request(Route("POST", "/channels/{channel_id}/messages", channel_id=channel_id),
+                            json=payload, files=files)
+
+    async def get_from_cdn(self, url):
+        return b""
+
+
+class FakeDiscord:
+    """Discord server with a single guild. Call attach(client) before dispatching events to the client."""
+
+    def __init__(self, guild_name="Simulation", owner_name="Owner"):
+        self._last_id = 0
+        self._client: Optional[Client] = None
+        self._capture: Optional[List[asyncio.Task]] = None
+        self._tasks = set()  # event handlers scheduled by the client and not done yet
+        self._routes = [(method, re.compile("^" + re.sub(r"{(\w+)}", r"(?P<\1>[^/]+)", path) + "$"), path, handler)
+                        for (method, path), handler in self._handlers().items()]
+        self.requests = Counter()  # REST calls {"METHOD path": count}
+        self.unhandled = Counter()  # REST calls not supported by the server (answered with an empty payload)
+        self.errors = Counter()  # errors raised in event handlers of the client {event name: count}
+        self.events = 0  # gateway events parsed
+        self.users: Dict[int, dict] = {}
+        self.members: Dict[int, dict] = {}  # {user id: member payload without 'user'}
+        self.roles: Dict[int, dict] = {}
+        self.channels: Dict[int, dict] = {}  # guild and DM channels
+        self.messages: Dict[int, dict] = {}
+        self.channel_messages: Dict[int, List[int]] = {}  # {channel id: message ids (oldest first)}
+        self.reactions: Dict[int, Dict[str, List[int]]] = {}  # {message id: {emoji: user ids}}
+        self.guild_id = self.new_id()
+        self.guild = {"id": str(self.guild_id), "name": guild_name, "region": "europe", "afk_timeout": 300,
+                      "verification_level": 0, "default_message_notifications": 0, "explicit_content_filter": 0,
+                      "features": [], "emojis": [], "mfa_level": 0, "premium_tier": 0}
+        self.roles[self.guild_id] = {"id": str(self.guild_id), "name": "@everyone", "position": 0, "color": 0,
+                                     "hoist": False, "managed": False, "mentionable": False,
+                                     "permissions": EVERYONE_PERMISSIONS}
+        self.owner_id = self.new_user(owner_name, member=True)
+        self.bot_id = self.new_user("Bot", bot=True, member=True)
+        bot_role_id = self.new_id()  # role of the bot integration, with administrator permission
+        self.roles[bot_role_id] = {"id": str(bot_role_id), "name": "Bot", "position": 1, "color": 0, "hoist": False,
+                                   "managed": True, "mentionable": False, "permissions": 8}
+        self.members[self.bot_id]["roles"].append(str(bot_role_id))
+        self.guild["owner_id"] = str(self.owner_id)
+
+    def new_id(self) -> int:
+        """New snowflake, increasing and consistent with the current time (as required by bulk deletion)"""
+        self._last_id = max(discord.utils.time_snowflake(datetime.datetime.utcnow()), self._last_id + 1)
+        return self._last_id
+
+    # Payloads
+    def new_user(self, name: str, bot=False, member=False) -> int:
+        """Create a user, member of the guild if member is True, without dispatching any event. Returns its id."""
+        user_id = self.new_id()
+        self.users[user_id] = {"id": str(user_id), "username": name, "discriminator": f"{len(self.users):04d}",
+                               "avatar": None, "bot": bot}
+        if member:
+            self._add_member(user_id)
+        return user_id
+
+    def member_payload(self, user_id: int, with_guild=False) -> dict:
+        payload = dict(self.members[user_id], user=self.users[user_id])
+        if with_guild:
+            payload["guild_id"] = str(self.guild_id)
+        return payload
+
+    def guild_payload(self, full=False) -> dict:
+        payload = dict(self.guild, roles=list(self.roles.values()))
+        if full:
+            payload.update(member_count=len(self.members),
+                           members=[self.member_payload(user_id) for user_id in self.members],
+                           channels=[channel for channel in self.channels.values() if channel["type"] != 1])
+        return payload
+
+    def message_payload(self, message_id: int) -> dict:
+        message = dict(self.messages[message_id])
+        reactions = self.reactions.get(message_id, {})
+        message["reactions"] = [{"emoji": _emoji_payload(emoji), "count": len(user_ids),
+                                 "me": self.bot_id in user_ids} for emoji, user_ids in reactions.items() if user_ids]
+        return message
+
+    def channel_id(self, name: str) -> int:
+        for channel in self.channels.values():
+            if channel.get("name") == name:
+                return int(channel["id"])
+        raise KeyError(name)
+
+    def last_message(self, channel_id: int, author_id: int = None) -> Optional[dict]:
+        for message_id in reversed(self.channel_messages.get(channel_id, [])):
+            if author_id is None or int(self.messages[message_id]["author"]["id"]) == author_id:
+                return self.message_payload(message_id)
+        return None
+
+    def emojis(self, message_id: int) -> List[str]:
+        """Emojis of the reactions to a message, in order of addition"""
+        return [emoji for emoji, user_ids in self.reactions.get(message_id, {}).items() if user_ids]
+
+    # Client
+    def attach(self, client: Client, latency=0.):
+        """Make the client use this server as its HTTP API and its guild as its only guild."""
+        state = client._connection
+        client.http = state.http = FakeHTTPClient(self, latency=latency, loop=client.loop)
+        state.user = ClientUser(state=state, data=self.users[self.bot_id])
+        state._add_guild_from_data(copy.deepcopy(self.guild_payload(full=True)))
+        schedule_event, on_error = client._schedule_event, client.on_error
+
+        def track_event(*args, **kwargs):
+            task = schedule_event(*args, **kwargs)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            if self._capture is not None:
+                self._capture.append(task)
+            return task
+
+        async def count_error(event_method, *args, **kwargs):
+            self.errors[event_method] += 1
+            await on_error(event_method, *args, **kwargs)
+
+        client._schedule_event = track_event
+        client.on_error = count_error
+        self._client = client
+
+    def dispatch(self, event_type: str, data: dict) -> List[asyncio.Task]:
+        """Parse a gateway event. Returns the event handlers scheduled for it."""
+        self.events += 1
+        self._capture = tasks = []
+        try:
+            self._client._connection.parsers[event_type](copy.deepcopy(data))  # payloads are modified by parsers
+        finally:
+            self._capture = None
+        return tasks
+
+    async def wait_idle(self):
+        """Wait until all the event handlers scheduled by the client are done, including those of bot events."""
+        while self._tasks:
+            await asyncio.wait(set(self._tasks))
+            await asyncio.sleep(0)
+
+    def connect(self) -> List[asyncio.Task]:
+        """The client connects to the gateway and its guild is available"""
+        self._client._ready.set()
+        self._capture = tasks = []
+        try:
+            self._client.dispatch("connect")
+            self._client.dispatch("ready")
+        finally:
+            self._capture = None
+        return tasks
+
+    # Actions of users (gateway events)
+    def join(self, user_id: int) -> List[asyncio.Task]:
+        """A user (see new_user) joins the guild"""
+        self._add_member(user_id)
+        return self.dispatch("GUILD_MEMBER_ADD", self.member_payload(user_id, with_guild=True))
+
+    def send_message(self, user_id: int, channel_id: int, content: str) -> List[asyncio.Task]:
+        return self.dispatch("MESSAGE_CREATE", self._create_message(user_id, channel_id, {"content": content}))
+
+    def add_reaction(self, user_id: int, message_id: int, emoji: str) -> List[asyncio.Task]:
+        return self._add_reaction(user_id, message_id, emoji)
+
+    def remove_reaction(self, user_id: int, message_id: int, emoji: str) -> List[asyncio.Task]:
+        return self._remove_reaction(user_id, message_id, emoji)
+
+    def add_role(self, user_id: int, role_id: int) -> List[asyncio.Task]:
+        """Give a role to a member, as an administrator would do in Discord"""
+        return self._update_member(user_id, roles=self.members[user_id]["roles"] + [str(role_id)])
+
+    # Server data updates
+    def _add_member(self, user_id: int):
+        self.members[user_id] = {"roles": [], "nick": None, "joined_at": _now(), "deaf": False, "mute": False}
+
+    def _create_message(self, author_id: int, channel_id: int, body: dict, files=None) -> dict:
+        if channel_id not in self.channels:
+            raise _not_found("Unknown Channel")
+        message_id = self.new_id()
+        embed = body.get("embed")
+        message = {"id": str(message_id), "channel_id": str(channel_id), "author": self.users[author_id],
+                   "content": body.get("content") or "", "timestamp": _now(), "edited_timestamp": None,
+                   "tts": bool(body.get("tts")), "mention_everyone": False, "mentions": [], "mention_roles": [],
+                   "embeds": [embed] if embed else [], "pinned": False, "type": 0,
+                   "attachments": [{"id": str(self.new_id()), "filename": file.filename, "size": 0,
+                                    "url": f"https://cdn.discordapp.com/attachments/{channel_id}/{file.filename}",
+                                    "proxy_url": "", "height": None, "width": None} for file in files or []]}
+        if self.channels[channel_id]["type"] != 1:
+            message.update(guild_id=str(self.guild_id), member=self.members[author_id])
+        self.messages[message_id] = message
+        self.channel_messages.setdefault(channel_id, []).append(message_id)
+        return message
+
+    def _get_message(self, channel_id, message_id) -> dict:
+        message = self.messages.get(int(message_id))
+        if message is None or int(message["channel_id"]) != int(channel_id):
+            raise _not_found("Unknown Message")
+        return message
+
+    def _delete_messages(self, channel_id: int, message_ids: List[int]):
+        for message_id in message_ids:
+            self.messages.pop(message_id, None)
+            self.reactions.pop(message_id, None)
+            if message_id in self.channel_messages.get(channel_id, []):
+                self.channel_messages[channel_id].remove(message_id)
+
+    @staticmethod
+    def _with_guild(message: dict, data: dict) -> dict:
+        if "guild_id" in message:  # not in DM channels
+            data["guild_id"] = message["guild_id"]
+        return data
+
+    def _reaction_event(self, user_id: int, message_id: int, emoji: str) -> dict:
+        message = self.messages[message_id]
+        data = {"user_id": str(user_id), "channel_id": message["channel_id"], "message_id": str(message_id),
+                "emoji": _emoji_payload(emoji)}
+        if "guild_id" in message:
+            data.update(guild_id=message["guild_id"], member=self.member_payload(user_id))
+        return data
+
+    def _add_reaction(self, user_id: int, message_id: int, emoji: str) -> List[asyncio.Task]:
+        user_ids = self.reactions.setdefault(message_id, OrderedDict()).setdefault(emoji, [])
+        if user_id in user_ids:
+            return []
+        user_ids.append(user_id)
+        return self.dispatch("MESSAGE_REACTION_ADD", self._reaction_event(user_id, message_id, emoji))
+
+    def _remove_reaction(self, user_id: int, message_id: int, emoji: str) -> List[asyncio.Task]:
+        user_ids = self.reactions.get(message_id, {}).get(emoji, [])
+        if user_id not in user_ids:
+            return []
+        user_ids.remove(user_id)
+        data = self._reaction_event(user_id, message_id, emoji)
+        data.pop("member", None)
+        return self.dispatch("MESSAGE_REACTION_REMOVE", data)
+
+    def _update_member(self, user_id: int, **values) -> List[asyncio.Task]:
+        member = self.members[user_id]
+        for key in ("roles", "nick", "mute", "deaf"):
+            if key in values:
+                member[key] = [str(role_id) for role_id in values[key]] if key == "roles" else values[key]
+        return self.dispatch("GUILD_MEMBER_UPDATE", self.member_payload(user_id, with_guild=True))
+
+    def _update_channel(self, channel_id: int, values: dict):
+        channel = self.channels[channel_id]
+        for key, value in values.items():
+            if key in ("name", "topic", "position", "nsfw", "rate_limit_per_user", "bitrate", "user_limit",
+                       "permission_overwrites", "parent_id", "type"):
+                channel[key] = value
+        self.dispatch("CHANNEL_UPDATE", channel)
+
+    def _update_role(self, role_id: int, values: dict):
+        role = self.roles[role_id]
+        role.update({key: value for key, value in values.items() if key in role})
+        self.dispatch("GUILD_ROLE_UPDATE", {"guild_id": str(self.guild_id), "role": role})
+
+    # REST API
+    def _handlers(self):
+        return {
+            ("GET", "/channels/{channel_id}/messages"): self._rest_history,
+            ("POST", "/channels/{channel_id}/messages"): self._rest_create_message,
+            ("GET", "/channels/{channel_id}/messages/{message_id}"): self._rest_get_message,
+            ("PATCH", "/channels/{channel_id}/messages/{message_id}"): self._rest_edit_message,
+            ("DELETE", "/channels/{channel_id}/messages/{message_id}"): self._rest_delete_message,
+            ("POST", "/channels/{channel_id}/messages/bulk_delete"): self._rest_bulk_delete,
+            ("PUT", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me"): self._rest_react,
+            ("DELETE", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me"): self._rest_unreact,
+            ("DELETE", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/{member_id}"):
+                self._rest_unreact,
+            ("GET", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}"): self._rest_reaction_users,
+            ("DELETE", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}"): self._rest_clear_emoji,
+            ("DELETE", "/channels/{channel_id}/messages/{message_id}/reactions"): self._rest_clear_reactions,
+            ("POST", "/channels/{channel_id}/typing"): lambda **_: None,
+            ("POST", "/guilds/{guild_id}/channels"): self._rest_create_channel,
+            ("PATCH", "/guilds/{guild_id}/channels"): self._rest_move_channels,
+            ("PATCH", "/channels/{channel_id}"): self._rest_edit_channel,
+            ("DELETE", "/channels/{channel_id}"): self._rest_delete_channel,
+            ("PUT", "/channels/{channel_id}/permissions/{target}"): self._rest_edit_permissions,
+            ("DELETE", "/channels/{channel_id}/permissions/{target}"): self._rest_delete_permissions,
+            ("POST", "/guilds/{guild_id}/roles"): self._rest_create_role,
+            ("PATCH", "/guilds/{guild_id}/roles"): self._rest_move_roles,
+            ("PATCH", "/guilds/{guild_id}/roles/{role_id}"): self._rest_edit_role,
+            ("DELETE", "/guilds/{guild_id}/roles/{role_id}"): self._rest_delete_role,
+            ("PUT", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}"): self._rest_add_role,
+            ("DELETE", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}"): self._rest_remove_role,
+            ("PATCH", "/guilds/{guild_id}/members/{user_id}"): self._rest_edit_member,
+            ("PATCH", "/guilds/{guild_id}"): self._rest_edit_guild,
+            ("PATCH", "/users/@me"): self._rest_edit_profile,
+            ("POST", "/users/@me/channels"): self._rest_create_dm,
+            ("GET", "/guilds/{guild_id}/webhooks"): lambda **_: [],
+            ("GET", "/channels/{channel_id}/webhooks"): lambda **_: [],
+            ("POST", "/channels/{channel_id}/webhooks"): self._rest_create_webhook,
+            ("POST", "/channels/{channel_id}/invites"): self._rest_create_invite,
+            ("GET", "/guilds/{guild_id}/invites"): lambda **_: [],
+        }
+
+    def handle_request(self, route: Route, *, json=None, params=None, files=None, **_kwargs):
+        """Apply a REST call to the server and return its JSON answer. Raises HTTP errors as discord.py does."""
+        path = route.url[len(Route.BASE):]
+        for method, pattern, template, handler in self._routes:
+            match = pattern.match(path) if method == route.method else None
+            if match:
+                self.requests[f"{method} {template}"] += 1
+                kwargs = {key: unquote(value) if key == "emoji" else value for key, value in match.groupdict().items()}
+                return copy.deepcopy(handler(json=json or {}, params=params or {}, files=files, **kwargs))
+        self.requests[f"{route.method} {route.path}"] += 1
+        self.unhandled[f"{route.method} {route.path}"] += 1
+        return {}
+
+    # Messages
+    def _rest_history(self, channel_id, params, **_):
+        message_ids = self.channel_messages.get(int(channel_id), [])
+        limit = int(params.get("limit", 50))
+        if params.get("after"):
+            message_ids = [m_id for m_id in message_ids if m_id > int(params["after"])][:limit]
+        else:
+            if params.get("before"):
+                message_ids = [m_id for m_id in message_ids if m_id < int(params["before"])]
+            message_ids = message_ids[-limit:]
+        return [self.message_payload(message_id) for message_id in reversed(message_ids)]
+
+    def _rest_create_message(self, channel_id, json, files, **_):
+        message = self._create_message(self.bot_id, int(channel_id), json, files)
+        self.dispatch("MESSAGE_CREATE", message)
+        return self.message_payload(int(message["id"]))
+
+    def _rest_get_message(self, channel_id, message_id, **_):
+        return self.message_payload(int(self._get_message(channel_id, message_id)["id"]))
+
+    def _rest_edit_message(self, channel_id, message_id, json, **_):
+        message = self._get_message(channel_id, message_id)
+        if "content" in json:
+            message["content"] = json["content"] or ""
+        if "embed" in json:
+            message["embeds"] = [json["embed"]] if json["embed"] else []
+        message["edited_timestamp"] = _now()
+        self.dispatch("MESSAGE_UPDATE", dict(message))
+        return self.message_payload(int(message_id))
+
+    def _rest_delete_message(self, channel_id, message_id, **_):
+        message = self._get_message(channel_id, message_id)
+        self._delete_messages(int(channel_id), [int(message_id)])
+        self.dispatch("MESSAGE_DELETE", self._with_guild(message, {"id": message_id, "channel_id": channel_id}))
+
+    def _rest_bulk_delete(self, channel_id, json, **_):
+        message_ids = [int(message_id) for message_id in json.get("messages", [])]
+        self._delete_messages(int(channel_id), message_ids)
+        self.dispatch("MESSAGE_DELETE_BULK", {"ids": [str(message_id) for message_id in message_ids],
+                                              "channel_id": channel_id, "guild_id": str(self.guild_id)})
+
+    # Reactions
+    def _rest_react(self, channel_id, message_id, emoji, **_):
+        self._get_message(channel_id, message_id)
+        self._add_reaction(self.bot_id, int(message_id), emoji)
+
+    def _rest_unreact(self, channel_id, message_id, emoji, member_id=None, **_):
+        self._get_message(channel_id, message_id)
+        self._remove_reaction(int(member_id) if member_id else self.bot_id, int(message_id), emoji)
+
+    def _rest_reaction_users(self, channel_id, message_id, emoji, params, **_):
+        self._get_message(channel_id, message_id)
+        user_ids = sorted(self.reactions.get(int(message_id), {}).get(emoji, []))
+        if params.get("after"):
+            user_ids = [user_id for user_id in user_ids if user_id > int(params["after"])]
+        return [self.users[user_id] for user_id in user_ids[:int(params.get("limit", 25))]]
+
+    def _rest_clear_emoji(self, channel_id, message_id, emoji, **_):
+        message = self._get_message(channel_id, message_id)
+        if self.reactions.get(int(message_id), {}).pop(emoji, None):
+            self.dispatch("MESSAGE_REACTION_REMOVE_EMOJI", self._with_guild(
+                message, {"channel_id": channel_id, "message_id": message_id, "emoji": _emoji_payload(emoji)}))
+
+    def _rest_clear_reactions(self, channel_id, message_id, **_):
+        message = self._get_message(channel_id, message_id)
+        self.reactions.pop(int(message_id), None)
+        self.dispatch("MESSAGE_REACTION_REMOVE_ALL", self._with_guild(
+            message, {"channel_id": channel_id, "message_id": message_id}))
+
+    # Channels
+    def _rest_create_channel(self, json, **_):
+        channel_id = self.new_id()
+        channel = {"id": str(channel_id), "guild_id": str(self.guild_id), "type": json.get("type", 0),
+                   "name": json.get("name", "channel"), "position": json.get("position") or len(self.channels),
+                   "permission_overwrites": json.get("permission_overwrites", []), "parent_id": json.get("parent_id"),
+                   "topic": json.get("topic"), "nsfw": json.get("nsfw", False),
+                   "rate_limit_per_user": json.get("rate_limit_per_user", 0), "bitrate": json.get("bitrate", 64000),
+                   "user_limit": json.get("user_limit", 0), "last_message_id": None}
+        self.channels[channel_id] = channel
+        self.dispatch("CHANNEL_CREATE", channel)
+        return channel
+
+    def _rest_move_channels(self, json, **_):
+        for values in json:
+            self._update_channel(int(values["id"]), values)
+
+    def _rest_edit_channel(self, channel_id, json, **_):
+        if int(channel_id) not in self.channels:
+            raise _not_found("Unknown Channel")
+        self._update_channel(int(channel_id), json)
+        return self.channels[int(channel_id)]
+
+    def _rest_delete_channel(self, channel_id, **_):
+        channel = self.channels.pop(int(channel_id), None)
+        if channel is None:
+            raise _not_found("Unknown Channel")
+        self._delete_messages(int(channel_id), list(self.channel_messages.pop(int(channel_id), [])))
+        self.dispatch("CHANNEL_DELETE", channel)
+        return channel
+
+    def _rest_edit_permissions(self, channel_id, target, json, **_):
+        overwrites = [overwrite for overwrite in self.channels[int(channel_id)]["permission_overwrites"]
+                      if overwrite["id"] != target]
+        self._update_channel(int(channel_id), {"permission_overwrites": overwrites + [dict(json, id=target)]})
+
+    def _rest_delete_permissions(self, channel_id, target, **_):
+        overwrites = [overwrite for overwrite in self.channels[int(channel_id)]["permission_overwrites"]
+                      if overwrite["id"] != target]
+        self._update_channel(int(channel_id), {"permission_overwrites": overwrites})
+
+    # Roles
+    def _rest_create_role(self, json, **_):
+        for role in self.roles.values():  # a new role is created just above @everyone
+            if role["position"] > 0:
+                role["position"] += 1
+        role_id = self.new_id()
+        role = {"id": str(role_id), "name": json.get("name", "new role"), "position": 1,
+                "permissions": int(json.get("permissions", 0)), "color": json.get("color", 0),
+                "hoist": json.get("hoist", False), "mentionable": json.get("mentionable", False), "managed": False}
+        self.roles[role_id] = role
+        self.dispatch("GUILD_ROLE_CREATE", {"guild_id": str(self.guild_id), "role": role})
+        return role
+
+    def _rest_move_roles(self, json, **_):
+        for values in json:
+            self._update_role(int(values["id"]), {"position": values["position"]})
+        return list(self.roles.values())
+
+    def _rest_edit_role(self, role_id, json, **_):
+        if int(role_id) not in self.roles:
+            raise _not_found("Unknown Role")
+        self._update_role(int(role_id), json)
+        return self.roles[int(role_id)]
+
+    def _rest_delete_role(self, role_id, **_):
+        if self.roles.pop(int(role_id), None) is None:
+            raise _not_found("Unknown Role")
+        for member in self.members.values():
+            if role_id in member["roles"]:
+                member["roles"].remove(role_id)
+        self.dispatch("GUILD_ROLE_DELETE", {"guild_id": str(self.guild_id), "role_id": role_id})
+
+    # Members, guild and bot user
+    def _rest_add_role(self, user_id, role_id, **_):
+        if role_id not in self.members[int(user_id)]["roles"]:
+            self._update_member(int(user_id), roles=self.members[int(user_id)]["roles"] + [role_id])
+
+    def _rest_remove_role(self, user_id, role_id, **_):
+        roles = self.members[int(user_id)]["roles"]
+        if role_id in roles:
+            self._update_member(int(user_id), roles=[_role_id for _role_id in roles if _role_id != role_id])
+
+    def _rest_edit_member(self, user_id, json, **_):
+        self._update_member(int(user_id), **json)
+
+    def _rest_edit_guild(self, json, **_):
+        self.guild.update({key: value for key, value in json.items() if key in ("name", "region", "icon")})
+        self.dispatch("GUILD_UPDATE", self.guild_payload())
+        return self.guild_payload()
+
+    def _rest_edit_profile(self, json, **_):
+        bot_user = self.users[self.bot_id]
+        bot_user.update(username=json.get("username", bot_user["username"]))
+        return bot_user
+
+    def _rest_create_dm(self, json, **_):
+        recipient_id = int(json["recipient_id"])
+        for channel in self.channels.values():
+            if channel["type"] == 1 and int(channel["recipients"][0]["id"]) == recipient_id:
+                return channel
+        channel_id = self.new_id()
+        self.channels[channel_id] = {"id": str(channel_id), "type": 1, "last_message_id": None,
+                                     "recipients": [self.users[recipient_id]]}
+        return self.channels[channel_id]
+
+    def _rest_create_webhook(self, channel_id, json, **_):
+        return {"id": str(self.new_id()), "type": 1, "guild_id": str(self.guild_id), "channel_id": channel_id,
+                "name": json.get("name"), "avatar": None, "token": "token", "user": self.users[self.bot_id]}
+
+    def _rest_create_invite(self, channel_id, json, **_):
+        return {"code": f"sim{self.new_id() % 100000}", "guild": self.guild_payload(), "max_age": json.get("max_age"),
+                "max_uses": json.get("max_uses"), "temporary": False, "uses": 0, "created_at": _now(),
+                "channel": {"id": channel_id, "name": self.channels[int(channel_id)]["name"], "type": 0},
+                "inviter": self.users[self.bot_id]}
+
+
+class FakeWebsite:
+    """Website of the bot (see flask_server), answering API requests of the bot and recording them."""
+
+    def __init__(self):
+        self.requests = Counter()  # {"METHOD path": count}
+        self.available = None
+        self.game_link = ""
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _api(self, request: web.Request):
+        self.requests[f"{request.method} {request.path}"] += 1
+        body = await request.json() if request.can_read_body else {}
+        if request.path == "/api/availability":
+            if request.method != "GET":
+                self.available = request.method == "POST"
+            return web.json_response({"ok": True, "available": self.available})
+        if request.path == "/api/invite":
+            if request.method != "GET":
+                self.game_link = body.get("link", "") if request.method == "POST" else ""
+            return web.json_response({"ok": True, "link": self.game_link})
+        return web.json_response({"ok": True})
+
+    async def start(self, port: int):
+        app = web.Application()
+        app.router.add_route("*", "/api/{name}", self._api)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", port).start()
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
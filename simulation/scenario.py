@@ -0,0 +1,214 @@
+"""Scripted game played offline on a FakeDiscord server, from the introduction to the end game.
+
+The bot runs its real event handlers (bot.py), GuildManager and listeners. The game master uses the control panel
+and the game board as in Discord; players join the guild, talk and react concurrently.
+For each phase, the report gives the throughput of player actions, the latency of their handlers (time until
+all handlers of the gateway event are done, including REST calls) and the REST calls of the bot.
+"""
+import asyncio
+import time
+from collections import Counter
+from typing import Callable, List, Optional, Tuple, Type
+
+import bot
+from bot_management import GuildManager
+from bot_management.listener_manager import ControlBoardEnum, ListenerActions
+from constants import BOT, MAX_GUILDS, MAX_PENDING_GUILDS
+from default_collections import ChannelCollection, RoleCollection
+from game_models import AbstractListener
+from helpers.http_client import close_session
+from helpers.interactive_messages import InteractiveMessageCache
+from minigames.end_game import EndGame, MESSAGES as END_GAME_MESSAGES
+from minigames.introduction_game import IntroductionGame, MESSAGES as INTRO_MESSAGES
+from simulation.fake_discord import FakeDiscord, FakeWebsite
+
+MAX_TEAMS = 3  # number of team emojis of the introduction
+
+
+class PhaseReport:
+    def __init__(self, name: str, server: FakeDiscord, website: FakeWebsite):
+        self.name = name
+        self.latencies: List[float] = []
+        self.duration = 0.
+        self._start = time.perf_counter()
+        self._server, self._website = server, website
+        self._rest, self._website_requests = Counter(server.requests), Counter(website.requests)
+        self._events, self._errors = server.events, sum(server.errors.values())
+        self.rest, self.website_requests = Counter(), Counter()
+        self.events = self.errors = 0
+        self.game_won: Optional[bool] = None  # for phases playing a mini-game: whether it ended with a victory
+
+    def end(self):
+        self.duration = time.perf_counter() - self._start
+        self.rest = self._server.requests - self._rest
+        self.website_requests = self._website.requests - self._website_requests
+        self.events = self._server.events - self._events
+        self.errors = sum(self._server.errors.values()) - self._errors
+
+    def quantile(self, q: float) -> float:
+        latencies = sorted(self.latencies)
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)] if latencies else 0.
+
+    def to_row(self) -> str:
+        return (f"{self.name:<14}{len(self.latencies):>8}{self.duration:>10.2f}"
+                f"{len(self.latencies) / self.duration if self.duration else 0:>10.1f}"
+                f"{1000 * self.quantile(0.5):>10.1f}{1000 * self.quantile(0.99):>10.1f}"
+                f"{self.events:>8}{sum(self.rest.values()):>7}{sum(self.website_requests.values()):>9}"
+                f"{self.errors:>8}{'-' if self.game_won is None else 'yes' if self.game_won else 'no':>6}")
+
+
+HEADER = (f"{'Phase':<14}{'Actions':>8}{'Time (s)':>10}{'Actions/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}"
+          f"{'Events':>8}{'REST':>7}{'Website':>9}{'Errors':>8}{'Won':>6}")
+
+
+class Scenario:
+    def __init__(self, nb_teams=MAX_TEAMS, nb_players=4, latency=0.):
+        """nb_players is the number of players per team, latency the delay (in seconds) of each REST call."""
+        self.nb_teams = max(1, min(nb_teams, MAX_TEAMS))
+        self.nb_players = max(1, nb_players)
+        self.latency = latency
+        self.server = FakeDiscord()
+        self.website = FakeWebsite()
+        self.reports: List[PhaseReport] = []
+        self.players: List[int] = []
+
+    # Helpers
+    def _start_phase(self, name: str) -> PhaseReport:
+        report = PhaseReport(name, self.server, self.website)
+        self.reports.append(report)
+        return report
+
+    async def _end_phase(self, report: PhaseReport):
+        await self.server.wait_idle()
+        report.end()
+
+    async def _act(self, report: PhaseReport, action: Callable[[], List[asyncio.Task]]):
+        """Dispatch the gateway event of an action and wait for its handlers"""
+        start = time.perf_counter()
+        tasks = action()
+        if tasks:
+            await asyncio.wait(tasks)
+        report.latencies.append(time.perf_counter() - start)
+
+    async def _all_act(self, report: PhaseReport, actions: List[Callable[[], List[asyncio.Task]]]):
+        await asyncio.gather(*(self._act(report, action) for action in actions))
+        await self.server.wait_idle()
+
+    def _listener_manager(self):
+        return GuildManager().get_guild(self.server.guild_id).listener_manager
+
+    def _control_panel(self) -> int:
+        return max(self._listener_manager().control_boards)  # the last one
+
+    def _game_menu(self, listener_class: Type[AbstractListener]) -> Tuple[int, AbstractListener]:
+        """Last menu of the game board showing a listener of this class"""
+        menus = self._listener_manager().listener_menus
+        return max((message_id, listener) for message_id, listener in menus.items()
+                   if isinstance(listener, listener_class))
+
+    def _player(self, index: int) -> int:
+        return self.players[index % len(self.players)]
+
+    # Phases
+    async def startup(self):
+        """The bot connects: its guild is initialized and the control panel is shown"""
+        GuildManager().set_bot(BOT, bot.init_guild, max_guilds=MAX_GUILDS, max_pending_guilds=MAX_PENDING_GUILDS)
+        bot.BOT_INITIALIZED = False
+        bot.BOT_STAYING_AWAKE = True  # no keep-awake loop
+        bot.DISABLED_INTENTS = []
+        InteractiveMessageCache().install(BOT)
+        self.server.attach(BOT, latency=self.latency)
+        report = self._start_phase("startup")
+        await self._act(report, self.server.connect)
+        await self._end_phase(report)
+
+    async def setup(self):
+        """The game master updates the guild (roles and channels), takes the master role and opens the game board"""
+        report = self._start_phase("setup")
+        master = self.server.owner_id
+        await self._act(report, lambda: self.server.add_reaction(master, self._control_panel(),
+                                                                 ControlBoardEnum.update.emoji))
+        await self.server.wait_idle()
+        await self._act(report, lambda: self.server.add_role(master, RoleCollection.MASTER.object_reference.id))
+        control_panel = self._control_panel()  # a new control panel is shown if the board channel changed
+        await self._act(report, lambda: self.server.add_reaction(master, control_panel,
+                                                                 ControlBoardEnum.danger.emoji))
+        await self._act(report, lambda: self.server.add_reaction(master, control_panel, ControlBoardEnum.board.emoji))
+        await self._end_phase(report)
+
+    async def introduction(self):
+        """Players join and go through the introduction: rules, player role and teams"""
+        report = self._start_phase("introduction")
+        server, master = self.server, self.server.owner_id
+        welcome = ChannelCollection.WELCOME.object_reference.id
+        memo = ChannelCollection.MEMO.object_reference.id
+        menu, game = self._game_menu(IntroductionGame)
+        await self._act(report, lambda: server.add_reaction(master, menu, ListenerActions.play))
+        await server.wait_idle()
+        started = game.active
+        self.players = [server.new_user(f"Player {i + 1}") for i in range(self.nb_teams * self.nb_players)]
+        await self._all_act(report, [lambda player=player: server.join(player) for player in self.players])
+        await self._act(report, lambda: server.send_message(master, memo, f"!teams {self.nb_teams} {self.nb_players}"))
+        await self._act(report, lambda: server.send_message(master, welcome, INTRO_MESSAGES["EMOJI_1"]))
+        await self._act(report, lambda: server.send_message(
+            self._player(0), welcome, f"Is it {INTRO_MESSAGES['TRIGGERS_2'][0]}?"))
+        for i in (1, 2):  # two messages of players show the rules
+            await self._act(report, lambda: server.send_message(self._player(i), welcome, "Hello!"))
+        await server.wait_idle()
+        rules = int(server.last_message(welcome, server.bot_id)["id"])
+        await self._all_act(report, [lambda player=player: server.add_reaction(player, rules,
+                                                                               INTRO_MESSAGES["EMOJI_RULES"])
+                                     for player in self.players])
+        await self._act(report, lambda: server.send_message(self._player(0), welcome, "Signed!"))
+        await server.wait_idle()
+        teams = int(server.last_message(welcome, server.bot_id)["id"])
+        team_emojis = server.emojis(teams)[:self.nb_teams]
+        await self._all_act(report, [lambda i=i, player=player: server.add_reaction(
+            player, teams, team_emojis[i % len(team_emojis)]) for i, player in enumerate(self.players)])
+        await self._act(report, lambda: server.send_message(self._player(0), welcome, "Teams are ready!"))
+        await self._end_phase(report)
+        report.game_won = started and not game.active  # the game stops on victory
+
+    async def conclusion(self):
+        """Players talk in the main room, find the three emojis, then open the restricted room with the key"""
+        report = self._start_phase("conclusion")
+        server, master = self.server, self.server.owner_id
+        main_room = ChannelCollection.MAIN_ROOM.object_reference.id
+        menu, game = self._game_menu(EndGame)
+        await self._act(report, lambda: server.add_reaction(master, menu, ListenerActions.play))
+        await server.wait_idle()
+        started = game.active
+        await self._all_act(report, [lambda player=player: server.send_message(player, main_room, "Any idea?")
+                                     for player in self.players])
+        await self._all_act(report, [lambda i=i, emoji=emoji: server.send_message(self._player(i), main_room, emoji)
+                                     for i, emoji in enumerate(END_GAME_MESSAGES["VALID_EMOJIS"])])
+        await self._act(report, lambda: server.send_message(self._player(0), main_room,
+                                                            END_GAME_MESSAGES["KEY_EMOJI"]))
+        await self._end_phase(report)
+        report.game_won = started and not game.active
+
+    async def run(self, website_port: int) -> List[PhaseReport]:
+        await self.website.start(website_port)
+        try:
+            await self.startup()
+            await self.setup()
+            await self.introduction()
+            await self.conclusion()
+        finally:
+            await BOT.close()
+            await close_session()
+            await self.website.stop()
+        return self.reports
+
+    def report(self) -> str:
+        lines = [f"Scenario: {self.nb_teams} teams of {self.nb_players} players, "
+                 f"REST latency {1000 * self.latency:.0f} ms", HEADER]
+        lines += [report.to_row() for report in self.reports]
+        for report in self.reports:
+            calls = ", ".join(f"{route}: {nb}" for route, nb in report.rest.most_common())
+            lines.append(f"\nREST calls ({report.name}): {calls or 'none'}")
+        if self.server.unhandled:
+            lines.append(f"\nREST calls not simulated: {dict(self.server.unhandled)}")
+        if self.server.errors:
+            lines.append(f"Errors in event handlers: {dict(self.server.errors)} (see logs)")
+        return "\n".join(lines)
@@ -11,10 +11,13 @@ from bot_management.listener_utils import (stop_listener, start_listener, game_b
 from constants import BOT, DEBUG_MODE
 from default_collections import RoleCollection, ChannelCollection, CharacterCollection
 from game_models import CommandUtils, AbstractUtils
-from game_models.admin_tools import (show_info, clean_channel, show_channels,
+from game_models.admin_tools import (show_info, clean_channel, clean_channels, show_channels,
                                      show_roles, show_messages, delete_channel,
                                      fetch)
 from helpers import (long_send, get_guild_info, format_member, TranslationDict)
+from helpers.channel_purge import PurgeStrategy
+from helpers.instrumentation import Metrics
+from helpers.rest_accounting import RestAccounting
 from helpers.set_channels import delete_channels
 from helpers.set_roles import delete_roles
 from logger import logger
@@ -112,6 +115,11 @@ class DebugFunctions(CommandUtils, AbstractUtils):
         "info": [("info", "get_info", "getinfo"), "Get guild info"],
         "roles": [("roles",), "Show guild roles"],
         "channels": [("channels",), "Show guild channels"],
+        "stats": [("stats", "metrics"), "Show timings of event handlers and event-loop lag.\n"
+                                        " - *Arguments:* (Optional) `--reset` to reset metrics after showing them"],
+        "rest": [("rest", "rest_stats"), "Send the report of REST calls to Discord (by listener, command and "
+                                         "control panel action) in the log channel.\n"
+                                         " - *Arguments:* (Optional) `--reset` to reset the counters after the report"],
         "messages": [("messages",), "Show the last messages of text channels.\n"
                                     " - *Arguments:*\n"
                                     " o text channel mention(s) (if not set, the current channel is used).\n"
@@ -124,6 +132,11 @@ class DebugFunctions(CommandUtils, AbstractUtils):
         "clean_channel": [("reset_channel", "clean_channel"),
                           "Remove messages of the channel you are in.\n"
                           "*Arguments:* [int] maximum number of messages to delete (default: 1000)."],
+        "clean_channels": [("clean_channels", "reset_channels"),
+                           "Remove messages of all game channels (except master and dev ones), several at a time.\n"
+                           "*Arguments:* [int] maximum number of messages to delete per channel (default: all), "
+                           "`--recreate` to recreate channels instead (faster with many messages older than "
+                           "14 days, but channel ids change), `--auto` to recreate only such channels."],
         "update": [("update",), "Update the guild (guild, roles, channels)."],
         "fetch": [("fetch",), "Fetch the guild, i.e. try to match existing roles/channels to expected ones."],
         "forced_update": [("forced-update", "force-update"), "Update the guild and delete not expected roles/channels"],
@@ -332,6 +345,21 @@ class DebugFunctions(CommandUtils, AbstractUtils):
         await message.channel.send(f"Raising a value error: {err}")
         raise err
 
+    @staticmethod
+    async def stats(message, args):
+        await long_send(message.channel, Metrics().summary(), quotes=True)
+        if "--reset" in args:
+            Metrics().reset()
+            await message.channel.send("Metrics reset")
+
+    @staticmethod
+    async def rest(message, args):
+        channel = ChannelCollection.LOG.object_reference or message.channel
+        await long_send(channel, RestAccounting().report(), quotes=True)
+        if "--reset" in args:
+            RestAccounting().reset()
+            await message.channel.send("REST counters reset")
+
     @staticmethod
     async def messages(message, args):
         return await show_messages(message, args)
@@ -348,6 +376,22 @@ class DebugFunctions(CommandUtils, AbstractUtils):
             limit = limit or 1000
         return await clean_channel(message.channel, limit)
 
+    @staticmethod
+    async def clean_channels(message, args):
+        strategy = PurgeStrategy.PURGE
+        if "--recreate" in args:
+            args.remove("--recreate")
+            strategy = PurgeStrategy.RECREATE
+        elif "--auto" in args:
+            args.remove("--auto")
+            strategy = PurgeStrategy.AUTO
+        try:
+            limit = int(args[0])
+        except (ValueError, IndexError):
+            limit = None
+        report_channel = ChannelCollection.LOG.object_reference or message.channel
+        return await clean_channels(message.guild.channels, limit, strategy=strategy, report_channel=report_channel)
+
     @staticmethod
     async def fetch(message, args):
         return await fetch(message.guild)
@@ -1,4 +1,5 @@
-from typing import Dict, Tuple, Union, List, Callable, Awaitable, Iterable
+from collections import defaultdict
+from typing import Dict, Tuple, Union, List, Callable, Awaitable, Iterable, Set
 import asyncio
 
 from discord import Reaction, User, Member, Message, Forbidden, NotFound, RawReactionActionEvent, HTTPException
@@ -7,6 +8,7 @@ from game_models.abstract_listener import reconstitute_reaction_and_user
 from game_models.abstract_utils import AbstractUtils
 from helpers import return_
 from helpers.discord_helpers import try_to_remove_reaction
+from helpers.interactive_messages import InteractiveMessageCache
 from logger import logger
 from models import RoleDescription
 from models.types import GuildSingleton
@@ -33,13 +35,43 @@ class MenuOptions:
         self.include_user_as_kwarg = include_user_as_kwarg
 
 
-async def count_user_reactions(reactions: List[Reaction], user: Union[User, Member]):
-    count_reactions = 0
-    for msg_reaction in reactions:
-        users = await msg_reaction.users().flatten()
-        if user in users:
-            count_reactions += 1
-    return count_reactions
+class ReactionLedger:
+    """Reactions of users (bots excluded) on a menu message, maintained from reaction events.
+
+    The lock must be acquired to update the ledger and handle the reaction, so that simultaneous clicks
+    are handled one after another.
+    """
+
+    def __init__(self, seeded=True):
+        self.lock = asyncio.Lock()
+        self._seeded = seeded  # if False, reactions already on the message must be read once
+        self._users_by_emoji: Dict[str, Set[int]] = defaultdict(set)
+        self._emojis_by_user: Dict[int, Set[str]] = defaultdict(set)
+
+    async def seed(self, message: Message):
+        """Read reactions already on the message, only the first time."""
+        if self._seeded:
+            return
+        for reaction in message.reactions:
+            async for user in reaction.users():
+                self.add(reaction.emoji, user)
+        self._seeded = True
+
+    def add(self, emoji, user: Union[User, Member]):
+        if user.bot:
+            return
+        self._users_by_emoji[str(emoji)].add(user.id)
+        self._emojis_by_user[user.id].add(str(emoji))
+
+    def remove(self, emoji, user: Union[User, Member]):
+        self._users_by_emoji[str(emoji)].discard(user.id)
+        self._emojis_by_user[user.id].discard(str(emoji))
+
+    def count_users(self, emoji) -> int:
+        return len(self._users_by_emoji.get(str(emoji), ()))
+
+    def count_user_reactions(self, user: Union[User, Member]) -> int:
+        return len(self._emojis_by_user.get(user.id, ()))
 
 
 async def has_allowed_role(user: Member, reaction: Reaction, options: MenuOptions):
@@ -68,6 +100,7 @@ class ReactionMenuManager(GuildSingleton, AbstractUtils):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._menus: Dict[int, Tuple[MenuType, MenuOptions, Dict[User, Reaction]]] = {}
+        self._ledgers: Dict[int, ReactionLedger] = {}
 
     def get_menu(self, message_id: int, default=None):
         return self._menus.get(message_id, default)
@@ -106,18 +139,27 @@ class ReactionMenuManager(GuildSingleton, AbstractUtils):
             has_been_sent = await self._add_emojis(message, emojis)
             retries += 1
 
+    def _register_menu(self, message: Message, menu, options: MenuOptions):
+        self._menus.update({message.id: (menu, options, {})})
+        InteractiveMessageCache().register(message)
+        self._ledgers[message.id] = ReactionLedger()  # reactions are cleared when the menu is created
+
     async def add(self, message: Message, menu: MenuType, options: MenuOptions = None):
         options = options or MenuOptions()
-        self._menus.update({message.id: (menu, options, {})})
+        self._register_menu(message, menu, options)
         await message.clear_reactions()
         await self._add_emojis_with_retries(message, menu.keys())
 
     async def on_raw_reaction_add(self, payload: RawReactionActionEvent):
+        if payload.message_id not in self._menus:
+            return
         # Avoid that a disconnection breaks on_reaction_remove
         reaction, user = await reconstitute_reaction_and_user(payload)
         return await self._reaction_add(reaction, user) if reaction else None
 
     async def on_raw_reaction_remove(self, payload: RawReactionActionEvent):
+        if payload.message_id not in self._menus:
+            return
         # Avoid that a disconnection breaks on_reaction_remove
         reaction, user = await reconstitute_reaction_and_user(payload)
         return await self._reaction_remove(reaction, user) if reaction else None
@@ -136,20 +178,18 @@ class ReactionMenuManager(GuildSingleton, AbstractUtils):
                     await try_to_remove_reaction(reaction, user)
                 return False
 
+        ledger = self._ledgers[reaction.message.id]
         # Check if max number of reactions per user reached
         if options.max_number_of_reactions_per_user is not None:
-            nb_current_reactions = await count_user_reactions(reaction.message.reactions, user)
-            if nb_current_reactions > options.max_number_of_reactions_per_user:
+            if ledger.count_user_reactions(user) > options.max_number_of_reactions_per_user:
                 logger.debug(f"Too much reactions already! Max allowed: {options.max_number_of_reactions_per_user}")
                 if options.update_reactions:
                     await try_to_remove_reaction(reaction, user)
                 return False
 
         # Check if max number of reactions per reaction reached
-        # TODO: add a lock to handle simultaneous clicks on a reaction
         if options.max_users_per_reaction is not None:
-            current_users = await reaction.users().flatten()
-            if len(current_users) - 1 > options.max_users_per_reaction:
+            if ledger.count_users(reaction.emoji) > options.max_users_per_reaction:
                 logger.debug(
                     f"Too much users already reacted with this reaction ! Max allowed: {options.max_users_per_reaction}")
                 if options.update_reactions:
@@ -182,12 +222,19 @@ class ReactionMenuManager(GuildSingleton, AbstractUtils):
             await try_to_remove_reaction(reaction, user)
 
     async def _reaction_add(self, reaction: Reaction, user: Union[Member, User]):
+        if reaction.message.id not in self._menus:
+            return
+        ledger = self._ledgers[reaction.message.id]
+        async with ledger.lock:
+            await ledger.seed(reaction.message)
+            ledger.add(reaction.emoji, user)
+            await self._handle_reaction_add(reaction, user)
+
+    async def _handle_reaction_add(self, reaction: Reaction, user: Union[Member, User]):
         if not await super().on_reaction_add(reaction, user):
             return
         if user.bot:
             return
-        if reaction.message.id not in self._menus:
-            return
         role_menu, options, users_who_reacted = self._menus[reaction.message.id]
         if reaction.emoji not in role_menu:
             return
@@ -206,12 +253,19 @@ class ReactionMenuManager(GuildSingleton, AbstractUtils):
         pass
 
     async def _reaction_remove(self, reaction: Reaction, user: Union[Member, User]):
+        if reaction.message.id not in self._menus:
+            return
+        ledger = self._ledgers[reaction.message.id]
+        async with ledger.lock:
+            await ledger.seed(reaction.message)
+            ledger.remove(reaction.emoji, user)
+            await self._handle_reaction_remove(reaction, user)
+
+    async def _handle_reaction_remove(self, reaction: Reaction, user: Union[Member, User]):
         if not await super().on_reaction_remove(reaction, user):
             return
         if user.bot:
             return
-        if reaction.message.id not in self._menus:
-            return
         role_menu, options, users_who_reacted = self._menus[reaction.message.id]
         if reaction.emoji not in role_menu:
             return
@@ -1,5 +1,5 @@
+import asyncio
 import random
-from time import sleep
 
 from discord import Member
 
@@ -326,7 +326,7 @@ class GameUtils(CommandUtils, AbstractUtils):
         async def rand_fn():
             async with message.channel.typing():
                 for i in range(nb_iter):
-                    sleep(wait)
+                    await asyncio.sleep(wait)
                     number = random.randint(min_val, max_val)
                     await message.edit(content=number)
 
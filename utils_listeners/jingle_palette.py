@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, Tuple, Union, List
 
 from discord import Reaction, User, Member, Message, Forbidden, NotFound, RawReactionActionEvent, HTTPException
@@ -5,6 +6,10 @@ from discord import Reaction, User, Member, Message, Forbidden, NotFound, RawRea
 from game_models.abstract_listener import reconstitute_reaction_and_user
 from game_models.abstract_utils import AbstractUtils
 from helpers import SoundTools
+from helpers.audio_cache import AudioCache
+from helpers.audio_mixer import MixerTrack
+from helpers.interactive_messages import InteractiveMessageCache
+from helpers.state_store import options_to_state, options_from_state
 from logger import logger
 from models import RoleDescription
 from models.types import GuildSingleton
@@ -17,7 +22,8 @@ class JinglePaletteOptions:
                  stop_jingle_on_reaction_removal=False,
                  update_reactions=True,
                  auto_remove=True,
-                 suppress_embed=True
+                 suppress_embed=True,
+                 mix=False
                  ):
         self.required_roles: List[RoleDescription] = required_roles
         self.ignored_roles: List[RoleDescription] = ignored_roles
@@ -25,6 +31,7 @@ class JinglePaletteOptions:
         self.stop_jingle_on_reaction_removal = stop_jingle_on_reaction_removal
         self.auto_remove = auto_remove
         self.suppress_embed = suppress_embed
+        self.mix = mix  # play jingles over the ones already playing
 
 
 async def has_allowed_role(user, reaction, options):
@@ -53,18 +60,39 @@ class JinglePaletteManager(GuildSingleton, AbstractUtils):
         # Dictionary: {message_id: ({emoji: link or local_song_path, ...}, JinglePaletteOptions, display_message_id)}
         self._palette_menu: Dict[int, Tuple[Dict[str, str], JinglePaletteOptions, int]] = {}
         self._sound_tools: SoundTools = None
+        # Jingles being mixed: {(message_id, emoji): MixerTrack}
+        self._mixed_tracks: Dict[Tuple[int, str], MixerTrack] = {}
 
     def _init(self) -> bool:
         self._sound_tools = SoundTools.get(self.guild)
         return True
 
+    def _forget_stopped_tracks(self):
+        for key in [key for key, track in self._mixed_tracks.items() if track.stopped]:
+            del self._mixed_tracks[key]
+
     def get_menu(self, message_id: int, default=None):
         return self._palette_menu.get(message_id, default)
 
+    def export_state(self):
+        return {"palettes": {str(msg_id): [menu, options_to_state(options), display_message_id]
+                             for msg_id, (menu, options, display_message_id) in self._palette_menu.items()}}
+
+    async def import_state(self, state):
+        for msg_id, (menu, options_state, display_message_id) in state.get("palettes", {}).items():
+            options = options_from_state(JinglePaletteOptions, self.guild, options_state)
+            self._palette_menu[int(msg_id)] = (menu, options, display_message_id)
+            InteractiveMessageCache().register_id(int(msg_id), self.guild.id)
+            InteractiveMessageCache().register_id(display_message_id, self.guild.id)
+            # As when the palette was created
+            asyncio.ensure_future(AudioCache().preload(menu.values(), pcm=options.mix))
+
     async def add(self, message: Message, menu: Dict[str, str], options: JinglePaletteOptions = None):
         options = options or JinglePaletteOptions()
         display_message = await message.channel.send(f"⏲ ️🎵 Loading Jingle palette...")
         self._palette_menu.update({message.id: (menu, options, display_message.id)})
+        InteractiveMessageCache().register(message)
+        InteractiveMessageCache().register(display_message)
         await message.clear_reactions()
 
         # Remove stop emoji if it exists in the menu
@@ -93,20 +121,26 @@ class JinglePaletteManager(GuildSingleton, AbstractUtils):
         else:
             logger.info("Jingle palette created")
             await display_message.edit(content="🎵 Jingle palette ready!")
+            # Transcode local jingles in advance, so that they play without delay (PCM is required by the mixer)
+            asyncio.ensure_future(AudioCache().preload(menu.values(), pcm=options.mix))
 
     async def on_raw_reaction_add(self, payload: RawReactionActionEvent):
+        if payload.message_id not in self._palette_menu:
+            return
         # Avoid that a disconnection breaks on_reaction_remove
         reaction, user = await reconstitute_reaction_and_user(payload)
         return await self.reaction_add(reaction, user) if reaction else None
 
     async def on_raw_reaction_remove(self, payload: RawReactionActionEvent):
+        if payload.message_id not in self._palette_menu:
+            return
         # Avoid that a disconnection breaks on_reaction_remove
         reaction, user = await reconstitute_reaction_and_user(payload)
         return await self.reaction_remove(reaction, user) if reaction else None
 
     async def _fetch_message(self, reaction: Reaction, message_id: int):
         try:
-            message = await reaction.message.channel.fetch_message(message_id)
+            message = await InteractiveMessageCache().fetch(reaction.message.channel, message_id)
         except (NotFound, Forbidden, HTTPException) as err:
             logger.warning(f"Display message doesn't exist anymore!")
             message = None
@@ -171,7 +205,18 @@ class JinglePaletteManager(GuildSingleton, AbstractUtils):
 
             # Finally, play the jingle
         link = jingle_menu[reaction.emoji]
-        if await self._sound_tools.play(voice_channel, link, force=True):
+        if options.mix:
+            loop = asyncio.get_event_loop()
+            # Called in the audio thread when the track ends or is removed
+            track = await self._sound_tools.mix(
+                voice_channel, link, force=True,
+                after=lambda _error: loop.call_soon_threadsafe(self._forget_stopped_tracks))
+            if track and not track.stopped:
+                self._mixed_tracks[(reaction.message.id, reaction.emoji)] = track
+            success = track is not None
+        else:
+            success = await self._sound_tools.play(voice_channel, link, force=True)
+        if success:
             if display_message:
                 await display_message.edit(content=f"▶️ Playing {link}")
         else:
@@ -214,7 +259,13 @@ class JinglePaletteManager(GuildSingleton, AbstractUtils):
         if reaction.emoji not in jingle_menu:
             return
 
-        if options.stop_jingle_on_reaction_removal:
+        if options.stop_jingle_on_reaction_removal and options.mix:
+            track = self._mixed_tracks.pop((reaction.message.id, reaction.emoji), None)
+            if track and not track.stopped:
+                self._sound_tools.remove_track(track, fade_out=1.)
+                if display_message:
+                    await display_message.edit(content=f"⏹ Jingle stopped: {jingle_menu[reaction.emoji]}")
+        elif options.stop_jingle_on_reaction_removal:
             if await self._sound_tools.pause():
                 await display_message.edit(content=f"Jingle paused!")
             else:
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import re
 
@@ -10,6 +11,7 @@ from game_models import CommandUtils, AbstractUtils
 from helpers import long_send, TranslationDict
 from helpers.commands_helpers import get_args_from_text
 from helpers.sound_helpers import SoundTools
+from helpers.youtube_helpers import prefetch
 from logger import logger
 from models import RoleDescription
 from utils_listeners.jingle_palette import JinglePaletteOptions, JinglePaletteManager
@@ -103,6 +105,7 @@ class MusicTools(SoundTools, CommandUtils, AbstractUtils):
             "* `--no-auto-remove`: do not remove the reaction after the user clicked on it.\n"
             "* `--stop-on-remove`: stop the current song on reaction removal. Works with `--no-auto-remove` only.\n"
             "* `--allow-embed`: allow embed links in the message menu.\n"
+            "* `--mix`: play jingles over the ones already playing instead of stopping them.\n"
             "* `[@ROLE]`: role mentions of roles allowed to use the palette. "
             f"If no role mention, the default required role is {RoleCollection.MASTER.object_reference.mention}."
         )
@@ -162,6 +165,7 @@ class MusicTools(SoundTools, CommandUtils, AbstractUtils):
         stop_jingle_on_reaction_removal = is_key_in_args(args, "--stop-on-remove")
         auto_remove = not is_key_in_args(args, "--no-auto-remove")
         suppress_embed = not is_key_in_args(args, "--allow-embed")
+        mix = is_key_in_args(args, "--mix")
         required_roles = [RoleDescription.from_role(role) for role in message.role_mentions] or [RoleCollection.MASTER]
         for ind_emoji in range(len(args) - 1, -1, -1):
             if re.match(r".*<@&[0-9]+>.*", args[ind_emoji]):
@@ -179,6 +183,7 @@ class MusicTools(SoundTools, CommandUtils, AbstractUtils):
         manager = JinglePaletteManager.get(message.guild)
         options = JinglePaletteOptions(required_roles=required_roles, update_reactions=update_reactions,
                                        stop_jingle_on_reaction_removal=stop_jingle_on_reaction_removal,
-                                       auto_remove=auto_remove, suppress_embed=suppress_embed)
+                                       auto_remove=auto_remove, suppress_embed=suppress_embed, mix=mix)
+        asyncio.ensure_future(prefetch(menu.values()))  # YouTube jingles will start faster
         await manager.add(message, menu, options)
         logger.debug("Jingle palette created. Now you can edit your post to make it prettier.")
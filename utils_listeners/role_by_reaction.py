@@ -2,9 +2,12 @@ from typing import Dict, Tuple, Union, List, Collection
 
 from discord import Reaction, User, Member, Message, Role, Forbidden
 
+from helpers.interactive_messages import InteractiveMessageCache
+from helpers.state_store import role_descriptions_to_state, role_descriptions_from_state, options_to_state, \
+    options_from_state
 from logger import logger
 from models import RoleDescription
-from utils_listeners.function_by_reaction import ReactionMenuManager, MenuOptions
+from utils_listeners.function_by_reaction import ReactionMenuManager, MenuOptions, ReactionLedger
 
 
 # TODO: handle permission errors on reaction removal
@@ -48,10 +51,25 @@ class RoleByReactionManager(ReactionMenuManager):
                 if isinstance(role_descr, Role):
                     role_descriptions[i] = RoleDescription.from_role(role_descr)
 
-        self._menus.update({message.id: (menu, options, {})})
+        self._register_menu(message, menu, options)
         await message.clear_reactions()
         await self._add_emojis_with_retries(message, menu.keys())
 
+    def export_state(self):
+        return {"menus": {str(msg_id): {"menu": {emoji: role_descriptions_to_state(role_descriptions)
+                                                  for emoji, role_descriptions in menu.items()},
+                                         "options": options_to_state(options)}
+                          for msg_id, (menu, options, _users_who_reacted) in self._menus.items()}}
+
+    async def import_state(self, state):
+        for msg_id, menu_state in state.get("menus", {}).items():
+            menu = {emoji: role_descriptions_from_state(self.guild, items)
+                    for emoji, items in menu_state["menu"].items()}
+            options = options_from_state(RoleMenuOptions, self.guild, menu_state["options"])
+            self._menus[int(msg_id)] = (menu, options, {})
+            self._ledgers[int(msg_id)] = ReactionLedger(seeded=False)  # reactions are read on the next click
+            InteractiveMessageCache().register_id(int(msg_id), self.guild.id)
+
     async def advanced_reaction_add(self, reaction: Reaction, user: Union[Member, User], role_menu: MenuType,
                                     options: RoleMenuOptions, users_who_reacted: Dict[User, Reaction]) -> bool:
         if not await self._base_reaction_add_checks(reaction, user, options, users_who_reacted):